@@ -511,6 +511,15 @@ class DeviceNAPALMSerializer(serializers.Serializer):
     method = serializers.DictField()
 
 
+class ConnectedDeviceQuerySerializer(serializers.Serializer):
+    peer_device = serializers.CharField()
+    peer_interface = serializers.CharField()
+
+
+class ConnectedDeviceSerializer(ConnectedDeviceQuerySerializer):
+    device = DeviceSerializer(read_only=True, allow_null=True)
+
+
 #
 # Device components
 #
@@ -653,6 +662,11 @@ class InterfaceSerializer(PrimaryModelSerializer, LinkTerminationSerializer, Con
 
     def validate(self, data):
 
+        # Remove any untagged VLAN assignment from a new non-802.1Q interface. (Interface.save() also does this, but is
+        # not called when interfaces are created in bulk.)
+        if self.instance is None and not data.get('mode') and data.get('untagged_vlan'):
+            data['untagged_vlan'] = None
+
         # Validate many-to-many VLAN assignments
         device = self.instance.device if self.instance else data.get('device')
         for vlan in data.get('tagged_vlans', []):
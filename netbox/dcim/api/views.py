@@ -1,6 +1,7 @@
 import socket
 from collections import OrderedDict
 
+from django.contrib.contenttypes.models import ContentType
 from django.http import Http404, HttpResponse, HttpResponseForbidden
 from django.shortcuts import get_object_or_404
 from drf_yasg import openapi
@@ -14,6 +15,7 @@ from rest_framework.viewsets import ViewSet
 from circuits.models import Circuit
 from dcim import filtersets
 from dcim.models import *
+from dcim.utils import trace_paths
 from extras.api.views import ConfigContextQuerySetMixin, CustomFieldModelViewSet
 from ipam.models import Prefix, VLAN, ASN
 from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
@@ -47,9 +49,6 @@ class PathEndpointMixin(object):
         """
         obj = get_object_or_404(self.queryset, pk=pk)
 
-        # Initialize the path array
-        path = []
-
         if request.GET.get('render', None) == 'svg':
             # Render SVG
             try:
@@ -62,27 +61,66 @@ class PathEndpointMixin(object):
             )
             return HttpResponse(drawing.tostring(), content_type='image/svg+xml')
 
-        for near_end, cable, far_end in obj.trace():
+        return Response(self._serialize_trace(obj.trace(), {'request': request}))
+
+    @action(detail=False, url_path='trace')
+    def bulk_trace(self, request):
+        """
+        Trace the complete cable paths of all objects matching the specified filters (for example, all interfaces
+        belonging to a device). Each object is returned along with its trace, represented as a list of segments as for
+        a single trace. Objects are paginated.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None).select_related('_path')
+        if hasattr(queryset.model, 'device'):
+            queryset = queryset.prefetch_related('device')
+        page = self.paginate_queryset(queryset)
+        objects = page if page is not None else list(queryset)
+
+        # Retrieve the objects comprising all paths together
+        traces = trace_paths(objects)
+
+        context = {'request': request}
+        serializer_class = get_serializer_for_model(queryset.model, prefix='Nested')
+        data = [
+            {
+                'origin': serializer_class(obj, context=context).data,
+                'trace': self._serialize_trace(traces[obj], context),
+            }
+            for obj in objects
+        ]
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    @staticmethod
+    def _serialize_trace(trace, context):
+        """
+        Serialize each segment of a trace as a three-tuple of (termination, cable, termination).
+        """
+        path = []
+
+        for near_end, cable, far_end in trace:
             if near_end is None:
                 # Split paths
                 break
 
             # Serialize each object
             serializer_a = get_serializer_for_model(near_end, prefix='Nested')
-            x = serializer_a(near_end, context={'request': request}).data
+            x = serializer_a(near_end, context=context).data
             if cable is not None:
-                y = serializers.TracedCableSerializer(cable, context={'request': request}).data
+                y = serializers.TracedCableSerializer(cable, context=context).data
             else:
                 y = None
             if far_end is not None:
                 serializer_b = get_serializer_for_model(far_end, prefix='Nested')
-                z = serializer_b(far_end, context={'request': request}).data
+                z = serializer_b(far_end, context=context).data
             else:
                 z = None
 
             path.append((x, y, z))
 
-        return Response(path)
+        return path
 
 
 class PassThroughPortMixin(object):
@@ -553,6 +591,7 @@ class InterfaceViewSet(PathEndpointMixin, ModelViewSet):
     serializer_class = serializers.InterfaceSerializer
     filterset_class = filtersets.InterfaceFilterSet
     brief_prefetch_fields = ['device']
+    bulk_create = True
 
 
 class FrontPortViewSet(PassThroughPortMixin, ModelViewSet):
@@ -701,3 +740,56 @@ class ConnectedDeviceViewSet(ViewSet):
 
         # Connected endpoint is none or not an Interface
         raise Http404
+
+    @swagger_auto_schema(
+        request_body=serializers.ConnectedDeviceQuerySerializer(many=True),
+        responses={'200': serializers.ConnectedDeviceSerializer(many=True)}
+    )
+    @action(detail=False, methods=['post'], url_path='batch')
+    def batch(self, request):
+        """
+        Locate the devices connected to many peer interfaces at once. The request must contain a list of objects, each
+        specifying a `peer_device` and `peer_interface`. A list of the same length is returned, with each object
+        additionally specifying the connected `device` (or null if no device could be found).
+        """
+        query_serializer = serializers.ConnectedDeviceQuerySerializer(data=request.data, many=True)
+        query_serializer.is_valid(raise_exception=True)
+        pairs = [
+            (item['peer_device'], item['peer_interface']) for item in query_serializer.validated_data
+        ]
+
+        # Retrieve all candidate peer interfaces along with their cable paths, and map each requested pair to the ID
+        # of the Interface (if any) at the far end of its peer interface's path. Pairs matching multiple interfaces
+        # (devices may share a name) are ignored.
+        peer_interfaces = Interface.objects.restrict(request.user, 'view').filter(
+            device__in=Device.objects.restrict(request.user, 'view'),
+            device__name__in={device_name for device_name, _ in pairs},
+            name__in={interface_name for _, interface_name in pairs}
+        ).select_related('device', '_path')
+        interface_type = ContentType.objects.get_for_model(Interface)
+        endpoint_map = {}
+        for interface in peer_interfaces:
+            key = (interface.device.name, interface.name)
+            path = interface._path
+            if key in endpoint_map or path is None or path.destination_type_id != interface_type.pk:
+                endpoint_map[key] = None
+            else:
+                endpoint_map[key] = path.destination_id
+
+        # Resolve the parent device of each connected Interface
+        endpoint_device_map = dict(
+            Interface.objects.filter(pk__in=set(endpoint_map.values())).values_list('pk', 'device_id')
+        )
+        devices = DeviceViewSet.queryset.restrict(request.user, 'view').in_bulk(endpoint_device_map.values())
+
+        results = [
+            {
+                'peer_device': device_name,
+                'peer_interface': interface_name,
+                'device': devices.get(endpoint_device_map.get(endpoint_map.get((device_name, interface_name)))),
+            }
+            for device_name, interface_name in pairs
+        ]
+        serializer = serializers.ConnectedDeviceSerializer(results, many=True, context={'request': request})
+
+        return Response(serializer.data)
@@ -58,6 +58,40 @@ class Mixins:
             self.assertEqual(segment1[1]['label'], cable.label)
             self.assertEqual(segment1[2]['name'], peer_obj.name)
 
+        def test_bulk_trace(self):
+            """
+            Test tracing the attached cables of many device components at once.
+            """
+            objs = list(self.model.objects.all()[:2])
+            peer_device = Device.objects.create(
+                site=Site.objects.first(),
+                device_type=DeviceType.objects.first(),
+                device_role=DeviceRole.objects.first(),
+                name='Peer Device'
+            )
+            if self.peer_termination_type is None:
+                raise NotImplementedError("Test case must set peer_termination_type")
+            peer_obj = self.peer_termination_type.objects.create(
+                device=peer_device,
+                name='Peer Termination'
+            )
+            cable = Cable(termination_a=objs[0], termination_b=peer_obj, label='Cable 1')
+            cable.save()
+
+            self.add_permissions(f'dcim.view_{self.model._meta.model_name}')
+            url = reverse(f'dcim-api:{self.model._meta.model_name}-bulk-trace')
+            response = self.client.get(f'{url}?id={objs[0].pk}&id={objs[1].pk}', **self.header)
+
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertEqual(response.data['count'], 2)
+            traces = {result['origin']['id']: result['trace'] for result in response.data['results']}
+            self.assertEqual(len(traces[objs[0].pk]), 1)
+            segment1 = traces[objs[0].pk][0]
+            self.assertEqual(segment1[0]['name'], objs[0].name)
+            self.assertEqual(segment1[1]['label'], cable.label)
+            self.assertEqual(segment1[2]['name'], peer_obj.name)
+            self.assertEqual(traces[objs[1].pk], [])
+
 
 class RegionTest(APIViewTestCases.APIViewTestCase):
     model = Region
@@ -1569,6 +1603,29 @@ class ConnectedDeviceTest(APITestCase):
         response = self.client.get(url + url_params, **self.header)
         self.assertHttpStatus(response, status.HTTP_404_NOT_FOUND)
 
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_get_connected_devices_batch(self):
+        url = reverse('dcim-api:connected-device-batch')
+        data = [
+            {'peer_device': self.device1.name, 'peer_interface': self.interface1.name},
+            {'peer_device': self.device2.name, 'peer_interface': self.interface2.name},
+            {'peer_device': self.device1.name, 'peer_interface': self.interface3.name},  # Not connected
+            {'peer_device': 'TestDevice3', 'peer_interface': 'eth0'},  # Nonexistent
+        ]
+
+        response = self.client.post(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 4)
+        self.assertEqual(response.data[0]['device']['name'], self.device2.name)
+        self.assertEqual(response.data[1]['device']['name'], self.device1.name)
+        self.assertIsNone(response.data[2]['device'])
+        self.assertIsNone(response.data[3]['device'])
+        self.assertEqual(response.data[3]['peer_device'], 'TestDevice3')
+
+        # Each item must specify both a peer device and interface
+        response = self.client.post(url, [{'peer_device': self.device1.name}], format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
 
 class VirtualChassisTest(APIViewTestCases.APIViewTestCase):
     model = VirtualChassis
@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 
@@ -29,6 +31,83 @@ def path_node_to_object(repr):
     return ct.model_class().objects.get(pk=object_id)
 
 
+def path_nodes_to_objects(nodes):
+    """
+    Given an iterable of path node representations, return a dictionary mapping each to its corresponding instance.
+    Objects are retrieved using one query per model type, prefetching related devices where appropriate.
+    """
+    # Compile a list of IDs to prefetch for each type of model
+    to_prefetch = defaultdict(set)
+    for node in nodes:
+        ct_id, object_id = decompile_path_node(node)
+        to_prefetch[ct_id].add(object_id)
+
+    objects = {}
+    for ct_id, object_ids in to_prefetch.items():
+        model_class = ContentType.objects.get_for_id(ct_id).model_class()
+        queryset = model_class.objects.filter(pk__in=object_ids)
+        if hasattr(model_class, 'device'):
+            queryset = queryset.prefetch_related('device')
+        for obj in queryset:
+            objects[compile_path_node(ct_id, obj.pk)] = obj
+
+    return objects
+
+
+def trace_paths(origins):
+    """
+    Trace the complete cable paths originating from many PathEndpoints at once. Returns a dictionary mapping each
+    origin to its path as a list of three-tuples (A termination, cable, B termination), as PathEndpoint.trace() does.
+    The objects within all paths are retrieved together, so the number of queries performed does not depend on the
+    number of origins. Each origin should have its `_path` already loaded (e.g. using select_related()).
+    """
+    from dcim.models import Interface
+
+    traces = {origin: [] for origin in origins}
+
+    # Map each origin to the endpoint from which its trace continues (which differs after crossing a bridge)
+    endpoints = {origin: origin for origin in origins}
+    visited = {origin: set() for origin in origins}
+
+    while endpoints:
+        paths = {
+            origin: endpoint._path for origin, endpoint in endpoints.items() if endpoint._path is not None
+        }
+        nodes = set()
+        for path in paths.values():
+            nodes.update(path.path)
+            if path.destination_id is not None:
+                nodes.add(compile_path_node(path.destination_type_id, path.destination_id))
+        path_objects = path_nodes_to_objects(nodes)
+
+        bridge_ids = {}
+        for origin, path in paths.items():
+            trace = traces[origin]
+            trace.extend([endpoints[origin], *[path_objects.get(node) for node in path.path]])
+            while (len(trace) + 1) % 3:
+                # Pad to ensure we have complete three-tuples (e.g. for paths that end at a non-connected FrontPort)
+                trace.append(None)
+            destination = None
+            if path.destination_id is not None:
+                destination = path_objects.get(compile_path_node(path.destination_type_id, path.destination_id))
+            trace.append(destination)
+
+            # Check for bridge interface to continue the trace (unless the bridge has already been traversed)
+            bridge_id = getattr(destination, 'bridge_id', None)
+            if bridge_id is not None and bridge_id not in visited[origin]:
+                visited[origin].add(bridge_id)
+                bridge_ids[origin] = bridge_id
+
+        bridges = Interface.objects.filter(pk__in=bridge_ids.values()).select_related('_path').in_bulk()
+        endpoints = {
+            origin: bridges[bridge_id] for origin, bridge_id in bridge_ids.items() if bridge_id in bridges
+        }
+
+    return {
+        origin: list(zip(*[iter(trace)] * 3)) for origin, trace in traces.items()
+    }
+
+
 def create_cablepath(node):
     """
     Create CablePaths for all paths originating from the specified node.
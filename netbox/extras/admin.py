@@ -34,7 +34,10 @@ class ConfigRevisionAdmin(admin.ModelAdmin):
             'fields': ('NAPALM_USERNAME', 'NAPALM_PASSWORD', 'NAPALM_TIMEOUT', 'NAPALM_ARGS'),
         }),
         ('Miscellaneous', {
-            'fields': ('MAINTENANCE_MODE', 'GRAPHQL_ENABLED', 'CHANGELOG_RETENTION', 'MAPS_URL'),
+            'fields': (
+                'MAINTENANCE_MODE', 'GRAPHQL_ENABLED', 'GRAPHQL_CACHE_TIMEOUT', 'GRAPHQL_MAX_COST', 'GRAPHQL_MAX_DEPTH',
+                'GRAPHQL_MAX_PAGE_SIZE', 'CHANGELOG_RETENTION', 'MAPS_URL',
+            ),
         }),
         ('Config Revision', {
             'fields': ('comment',),
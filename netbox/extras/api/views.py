@@ -1,11 +1,15 @@
+import csv
+import json
+
 from django.contrib.contenttypes.models import ContentType
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
 from django_rq.queues import get_connection
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.routers import APIRootView
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.viewsets import ReadOnlyModelViewSet, ViewSet
 from rq import Worker
 
@@ -17,9 +21,9 @@ from extras.reports import get_report, get_reports, run_report
 from extras.scripts import get_script, get_scripts, run_script
 from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
 from netbox.api.metadata import ContentTypeMetadata
-from netbox.api.views import ModelViewSet
+from netbox.api.views import ExportModelMixin, ModelViewSet
 from utilities.exceptions import RQWorkerNotRunningException
-from utilities.utils import copy_safe_request, count_related
+from utilities.utils import content_type_identifier, copy_safe_request, count_related, Echo, iterate_in_chunks
 from . import serializers
 
 
@@ -41,8 +45,9 @@ class ConfigContextQuerySetMixin:
         """
         Build the proper queryset based on the request context
 
-        If the `brief` query param equates to True or the `exclude` query param
-        includes `config_context` as a value, return the base queryset.
+        If the `brief` query param equates to True, the `exclude` query param
+        includes `config_context` as a value, or the config_context field has
+        not been requested, return the base queryset.
 
         Else, return the queryset annotated with config context data
         """
@@ -50,6 +55,8 @@ class ConfigContextQuerySetMixin:
         request = self.get_serializer_context()['request']
         if self.brief or 'config_context' in request.query_params.get('exclude', []):
             return queryset
+        if not self.is_field_requested('config_context'):
+            return queryset
         return queryset.annotate_config_context_data()
 
 
@@ -351,7 +358,7 @@ class ScriptViewSet(ViewSet):
 # Change logging
 #
 
-class ObjectChangeViewSet(ReadOnlyModelViewSet):
+class ObjectChangeViewSet(ExportModelMixin, ReadOnlyModelViewSet):
     """
     Retrieve a list of recent changes.
     """
@@ -359,6 +366,49 @@ class ObjectChangeViewSet(ReadOnlyModelViewSet):
     queryset = ObjectChange.objects.prefetch_related('user')
     serializer_class = serializers.ObjectChangeSerializer
     filterset_class = filtersets.ObjectChangeFilterSet
+    keyset_ordering = ('-time', '-pk')
+    csv_fields = (
+        'id', 'time', 'user_name', 'request_id', 'action', 'changed_object_type', 'changed_object_id',
+        'related_object_type', 'related_object_id', 'object_repr', 'prechange_data', 'postchange_data',
+    )
+
+    @action(detail=False, url_path='export')
+    def export(self, request):
+        """
+        Stream all changes matching the specified filters as newline-delimited JSON, or as CSV if export_format=csv is
+        passed. Records are read in chunks using a server-side cursor, so memory use remains constant.
+        """
+        # Changed objects are not prefetched: Prefetching a GenericForeignKey clears the type and ID of any change whose
+        # object has since been deleted
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if request.query_params.get('export_format') == 'csv':
+            response = StreamingHttpResponse(self._stream_csv(queryset), content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="netbox_changelog.csv"'
+            return response
+
+        return StreamingHttpResponse(self.stream_ndjson(queryset), content_type='application/x-ndjson')
+
+    def _stream_csv(self, queryset):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.csv_fields)
+        for chunk in iterate_in_chunks(queryset):
+            for objectchange in chunk:
+                yield writer.writerow([
+                    objectchange.id,
+                    objectchange.time.isoformat(),
+                    objectchange.user_name,
+                    objectchange.request_id,
+                    objectchange.action,
+                    content_type_identifier(ContentType.objects.get_for_id(objectchange.changed_object_type_id)),
+                    objectchange.changed_object_id,
+                    content_type_identifier(ContentType.objects.get_for_id(objectchange.related_object_type_id))
+                    if objectchange.related_object_type_id else '',
+                    objectchange.related_object_id or '',
+                    objectchange.object_repr,
+                    json.dumps(objectchange.prechange_data, cls=JSONEncoder),
+                    json.dumps(objectchange.postchange_data, cls=JSONEncoder),
+                ])
 
 
 #
@@ -0,0 +1,36 @@
+import uuid
+
+from django.core.cache import cache
+
+__all__ = (
+    'get_data_version',
+    'invalidate_data_version',
+)
+
+# The cache key holding the current version of all data
+DATA_VERSION_KEY = 'data_version'
+
+# The maximum length of time (in seconds) for which a data version remains valid. This bounds the time for which
+# cached representations may go stale after changes which do not invalidate the data version (such as QuerySet
+# updates performed outside of NetBox's own operations).
+DATA_VERSION_TIMEOUT = 900
+
+
+def get_data_version():
+    """
+    Return the current version of all data, initializing it if necessary. The version changes whenever an object is
+    created, modified, or deleted (and after DATA_VERSION_TIMEOUT regardless), and may be used to validate any cached
+    representation of objects (including their related objects).
+    """
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, uuid.uuid4().hex, DATA_VERSION_TIMEOUT)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def invalidate_data_version():
+    """
+    Assign a new data version, invalidating any representations validated against the previous version.
+    """
+    cache.set(DATA_VERSION_KEY, uuid.uuid4().hex, DATA_VERSION_TIMEOUT)
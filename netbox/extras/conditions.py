@@ -75,6 +75,25 @@ class Condition:
             return not result
         return result
 
+    def compile(self):
+        """
+        Return a function which evaluates provided data against the condition. The attribute path, operator, and
+        negation are resolved once, when the function is created, rather than each time it is called.
+        """
+        path = self.attr.split('.')
+        eval_func = self.eval_func
+        negate = self.negate
+
+        def evaluate(data):
+            try:
+                value = functools.reduce(dict.get, path, data)
+            except TypeError:
+                # Invalid key path
+                value = None
+            return not eval_func(value) if negate else eval_func(value)
+
+        return evaluate
+
     # Equivalency
 
     def eval_eq(self, value):
@@ -146,3 +165,16 @@ class ConditionSet:
         """
         func = any if self.logic == 'or' else all
         return func(d.eval(data) for d in self.conditions)
+
+    def compile(self):
+        """
+        Return a function which evaluates provided data against this set of conditions. Nested rule sets are compiled
+        recursively, so the returned function is equivalent to eval() without re-resolving any rules.
+        """
+        func = any if self.logic == 'or' else all
+        evaluators = tuple(d.compile() for d in self.conditions)
+
+        def evaluate(data):
+            return func(e(data) for e in evaluators)
+
+        return evaluate
@@ -2,9 +2,15 @@ from contextlib import contextmanager
 
 from django.db.models.signals import m2m_changed, pre_delete, post_save
 
-from extras.signals import clear_webhooks, clear_webhook_queue, handle_changed_object, handle_deleted_object
+from extras.signals import (
+    clear_webhooks, clear_webhook_queue, handle_changed_object, handle_created_objects, handle_deleted_object,
+    handle_dirty_objects, handle_updated_objects,
+)
 from netbox import thread_locals
 from netbox.request_context import set_request
+from netbox.signals import post_bulk_create, post_bulk_update
+from .cache import invalidate_data_version
+from .models import ObjectChange
 from .webhooks import flush_webhooks
 
 
@@ -18,10 +24,14 @@ def change_logging(request):
     """
     set_request(request)
     thread_locals.webhook_queue = []
+    thread_locals.dirty_objects = {}
+    thread_locals.objects_changed = False
 
     # Connect our receivers to the post_save and post_delete signals.
     post_save.connect(handle_changed_object, dispatch_uid='handle_changed_object')
     m2m_changed.connect(handle_changed_object, dispatch_uid='handle_changed_object')
+    post_bulk_create.connect(handle_created_objects, dispatch_uid='handle_created_objects')
+    post_bulk_update.connect(handle_updated_objects, dispatch_uid='handle_updated_objects')
     pre_delete.connect(handle_deleted_object, dispatch_uid='handle_deleted_object')
     clear_webhooks.connect(clear_webhook_queue, dispatch_uid='clear_webhook_queue')
 
@@ -31,12 +41,35 @@ def change_logging(request):
     # changes during test cleanup.
     post_save.disconnect(handle_changed_object, dispatch_uid='handle_changed_object')
     m2m_changed.disconnect(handle_changed_object, dispatch_uid='handle_changed_object')
+    post_bulk_create.disconnect(handle_created_objects, dispatch_uid='handle_created_objects')
+    post_bulk_update.disconnect(handle_updated_objects, dispatch_uid='handle_updated_objects')
     pre_delete.disconnect(handle_deleted_object, dispatch_uid='handle_deleted_object')
     clear_webhooks.disconnect(clear_webhook_queue, dispatch_uid='clear_webhook_queue')
 
-    # Flush queued webhooks to RQ
+    # Record the final state of any objects with M2M changes, then flush queued webhooks to RQ
+    handle_dirty_objects(request)
     flush_webhooks(thread_locals.webhook_queue)
+
+    # Invalidate any cached representations of objects (e.g. ETags) if any changes were made
+    if thread_locals.objects_changed:
+        invalidate_data_version()
+
     del thread_locals.webhook_queue
+    del thread_locals.dirty_objects
+    del thread_locals.objects_changed
 
     # Clear the request from thread-local storage
     set_request(None)
+
+
+@contextmanager
+def batch_change_records():
+    """
+    Defer the saving of any change records created within the context, and save them together upon exiting it.
+    """
+    thread_locals.objectchange_batch = []
+    try:
+        yield
+        ObjectChange.objects.bulk_create(thread_locals.objectchange_batch, batch_size=1000)
+    finally:
+        del thread_locals.objectchange_batch
@@ -42,6 +42,7 @@ class WebhookFilterSet(BaseFilterSet):
         fields = [
             'id', 'content_types', 'name', 'type_create', 'type_update', 'type_delete', 'payload_url', 'enabled',
             'http_method', 'http_content_type', 'secret', 'ssl_verification', 'ca_file_path',
+            'batch_size', 'batch_interval',
         ]
 
     def search(self, queryset, name, value):
@@ -127,6 +127,15 @@ class WebhookBulkEditForm(BulkEditForm):
         required=False,
         widget=BulkEditNullBooleanSelect()
     )
+    batch_size = forms.IntegerField(
+        min_value=1,
+        required=False
+    )
+    batch_interval = forms.IntegerField(
+        min_value=0,
+        required=False,
+        label='Batch interval (ms)'
+    )
     secret = forms.CharField(
         required=False
     )
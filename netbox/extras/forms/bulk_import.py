@@ -76,7 +76,7 @@ class WebhookCSVForm(CSVModelForm):
         fields = (
             'name', 'enabled', 'content_types', 'type_create', 'type_update', 'type_delete', 'payload_url',
             'http_method', 'http_content_type', 'additional_headers', 'body_template', 'secret', 'ssl_verification',
-            'ca_file_path'
+            'ca_file_path', 'batch_size', 'batch_interval',
         )
 
 
@@ -103,6 +103,7 @@ class WebhookForm(BootstrapMixin, forms.ModelForm):
                 'payload_url', 'http_method', 'http_content_type', 'additional_headers', 'body_template', 'secret',
             )),
             ('Conditions', ('conditions',)),
+            ('Batching', ('batch_size', 'batch_interval')),
             ('SSL', ('ssl_verification', 'ca_file_path')),
         )
         widgets = {
@@ -2,7 +2,8 @@ import graphene
 from django.contrib.contenttypes.models import ContentType
 from graphene.types.generic import GenericScalar
 
-from extras.models import ObjectChange
+from extras.models import ObjectChange, Tag
+from netbox.graphql.loaders import ObjectListLoader, get_loader
 
 __all__ = (
     'ChangelogMixin',
@@ -58,4 +59,11 @@ class TagsMixin:
     tags = graphene.List('extras.graphql.types.TagType')
 
     def resolve_tags(self, info):
-        return self.tags.all()
+        # Retrieve the tags of all objects of this type within a level of the query together
+        content_type = ContentType.objects.get_for_model(self)
+        loader = get_loader(info, (ObjectListLoader, Tag, content_type.pk), lambda: ObjectListLoader(
+            Tag.objects.all(),
+            'extras_taggeditem_items__object_id',
+            filters={'extras_taggeditem_items__content_type': content_type}
+        ))
+        return loader.load(self.pk)
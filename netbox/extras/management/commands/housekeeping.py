@@ -5,11 +5,12 @@ import requests
 from django.conf import settings
 from django.core.cache import cache
 from django.core.management.base import BaseCommand
-from django.db import DEFAULT_DB_ALIAS
 from django.utils import timezone
 from packaging import version
 
+from extras.cache import invalidate_data_version
 from extras.models import ObjectChange
+from extras.partitioning import create_partitions, delete_expired_changes, drop_expired_partitions, is_partitioned
 from netbox.config import Config
 
 
@@ -39,30 +40,54 @@ class Command(BaseCommand):
         # Delete expired ObjectRecords
         if options['verbosity']:
             self.stdout.write("[*] Checking for expired changelog records")
+        partitioned = is_partitioned()
         if config.CHANGELOG_RETENTION:
             cutoff = timezone.now() - timedelta(days=config.CHANGELOG_RETENTION)
             if options['verbosity'] >= 2:
                 self.stdout.write(f"\tRetention period: {config.CHANGELOG_RETENTION} days")
                 self.stdout.write(f"\tCut-off time: {cutoff}")
-            expired_records = ObjectChange.objects.filter(time__lt=cutoff).count()
-            if expired_records:
+
+            # Drop any partitions which hold only expired records
+            dropped = drop_expired_partitions(cutoff) if partitioned else []
+            if options['verbosity']:
+                for name in dropped:
+                    self.stdout.write(f"\tDropped expired partition {name}", self.style.SUCCESS)
+
+            # Delete any remaining expired records in chunks
+            deleted = 0
+            if ObjectChange.objects.filter(time__lt=cutoff).exists():
                 if options['verbosity']:
                     self.stdout.write(
-                        f"\tDeleting {expired_records} expired records... ",
+                        "\tDeleting expired records... ",
                         self.style.WARNING,
                         ending=""
                     )
                     self.stdout.flush()
-                ObjectChange.objects.filter(time__lt=cutoff)._raw_delete(using=DEFAULT_DB_ALIAS)
+                deleted = delete_expired_changes(cutoff)
                 if options['verbosity']:
-                    self.stdout.write("Done.", self.style.SUCCESS)
-            elif options['verbosity']:
+                    self.stdout.write(f"Done ({deleted} records deleted).", self.style.SUCCESS)
+            elif options['verbosity'] and not dropped:
                 self.stdout.write("\tNo expired records found.", self.style.SUCCESS)
+
+            # Expired records are deleted without sending post_delete signals, so invalidate any cached representations
+            if dropped or deleted:
+                invalidate_data_version()
         elif options['verbosity']:
             self.stdout.write(
                 f"\tSkipping: No retention period specified (CHANGELOG_RETENTION = {config.CHANGELOG_RETENTION})"
             )
 
+        # Create upcoming changelog partitions (if partitioned)
+        if partitioned:
+            if options['verbosity']:
+                self.stdout.write("[*] Checking for upcoming changelog partitions")
+            created = create_partitions()
+            if options['verbosity']:
+                for name in created:
+                    self.stdout.write(f"\tCreated partition {name}", self.style.SUCCESS)
+                if not created:
+                    self.stdout.write("\tAll partitions already exist.", self.style.SUCCESS)
+
         # Check for new releases (if enabled)
         if options['verbosity']:
             self.stdout.write("[*] Checking for latest release")
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from extras.partitioning import convert_to_partitioned, create_partitions, get_partitions, is_partitioned
+
+
+class Command(BaseCommand):
+    help = "Manage monthly partitions of the changelog (ObjectChange) table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convert', action='store_true', dest='convert',
+            help="Convert the existing changelog table to a partitioned table (one-time operation)"
+        )
+        parser.add_argument(
+            '--months', type=int, default=3, dest='months',
+            help="Number of future months for which partitions should be created (default: 3)"
+        )
+        parser.add_argument(
+            '--list', action='store_true', dest='list',
+            help="List all existing partitions"
+        )
+
+    def handle(self, *args, **options):
+
+        if options['convert']:
+            if is_partitioned():
+                raise CommandError("The changelog table has already been partitioned.")
+            if options['verbosity']:
+                self.stdout.write("[*] Converting the changelog table to a partitioned table")
+                self.stdout.write(
+                    "\tThis will lock the table against changes while it is converted. Depending on the number of "
+                    "existing records, this may take some time.",
+                    self.style.WARNING
+                )
+            try:
+                convert_to_partitioned()
+            except NotImplementedError as e:
+                raise CommandError(str(e))
+            if options['verbosity']:
+                self.stdout.write("\tDone.", self.style.SUCCESS)
+
+        elif not is_partitioned():
+            raise CommandError(
+                "The changelog table is not partitioned. Run this command with --convert to partition it."
+            )
+
+        if options['verbosity']:
+            self.stdout.write("[*] Creating partitions")
+        created = create_partitions(months=options['months'])
+        if options['verbosity']:
+            for name in created:
+                self.stdout.write(f"\tCreated partition {name}", self.style.SUCCESS)
+            if not created:
+                self.stdout.write("\tAll partitions already exist.", self.style.SUCCESS)
+
+        if options['list']:
+            for name, lower, upper in get_partitions():
+                if upper is None:
+                    self.stdout.write(f"{name}: default")
+                else:
+                    self.stdout.write(f"{name}: {lower or 'MINVALUE'} to {upper}")
+
+        if options['verbosity']:
+            self.stdout.write("Finished.", self.style.SUCCESS)
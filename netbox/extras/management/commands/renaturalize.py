@@ -1,6 +1,7 @@
 from django.apps import apps
 from django.core.management.base import BaseCommand, CommandError
 
+from extras.cache import invalidate_data_version
 from utilities.fields import NaturalOrderingField
 
 
@@ -107,5 +108,8 @@ class Command(BaseCommand):
                 elif options['verbosity']:
                     self.stdout.write(self.style.SUCCESS(str(count)))
 
+        # Objects are updated in bulk (without sending post_save signals), so invalidate any cached representations
+        invalidate_data_version()
+
         if options['verbosity']:
             self.stdout.write(self.style.SUCCESS("Done."))
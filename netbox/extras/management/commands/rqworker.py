@@ -11,7 +11,8 @@ logger = logging.getLogger('netbox.rqworker')
 class Command(_Command):
     """
     Subclass django_rq's built-in rqworker to listen on all configured queues if none are specified (instead
-    of only the 'default' queue).
+    of only the 'default' queue), and to always run the RQ scheduler (needed for delayed jobs such as batched
+    webhooks).
     """
     def handle(self, *args, **options):
 
@@ -23,4 +24,7 @@ class Command(_Command):
             )
             args = DEFAULT_QUEUES
 
+        # Enable the scheduler so that jobs enqueued with a delay are executed
+        options['with_scheduler'] = True
+
         super().handle(*args, **options)
@@ -0,0 +1,22 @@
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extras', '0066_customfield_name_validation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhook',
+            name='batch_size',
+            field=models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.AddField(
+            model_name='webhook',
+            name='batch_interval',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
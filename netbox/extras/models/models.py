@@ -6,7 +6,7 @@ from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
-from django.core.validators import ValidationError
+from django.core.validators import MinValueValidator, ValidationError
 from django.db import models
 from django.http import HttpResponse
 from django.urls import reverse
@@ -111,6 +111,18 @@ class Webhook(ChangeLoggedModel):
         null=True,
         help_text="A set of conditions which determine whether the webhook will be generated."
     )
+    batch_size = models.PositiveSmallIntegerField(
+        default=1,
+        validators=[MinValueValidator(1)],
+        help_text="The maximum number of events to deliver in a single request. A value greater than 1 enables "
+                  "batched delivery, with events sent together as a JSON array."
+    )
+    batch_interval = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Batch interval (ms)',
+        help_text="The maximum time (in milliseconds) to wait for a batch to fill before it is sent. Zero sends each "
+                  "batch as soon as the triggering request has completed."
+    )
     ssl_verification = models.BooleanField(
         default=True,
         verbose_name='SSL verification',
@@ -148,12 +160,22 @@ class Webhook(ChangeLoggedModel):
             except ValueError as e:
                 raise ValidationError({'conditions': e})
 
+        # A batch interval is meaningful only for batched delivery
+        if self.batch_interval and self.batch_size == 1:
+            raise ValidationError({
+                'batch_interval': 'A batch interval may be set only if the batch size is greater than 1.'
+            })
+
         # CA file path requires SSL verification enabled
         if not self.ssl_verification and self.ca_file_path:
             raise ValidationError({
                 'ca_file_path': 'Do not specify a CA certificate file if SSL verification is disabled.'
             })
 
+    @property
+    def batched(self):
+        return self.batch_size > 1
+
     def render_headers(self, context):
         """
         Render additional_headers and return a dict of Header: Value pairs.
@@ -176,6 +198,16 @@ class Webhook(ChangeLoggedModel):
         else:
             return json.dumps(context, cls=JSONEncoder)
 
+    def render_batch_body(self, events):
+        """
+        Render the body template for a batch of events, if defined. Otherwise, dump the list of event contexts as a
+        JSON array.
+        """
+        if self.body_template:
+            return render_jinja2(self.body_template, {'events': events})
+        else:
+            return json.dumps(events, cls=JSONEncoder)
+
 
 @extras_features('webhooks', 'export_templates')
 class CustomLink(ChangeLoggedModel):
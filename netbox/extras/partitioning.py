@@ -0,0 +1,257 @@
+import re
+from datetime import timedelta
+
+from django.db import connections, DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ObjectChange
+
+__all__ = (
+    'convert_to_partitioned',
+    'create_partitions',
+    'delete_expired_changes',
+    'drop_expired_partitions',
+    'get_partitions',
+    'is_partitioned',
+)
+
+
+# Native partitioning with a primary key on the parent table requires PostgreSQL 11 or later
+MIN_PG_VERSION = 110000
+
+# The number of records removed by each DELETE when purging expired changes row by row
+DELETE_CHUNK_SIZE = 10000
+
+# Matches the bounds of a range partition, e.g. "FOR VALUES FROM (MINVALUE) TO ('2022-01-01 00:00:00+00')"
+PARTITION_BOUNDS = re.compile(r"FROM \((?:'(?P<lower>[^']+)'|MINVALUE)\) TO \('(?P<upper>[^']+)'\)")
+
+# Columns indexed on the ObjectChange table (in addition to the primary key). These match the indexes created by
+# Django, so that the existing indexes are reused when the original table is attached as a partition.
+INDEXED_COLUMNS = (
+    'time',
+    'user_id',
+    'changed_object_type_id',
+    'related_object_type_id',
+)
+
+# Foreign key columns and the tables they reference
+FOREIGN_KEYS = (
+    ('user_id', 'auth_user'),
+    ('changed_object_type_id', 'django_content_type'),
+    ('related_object_type_id', 'django_content_type'),
+)
+
+
+def _table():
+    return ObjectChange._meta.db_table
+
+
+def _month_start(dt):
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(dt):
+    return _month_start(_month_start(dt) + timedelta(days=32))
+
+
+def get_partition_name(start):
+    """
+    Return the name of the partition holding changes for the month beginning at the given time.
+    """
+    return f'{_table()}_y{start.year}m{start.month:02d}'
+
+
+def is_partitioned(using=DEFAULT_DB_ALIAS):
+    """
+    Return True if the ObjectChange table has been converted to a partitioned table.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [_table()])
+        return cursor.fetchone() is not None
+
+
+def get_partitions(using=DEFAULT_DB_ALIAS):
+    """
+    Return a list of (name, lower bound, upper bound) tuples for each partition of the ObjectChange table, ordered by
+    upper bound. Both bounds of the default partition are None, as is the lower bound of a partition starting from
+    MINVALUE.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = %s::regclass",
+            [_table()]
+        )
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        match = PARTITION_BOUNDS.search(bound)
+        if match is None:
+            partitions.append((name, None, None))
+        else:
+            lower = parse_datetime(match.group('lower')) if match.group('lower') else None
+            partitions.append((name, lower, parse_datetime(match.group('upper'))))
+
+    return sorted(partitions, key=lambda p: (p[2] is None, p[2]))
+
+
+def create_partitions(months=3, using=DEFAULT_DB_ALIAS):
+    """
+    Ensure that a partition exists for the current month and for each of the given number of months following it,
+    as well as a default partition to catch any records falling outside of these. Return a list of the partitions
+    created.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    table = _table()
+    default = f'{table}_default'
+    partitions = get_partitions(using)
+    has_default = any(upper is None for _, _, upper in partitions)
+    created = []
+
+    start = _month_start(timezone.now())
+    for _ in range(months + 1):
+        end = _next_month(start)
+
+        # Skip any month already covered by a partition (including the legacy partition for pre-conversion records)
+        covered = any(
+            upper is not None and (lower is None or lower < end) and upper > start for _, lower, upper in partitions
+        )
+        if covered:
+            start = end
+            continue
+
+        name = get_partition_name(start)
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+
+            # A new partition cannot be created while the default partition holds records belonging to it, so any
+            # such records are moved into the new partition
+            relocate = False
+            if has_default:
+                cursor.execute(
+                    f"SELECT EXISTS (SELECT 1 FROM {qn(default)} WHERE time >= %s AND time < %s)", [start, end]
+                )
+                relocate = cursor.fetchone()[0]
+            if relocate:
+                cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(default)}")
+
+            cursor.execute(
+                f"CREATE TABLE {qn(name)} PARTITION OF {qn(table)} FOR VALUES FROM (%s) TO (%s)", [start, end]
+            )
+
+            if relocate:
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM {qn(default)} WHERE time >= %s AND time < %s RETURNING *) "
+                    f"INSERT INTO {qn(name)} SELECT * FROM moved",
+                    [start, end]
+                )
+                cursor.execute(f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(default)} DEFAULT")
+
+        created.append(name)
+        start = end
+
+    if not has_default:
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE TABLE {qn(default)} PARTITION OF {qn(table)} DEFAULT")
+        created.append(default)
+
+    return created
+
+
+def convert_to_partitioned(using=DEFAULT_DB_ALIAS):
+    """
+    Convert the existing ObjectChange table to a table partitioned by month on its time column. The existing table
+    is retained as a single partition holding all records created prior to next month, and is dropped by
+    drop_expired_partitions() once all of its records have expired.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql' or connection.pg_version < MIN_PG_VERSION:
+        raise NotImplementedError("Changelog partitioning requires PostgreSQL 11 or later.")
+
+    qn = connection.ops.quote_name
+    table = _table()
+    legacy = f'{table}_legacy'
+    boundary = _next_month(timezone.now())
+
+    # Build the unique index required by the partitioned table's primary key without locking the existing table
+    # against writes. This is the slowest step on large tables; it will be attached to the parent as-is.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {qn(f'{legacy}_id_time_uniq')} ON {qn(table)} (id, time)"
+        )
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+        sequence = cursor.fetchone()[0]
+
+        # Replace the existing table with a partitioned parent of the same structure
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+        cursor.execute(f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS) PARTITION BY RANGE (time)")
+        cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {qn(table)}.id")
+        cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(f'{table}_id_time_pkey')} PRIMARY KEY (id, time)")
+        for column in INDEXED_COLUMNS:
+            cursor.execute(f"CREATE INDEX ON {qn(table)} ({column})")
+        for column, remote_table in FOREIGN_KEYS:
+            cursor.execute(
+                f"ALTER TABLE {qn(table)} ADD FOREIGN KEY ({column}) REFERENCES {qn(remote_table)} (id) "
+                f"DEFERRABLE INITIALLY DEFERRED"
+            )
+
+        # Replace the existing table's primary key with the unique index built above, so that it is reused as the
+        # partition's primary key (rather than a new index being built while the table is locked)
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'", [legacy]
+        )
+        primary_key = cursor.fetchone()[0]
+        cursor.execute(
+            f"ALTER TABLE {qn(legacy)} DROP CONSTRAINT {qn(primary_key)}, "
+            f"ADD CONSTRAINT {qn(f'{legacy}_id_time_uniq')} PRIMARY KEY USING INDEX {qn(f'{legacy}_id_time_uniq')}"
+        )
+
+        # Attach the existing table as the partition for all prior records
+        cursor.execute(
+            f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(legacy)} FOR VALUES FROM (MINVALUE) TO (%s)",
+            [boundary]
+        )
+
+
+def drop_expired_partitions(cutoff, using=DEFAULT_DB_ALIAS):
+    """
+    Drop all partitions of the ObjectChange table which contain only records older than the cutoff time. Return a
+    list of the partitions dropped.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    dropped = []
+
+    for name, _, upper in get_partitions(using):
+        if upper is None or upper > cutoff:
+            continue
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {qn(_table())} DETACH PARTITION {qn(name)}")
+            cursor.execute(f"DROP TABLE {qn(name)}")
+        dropped.append(name)
+
+    return dropped
+
+
+def delete_expired_changes(cutoff, chunk_size=DELETE_CHUNK_SIZE, using=DEFAULT_DB_ALIAS):
+    """
+    Delete all ObjectChange records older than the cutoff time in chunks, committing each chunk separately to avoid
+    holding long-running locks. Return the number of records deleted.
+    """
+    queryset = ObjectChange.objects.using(using).filter(time__lt=cutoff).order_by()
+    deleted = 0
+
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            break
+        with transaction.atomic(using=using):
+            ObjectChange.objects.using(using).filter(pk__in=pks)._raw_delete(using=using)
+        deleted += len(pks)
+
+    return deleted
@@ -1,8 +1,11 @@
 import importlib
 import logging
 
+from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver, Signal
 from django_prometheus.models import model_deletes, model_inserts, model_updates
 
@@ -10,10 +13,11 @@ from extras.validators import CustomValidator
 from netbox import thread_locals
 from netbox.config import get_config
 from netbox.request_context import get_request
-from netbox.signals import post_clean
+from netbox.signals import post_bulk_create, post_bulk_update, post_clean
+from .cache import invalidate_data_version
 from .choices import ObjectChangeActionChoices
 from .models import ConfigRevision, CustomField, ObjectChange
-from .webhooks import enqueue_object, get_snapshots, serialize_for_webhook
+from .webhooks import enqueue_object, serialize_for_webhook
 
 #
 # Change logging/webhooks
@@ -23,6 +27,19 @@ from .webhooks import enqueue_object, get_snapshots, serialize_for_webhook
 clear_webhooks = Signal()
 
 
+def save_objectchange(objectchange):
+    """
+    Save an ObjectChange, or add it to the current batch of change records if change records are being batched (see
+    batch_change_records()).
+    """
+    batch = getattr(thread_locals, 'objectchange_batch', None)
+    if batch is None:
+        objectchange.save()
+    else:
+        objectchange.user_name = objectchange.user.username
+        batch.append(objectchange)
+
+
 def handle_changed_object(sender, instance, **kwargs):
     """
     Fires when an object is created or updated.
@@ -31,14 +48,6 @@ def handle_changed_object(sender, instance, **kwargs):
         return
 
     request = get_request()
-    m2m_changed = False
-
-    def is_same_object(instance, webhook_data):
-        return (
-            ContentType.objects.get_for_model(instance) == webhook_data['content_type'] and
-            instance.pk == webhook_data['object_id'] and
-            request.id == webhook_data['request_id']
-        )
 
     # Determine the type of change being made
     if kwargs.get('created'):
@@ -46,36 +55,26 @@ def handle_changed_object(sender, instance, **kwargs):
     elif 'created' in kwargs:
         action = ObjectChangeActionChoices.ACTION_UPDATE
     elif kwargs.get('action') in ['post_add', 'post_remove'] and kwargs['pk_set']:
-        # m2m_changed with objects added or removed
-        m2m_changed = True
-        action = ObjectChangeActionChoices.ACTION_UPDATE
+        # m2m_changed with objects added or removed. Mark the object as dirty; its change record and queued webhook
+        # are updated once to reflect its final state when the request has completed.
+        content_type = ContentType.objects.get_for_model(instance)
+        thread_locals.dirty_objects[(content_type, instance.pk)] = instance
+        # Discard any prefetched M2M assignments, which are now stale (e.g. for the API response)
+        if hasattr(instance, '_prefetched_objects_cache'):
+            instance._prefetched_objects_cache = {}
+        return
     else:
         return
 
     # Record an ObjectChange if applicable
     if hasattr(instance, 'to_objectchange'):
-        if m2m_changed:
-            ObjectChange.objects.filter(
-                changed_object_type=ContentType.objects.get_for_model(instance),
-                changed_object_id=instance.pk,
-                request_id=request.id
-            ).update(
-                postchange_data=instance.to_objectchange(action).postchange_data
-            )
-        else:
-            objectchange = instance.to_objectchange(action)
-            objectchange.user = request.user
-            objectchange.request_id = request.id
-            objectchange.save()
+        objectchange = instance.to_objectchange(action)
+        objectchange.user = request.user
+        objectchange.request_id = request.id
+        save_objectchange(objectchange)
 
-    # If this is an M2M change, update the previously queued webhook (from post_save)
-    webhook_queue = thread_locals.webhook_queue
-    if m2m_changed and webhook_queue and is_same_object(instance, webhook_queue[-1]):
-        instance.refresh_from_db()  # Ensure that we're working with fresh M2M assignments
-        webhook_queue[-1]['data'] = serialize_for_webhook(instance)
-        webhook_queue[-1]['snapshots']['postchange'] = get_snapshots(instance, action)['postchange']
-    else:
-        enqueue_object(webhook_queue, instance, request.user, request.id, action)
+    # Enqueue webhooks
+    enqueue_object(thread_locals.webhook_queue, instance, request.user, request.id, action)
 
     # Increment metric counters
     if action == ObjectChangeActionChoices.ACTION_CREATE:
@@ -84,6 +83,93 @@ def handle_changed_object(sender, instance, **kwargs):
         model_updates.labels(instance._meta.model_name).inc()
 
 
+def handle_created_objects(sender, instances, **kwargs):
+    """
+    Fires when objects are created in bulk. Change records for all objects are saved together.
+    """
+    _handle_bulk_changed_objects(sender, instances, ObjectChangeActionChoices.ACTION_CREATE)
+
+
+def handle_updated_objects(sender, instances, **kwargs):
+    """
+    Fires when objects are updated in bulk. Change records for all objects are saved together.
+    """
+    _handle_bulk_changed_objects(sender, instances, ObjectChangeActionChoices.ACTION_UPDATE)
+
+
+def _handle_bulk_changed_objects(sender, instances, action):
+    if not hasattr(sender, 'to_objectchange') or not instances:
+        return
+
+    request = get_request()
+
+    # Record an ObjectChange for each object
+    objectchanges = []
+    for instance in instances:
+        objectchange = instance.to_objectchange(action)
+        objectchange.user = request.user
+        objectchange.user_name = request.user.username
+        objectchange.request_id = request.id
+        objectchanges.append(objectchange)
+    ObjectChange.objects.bulk_create(objectchanges)
+
+    # Enqueue webhooks
+    for instance in instances:
+        enqueue_object(thread_locals.webhook_queue, instance, request.user, request.id, action)
+
+    # Increment metric counters
+    if action == ObjectChangeActionChoices.ACTION_CREATE:
+        model_inserts.labels(sender._meta.model_name).inc(len(instances))
+    else:
+        model_updates.labels(sender._meta.model_name).inc(len(instances))
+
+
+def handle_dirty_objects(request):
+    """
+    Record the final state of each object whose many-to-many assignments were changed during the request. The change
+    record and queued webhook for each object are updated once, regardless of how many M2M changes were made to it.
+    """
+    dirty_objects = thread_locals.dirty_objects
+    if not dirty_objects:
+        return
+
+    # Map each object to the most recent webhook queued for it
+    webhook_queue = thread_locals.webhook_queue
+    queued_webhooks = {
+        (data['content_type'], data['object_id']): data
+        for data in webhook_queue if data['request_id'] == request.id
+    }
+    action = ObjectChangeActionChoices.ACTION_UPDATE
+
+    for (content_type, pk), instance in dirty_objects.items():
+        try:
+            instance.refresh_from_db()  # Ensure that we're working with fresh M2M assignments
+        except ObjectDoesNotExist:
+            # The object's creation was rolled back
+            continue
+        postchange_data = instance.to_objectchange(action).postchange_data
+
+        ObjectChange.objects.filter(
+            changed_object_type=content_type,
+            changed_object_id=pk,
+            request_id=request.id
+        ).update(
+            postchange_data=postchange_data
+        )
+
+        # Update the previously queued webhook (from post_save), or enqueue a new one
+        webhook_data = queued_webhooks.get((content_type, pk))
+        if webhook_data is not None:
+            webhook_data['data'] = serialize_for_webhook(instance)
+            webhook_data['snapshots']['postchange'] = postchange_data
+        else:
+            enqueue_object(webhook_queue, instance, request.user, request.id, action)
+
+        model_updates.labels(instance._meta.model_name).inc()
+
+    dirty_objects.clear()
+
+
 def handle_deleted_object(sender, instance, **kwargs):
     """
     Fires when an object is deleted.
@@ -93,12 +179,15 @@ def handle_deleted_object(sender, instance, **kwargs):
 
     request = get_request()
 
+    # Discard any pending M2M changes to the object
+    thread_locals.dirty_objects.pop((ContentType.objects.get_for_model(instance), instance.pk), None)
+
     # Record an ObjectChange if applicable
     if hasattr(instance, 'to_objectchange'):
         objectchange = instance.to_objectchange(ObjectChangeActionChoices.ACTION_DELETE)
         objectchange.user = request.user
         objectchange.request_id = request.id
-        objectchange.save()
+        save_objectchange(objectchange)
 
     # Enqueue webhooks
     webhook_queue = thread_locals.webhook_queue
@@ -110,13 +199,54 @@ def handle_deleted_object(sender, instance, **kwargs):
 
 def clear_webhook_queue(sender, **kwargs):
     """
-    Delete any queued webhooks (e.g. because of an aborted bulk transaction)
+    Delete any queued webhooks (e.g. because of an aborted bulk transaction), along with any pending M2M changes
     """
     logger = logging.getLogger('webhooks')
     webhook_queue = thread_locals.webhook_queue
 
     logger.info(f"Clearing {len(webhook_queue)} queued webhooks ({sender})")
     webhook_queue.clear()
+    thread_locals.dirty_objects.clear()
+
+
+#
+# Data version invalidation
+#
+
+# Apps whose models do not hold any data represented by NetBox (e.g. sessions, which are saved on each request)
+DATA_VERSION_EXEMPT_APPS = ('admin', 'sessions')
+
+
+@receiver(post_save)
+@receiver(m2m_changed)
+@receiver(post_bulk_create)
+@receiver(post_bulk_update)
+def handle_data_changed(sender, **kwargs):
+    """
+    Invalidate the data version whenever any object is created, modified, or deleted, regardless of whether change
+    logging is enabled (e.g. when objects are modified by a management command or script). Within a request, the data
+    version is invalidated once the request has completed; otherwise, once the current transaction has been committed.
+    """
+    if sender._meta.app_label in DATA_VERSION_EXEMPT_APPS:
+        return
+    if kwargs.get('action', 'post_').startswith('pre_'):
+        return
+    # Ignore the recording of a user's last login
+    if kwargs.get('update_fields') and set(kwargs['update_fields']) == {'last_login'}:
+        return
+
+    if hasattr(thread_locals, 'objects_changed'):
+        thread_locals.objects_changed = True
+    else:
+        transaction.on_commit(invalidate_data_version)
+
+
+# Deletions are handled per model, as any post_delete receiver prevents Django from deleting objects in bulk without
+# first retrieving them. ObjectChanges are exempted so that expired records can still be deleted efficiently; the
+# housekeeping command invalidates the data version itself.
+for model in apps.get_models():
+    if model._meta.app_label not in DATA_VERSION_EXEMPT_APPS and model is not ObjectChange:
+        post_delete.connect(handle_data_changed, sender=model)
 
 
 #
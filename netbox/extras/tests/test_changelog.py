@@ -1,11 +1,22 @@
+import json
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 
 from dcim.choices import SiteStatusChoices
 from dcim.models import Site
 from extras.choices import *
 from extras.models import CustomField, ObjectChange, Tag
+from extras.partitioning import delete_expired_changes
+from users.models import ObjectPermission
 from utilities.testing import APITestCase
 from utilities.testing.utils import create_tags, post_data
 from utilities.testing.views import ModelViewTestCase
@@ -170,6 +181,40 @@ class ChangeLogViewTest(ModelViewTestCase):
         self.assertEqual(objectchange.postchange_data['status'], form_data['status'])
         self.assertEqual(objectchange.postchange_data['description'], form_data['description'])
 
+    def test_bulk_update_objects_with_tags(self):
+        tags = create_tags('Tag 1', 'Tag 2', 'Tag 3')
+        sites = (
+            Site(name='Site 1', slug='site-1'),
+            Site(name='Site 2', slug='site-2'),
+        )
+        Site.objects.bulk_create(sites)
+        for site in sites:
+            site.tags.set([tags[2]])
+
+        form_data = {
+            'pk': [site.pk for site in sites],
+            '_apply': True,
+            'add_tags': [tags[0].pk, tags[1].pk],
+            'remove_tags': [tags[2].pk],
+        }
+
+        request = {
+            'path': self._get_url('bulk_edit'),
+            'data': post_data(form_data),
+        }
+        self.add_permissions('dcim.view_site', 'dcim.change_site', 'extras.view_tag')
+        response = self.client.post(**request)
+        self.assertHttpStatus(response, 302)
+
+        # Each object should have a single change record reflecting its final M2M assignments
+        objectchange = ObjectChange.objects.get(
+            changed_object_type=ContentType.objects.get_for_model(Site),
+            changed_object_id=sites[0].pk
+        )
+        self.assertEqual(objectchange.action, ObjectChangeActionChoices.ACTION_UPDATE)
+        self.assertEqual(objectchange.prechange_data['tags'], ['Tag 3'])
+        self.assertEqual(objectchange.postchange_data['tags'], ['Tag 1', 'Tag 2'])
+
     def test_bulk_delete_objects(self):
         sites = (
             Site(name='Site 1', slug='site-1', status=SiteStatusChoices.STATUS_ACTIVE),
@@ -300,6 +345,52 @@ class ChangeLogAPITest(APITestCase):
         self.assertEqual(oc.postchange_data['custom_fields'], data['custom_fields'])
         self.assertEqual(oc.postchange_data['tags'], ['Tag 3'])
 
+    def test_create_object_rolled_back(self):
+        """
+        An object whose creation (including the assignment of tags) is rolled back due to an object-level permissions
+        violation should not be recorded.
+        """
+        obj_perm = ObjectPermission(name='Test permission', actions=['add'], constraints={'name': 'Site 2'})
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Site))
+
+        data = {
+            'name': 'Site 1',
+            'slug': 'site-1',
+            'tags': [{'name': 'Tag 1'}],
+        }
+        response = self.client.post(reverse('dcim-api:site-list'), data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Site.objects.exists())
+        self.assertEqual(ObjectChange.objects.count(), 0)
+
+    def test_update_object_rolled_back(self):
+        """
+        An update (including the assignment of tags) which is rolled back due to an object-level permissions violation
+        should not be recorded.
+        """
+        site = Site(name='Site 1', slug='site-1')
+        site.save()
+        obj_perm = ObjectPermission(name='Test permission', actions=['change'], constraints={'name': 'Site 1'})
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Site))
+
+        data = {
+            'name': 'Site X',
+            'tags': [{'name': 'Tag 1'}],
+        }
+        url = reverse('dcim-api:site-detail', kwargs={'pk': site.pk})
+        with patch('extras.context_managers.flush_webhooks') as flush_webhooks:
+            response = self.client.patch(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(ObjectChange.objects.count(), 0)
+        self.assertEqual(flush_webhooks.call_args.args[0], [])
+        site.refresh_from_db()
+        self.assertEqual(site.name, 'Site 1')
+        self.assertFalse(site.tags.exists())
+
     def test_delete_object(self):
         site = Site(
             name='Site 1',
@@ -362,6 +453,39 @@ class ChangeLogAPITest(APITestCase):
         self.assertEqual(objectchange.postchange_data['name'], data[0]['name'])
         self.assertEqual(objectchange.postchange_data['slug'], data[0]['slug'])
 
+    def test_bulk_create_objects_with_tags(self):
+        data = [
+            {
+                'name': f'Site {i}',
+                'slug': f'site-{i}',
+                'custom_fields': {
+                    'my_field': 'ABC',
+                },
+                'tags': [
+                    {'name': 'Tag 1'},
+                    {'name': f'Tag {i}'},
+                ],
+            } for i in range(2, 4)
+        ]
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.add_site')
+
+        response = self.client.post(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(ObjectChange.objects.count(), 2)
+
+        for i, site_data in enumerate(response.data, start=2):
+            site = Site.objects.get(pk=site_data['id'])
+            self.assertEqual(sorted(site.tags.names()), sorted(['Tag 1', f'Tag {i}']))
+            self.assertEqual(sorted(tag['name'] for tag in site_data['tags']), sorted(['Tag 1', f'Tag {i}']))
+            objectchange = ObjectChange.objects.get(
+                changed_object_type=ContentType.objects.get_for_model(Site),
+                changed_object_id=site.pk
+            )
+            self.assertEqual(objectchange.user_name, self.user.username)
+            self.assertEqual(objectchange.postchange_data['custom_fields']['my_field'], 'ABC')
+            self.assertEqual(sorted(objectchange.postchange_data['tags']), sorted(['Tag 1', f'Tag {i}']))
+
     def test_bulk_edit_objects(self):
         sites = (
             Site(name='Site 1', slug='site-1'),
@@ -406,6 +530,69 @@ class ChangeLogAPITest(APITestCase):
         self.assertEqual(objectchange.postchange_data['name'], data[0]['name'])
         self.assertEqual(objectchange.postchange_data['slug'], data[0]['slug'])
 
+    def test_bulk_edit_objects_uniform_values(self):
+        sites = (
+            Site(name='Site 1', slug='site-1', status=SiteStatusChoices.STATUS_ACTIVE),
+            Site(name='Site 2', slug='site-2', status=SiteStatusChoices.STATUS_ACTIVE),
+            Site(name='Site 3', slug='site-3', status=SiteStatusChoices.STATUS_ACTIVE),
+        )
+        Site.objects.bulk_create(sites)
+
+        # Set the same status on all sites, and a different name on each
+        data = [
+            {
+                'id': site.pk,
+                'name': f'Site {4 - i}0',
+                'status': SiteStatusChoices.STATUS_PLANNED,
+            } for i, site in enumerate(sites, start=1)
+        ]
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.change_site')
+        start_time = timezone.now()
+
+        response = self.client.patch(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(ObjectChange.objects.count(), 3)
+
+        for i, site in enumerate(sites, start=1):
+            site.refresh_from_db()
+            self.assertEqual(site.name, f'Site {4 - i}0')
+            self.assertEqual(site.status, SiteStatusChoices.STATUS_PLANNED)
+            self.assertGreaterEqual(site.last_updated, start_time)
+            objectchange = ObjectChange.objects.get(
+                changed_object_type=ContentType.objects.get_for_model(Site),
+                changed_object_id=site.pk
+            )
+            self.assertEqual(objectchange.action, ObjectChangeActionChoices.ACTION_UPDATE)
+            self.assertEqual(objectchange.prechange_data['status'], SiteStatusChoices.STATUS_ACTIVE)
+            self.assertEqual(objectchange.postchange_data['status'], SiteStatusChoices.STATUS_PLANNED)
+
+        # Sites should be ordered by their new names
+        self.assertEqual(
+            list(Site.objects.order_by('_name').values_list('name', flat=True)),
+            ['Site 10', 'Site 20', 'Site 30']
+        )
+
+    def test_bulk_edit_objects_duplicate_values(self):
+        sites = (
+            Site(name='Site 1', slug='site-1'),
+            Site(name='Site 2', slug='site-2'),
+        )
+        Site.objects.bulk_create(sites)
+
+        # Assign the same name to both sites
+        data = [{'id': site.pk, 'name': 'Site X'} for site in sites]
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.change_site')
+
+        response = self.client.patch(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(ObjectChange.objects.count(), 0)
+        self.assertEqual(
+            list(Site.objects.order_by('_name').values_list('name', flat=True)),
+            ['Site 1', 'Site 2']
+        )
+
     def test_bulk_delete_objects(self):
         sites = (
             Site(name='Site 1', slug='site-1'),
@@ -443,3 +630,107 @@ class ChangeLogAPITest(APITestCase):
         self.assertEqual(objectchange.prechange_data['name'], 'Site 1')
         self.assertEqual(objectchange.prechange_data['slug'], 'site-1')
         self.assertEqual(objectchange.postchange_data, None)
+
+    def test_bulk_delete_objects_set_based(self):
+        sites = [Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 6)]
+        Site.objects.bulk_create(sites)
+        data = [{'id': site.pk} for site in sites]
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.delete_site')
+
+        # Sites should be deleted together, with their change records saved in bulk
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.delete(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Site.objects.exists())
+        inserts = [q for q in context.captured_queries if q['sql'].startswith('INSERT INTO "extras_objectchange"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(ObjectChange.objects.count(), 5)
+
+
+class ChangeLogListAPITest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        site_ct = ContentType.objects.get_for_model(Site)
+        ObjectChange.objects.bulk_create([
+            ObjectChange(
+                user_name='testuser',
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE,
+                changed_object_type=site_ct,
+                changed_object_id=i,
+                object_repr=f'Site {i}'
+            ) for i in range(1, 6)
+        ])
+
+    def test_list_objects_by_cursor(self):
+        url = reverse('extras-api:objectchange-list')
+        self.add_permissions('extras.view_objectchange')
+        expected_pks = list(ObjectChange.objects.order_by('-time', '-pk').values_list('pk', flat=True))
+
+        # Retrieve the first page
+        response = self.client.get(f'{url}?cursor=&limit=2', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertIsNone(response.data['count'])
+        self.assertIsNone(response.data['previous'])
+        pks = [result['id'] for result in response.data['results']]
+
+        # Follow the next links until all pages have been retrieved
+        while response.data['next']:
+            response = self.client.get(response.data['next'], **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            pks.extend(result['id'] for result in response.data['results'])
+        self.assertEqual(pks, expected_pks)
+
+    def test_list_objects_invalid_cursor(self):
+        url = reverse('extras-api:objectchange-list')
+        self.add_permissions('extras.view_objectchange')
+
+        response = self.client.get(f'{url}?cursor=invalid', **self.header)
+        self.assertHttpStatus(response, status.HTTP_404_NOT_FOUND)
+
+    def test_export_objects(self):
+        url = reverse('extras-api:objectchange-export')
+        self.add_permissions('extras.view_objectchange')
+
+        # Export as NDJSON
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        records = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(sorted(record['changed_object_id'] for record in records), [1, 2, 3, 4, 5])
+
+        # Export as CSV
+        response = self.client.get(f'{url}?export_format=csv', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(lines[0].startswith('id,time,user_name'))
+
+
+class ChangeLogRetentionTest(TestCase):
+
+    def test_delete_expired_changes(self):
+        site_ct = ContentType.objects.get_for_model(Site)
+        now = timezone.now()
+        ObjectChange.objects.bulk_create([
+            ObjectChange(
+                user_name='testuser',
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE,
+                changed_object_type=site_ct,
+                changed_object_id=i,
+                object_repr=f'Site {i}'
+            ) for i in range(1, 8)
+        ])
+
+        # Backdate five of the seven records
+        expired_pks = ObjectChange.objects.order_by('pk').values_list('pk', flat=True)[:5]
+        ObjectChange.objects.filter(pk__in=list(expired_pks)).update(time=now - timedelta(days=30))
+
+        # Delete expired records in chunks smaller than the number of expired records
+        deleted = delete_expired_changes(now - timedelta(days=1), chunk_size=2)
+        self.assertEqual(deleted, 5)
+        self.assertEqual(ObjectChange.objects.count(), 2)
@@ -207,3 +207,38 @@ class ConditionSetTest(TestCase):
         self.assertTrue(cs.eval({'a': 1, 'b': 2, 'c': 9}))
         self.assertFalse(cs.eval({'a': 9, 'b': 2, 'c': 9}))
         self.assertFalse(cs.eval({'a': 9, 'b': 9, 'c': 3}))
+
+
+class CompiledConditionSetTest(TestCase):
+
+    def test_compiled_condition(self):
+        evaluate = Condition('a.b', 1, 'eq').compile()
+        self.assertTrue(evaluate({'a': {'b': 1}}))
+        self.assertFalse(evaluate({'a': {'b': 2}}))
+        self.assertFalse(evaluate({'a': None}))
+        self.assertFalse(evaluate({}))
+
+    def test_compiled_condition_negated(self):
+        evaluate = Condition('x', [1, 2, 3], 'in', negate=True).compile()
+        self.assertFalse(evaluate({'x': 1}))
+        self.assertTrue(evaluate({'x': 9}))
+
+    def test_compiled_mixed(self):
+        ruleset = {
+            'and': [
+                {'attr': 'a', 'value': 1, 'op': 'eq'},
+                {'or': [
+                    {'attr': 'b', 'value': 2, 'op': 'eq'},
+                    {'attr': 'c', 'value': 3, 'op': 'eq', 'negate': True},
+                ]}
+            ]
+        }
+        cs = ConditionSet(ruleset)
+        evaluate = cs.compile()
+        for data in (
+            {'a': 1, 'b': 2, 'c': 3},
+            {'a': 1, 'b': 9, 'c': 3},
+            {'a': 1, 'b': 9, 'c': 9},
+            {'a': 9, 'b': 2, 'c': 9},
+        ):
+            self.assertEqual(evaluate(data), cs.eval(data))
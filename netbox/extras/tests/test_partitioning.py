@@ -0,0 +1,185 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+from unittest import SkipTest
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from dcim.models import Site
+from extras.choices import ObjectChangeActionChoices
+from extras.models import ObjectChange
+from extras.partitioning import (
+    MIN_PG_VERSION, convert_to_partitioned, create_partitions, drop_expired_partitions, get_partition_name,
+    get_partitions, is_partitioned,
+)
+
+TABLE = ObjectChange._meta.db_table
+LEGACY = f'{TABLE}_legacy'
+DEFAULT = f'{TABLE}_default'
+
+
+def month_start(dt, months=0):
+    """
+    Return the start of the month the given number of months after that of the given time.
+    """
+    dt = dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(months):
+        dt = (dt + timedelta(days=32)).replace(day=1)
+    return dt
+
+
+class ChangeLogPartitioningTest(TransactionTestCase):
+    """
+    These tests alter the ObjectChange table itself, so each is run outside of a transaction and the original
+    (non-partitioned) table is restored afterward.
+    """
+    def setUp(self):
+        if connection.pg_version < MIN_PG_VERSION:
+            raise SkipTest("Changelog partitioning requires PostgreSQL 11 or later")
+        self.addCleanup(self.restore_table)
+        self.now = timezone.now()
+        self.site_ct = ContentType.objects.get_for_model(Site)
+
+    def restore_table(self):
+        """
+        Revert the conversion of the ObjectChange table by reinstating the legacy partition as the table.
+        """
+        if not is_partitioned():
+            return
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])
+            sequence = cursor.fetchone()[0]
+            if LEGACY in [name for name, _, _ in get_partitions()]:
+                cursor.execute(f"ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(LEGACY)}")
+            else:
+                # The legacy partition has been dropped, so substitute an empty table of the same structure
+                cursor.execute(f"CREATE TABLE {qn(LEGACY)} (LIKE {qn(TABLE)} INCLUDING ALL)")
+            cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {qn(LEGACY)}.id")
+            cursor.execute(f"DROP TABLE {qn(TABLE)}")
+            cursor.execute(f"ALTER TABLE {qn(LEGACY)} RENAME TO {qn(TABLE)}")
+            cursor.execute(
+                "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'", [TABLE]
+            )
+            primary_key = cursor.fetchone()[0]
+            cursor.execute(
+                f"ALTER TABLE {qn(TABLE)} DROP CONSTRAINT {qn(primary_key)}, "
+                f"ADD CONSTRAINT {qn(f'{TABLE}_pkey')} PRIMARY KEY (id)"
+            )
+
+    def create_changes(self, *times):
+        """
+        Create an ObjectChange recorded at each of the given times.
+        """
+        changes = []
+        for i, time in enumerate(times, start=1):
+            change = ObjectChange.objects.create(
+                user_name='testuser',
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE,
+                changed_object_type=self.site_ct,
+                changed_object_id=i,
+                object_repr=f'Site {i}'
+            )
+            ObjectChange.objects.filter(pk=change.pk).update(time=time)
+            changes.append(change)
+        return changes
+
+    def get_partition_of(self, change):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT tableoid::regclass::text FROM {TABLE} WHERE id = %s", [change.pk])
+            return cursor.fetchone()[0]
+
+    def test_convert_to_partitioned(self):
+        changes = self.create_changes(self.now - timedelta(days=90), self.now)
+        self.assertFalse(is_partitioned())
+
+        convert_to_partitioned()
+
+        # The existing table should be retained as a partition for all records prior to next month
+        self.assertTrue(is_partitioned())
+        self.assertEqual(get_partitions(), [(LEGACY, None, month_start(self.now, 1))])
+        for change in changes:
+            self.assertEqual(self.get_partition_of(change), LEGACY)
+        self.assertEqual(ObjectChange.objects.count(), 2)
+
+        # The primary key should comprise both the ID and time columns
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT a.attname FROM pg_constraint c "
+                "JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey) "
+                "WHERE c.conrelid = %s::regclass AND c.contype = 'p'",
+                [TABLE]
+            )
+            self.assertEqual({row[0] for row in cursor.fetchall()}, {'id', 'time'})
+
+        # New records should continue to be numbered from the existing sequence
+        change = self.create_changes(self.now)[0]
+        self.assertGreater(change.pk, changes[-1].pk)
+
+    def test_create_partitions(self):
+        convert_to_partitioned()
+
+        # The current month is covered by the legacy partition
+        created = create_partitions(months=2)
+        self.assertEqual(created, [
+            get_partition_name(month_start(self.now, 1)),
+            get_partition_name(month_start(self.now, 2)),
+            DEFAULT,
+        ])
+        self.assertEqual(create_partitions(months=2), [])
+
+        # A record beyond the last partition should be held in the default partition
+        change = self.create_changes(month_start(self.now, 4))[0]
+        self.assertEqual(self.get_partition_of(change), DEFAULT)
+
+        # Creating the partition for its month should move the record out of the default partition
+        created = create_partitions(months=4)
+        self.assertEqual(created, [
+            get_partition_name(month_start(self.now, 3)),
+            get_partition_name(month_start(self.now, 4)),
+        ])
+        self.assertEqual(self.get_partition_of(change), get_partition_name(month_start(self.now, 4)))
+        self.assertEqual(get_partitions()[-1], (DEFAULT, None, None))
+
+    def test_drop_expired_partitions(self):
+        self.create_changes(self.now - timedelta(days=90), self.now - timedelta(days=60))
+        convert_to_partitioned()
+        create_partitions(months=1)
+        next_month = month_start(self.now, 1)
+        change = self.create_changes(next_month)[0]
+
+        # A partition should not be dropped while it holds any records newer than the cutoff
+        self.assertEqual(drop_expired_partitions(next_month - timedelta(days=1)), [])
+        self.assertEqual(ObjectChange.objects.count(), 3)
+
+        self.assertEqual(drop_expired_partitions(next_month), [LEGACY])
+        self.assertEqual(list(ObjectChange.objects.values_list('pk', flat=True)), [change.pk])
+        self.assertEqual([name for name, _, _ in get_partitions()], [get_partition_name(next_month), DEFAULT])
+
+    def test_partitionchangelog_command(self):
+
+        # Partitions cannot be created until the table has been converted
+        with self.assertRaises(CommandError):
+            call_command('partitionchangelog', verbosity=0)
+
+        call_command('partitionchangelog', convert=True, months=1, verbosity=0)
+        self.assertTrue(is_partitioned())
+        self.assertEqual(len(get_partitions()), 3)
+
+        # The table cannot be converted twice
+        with self.assertRaises(CommandError):
+            call_command('partitionchangelog', convert=True, verbosity=0)
+
+        stdout = StringIO()
+        call_command('partitionchangelog', months=1, list=True, verbosity=0, stdout=stdout)
+        self.assertEqual(stdout.getvalue().splitlines(), [
+            f'{LEGACY}: MINVALUE to {month_start(self.now, 1)}',
+            f'{get_partition_name(month_start(self.now, 1))}: {month_start(self.now, 1)} to {month_start(self.now, 2)}',
+            f'{DEFAULT}: default',
+        ])
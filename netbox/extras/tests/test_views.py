@@ -146,13 +146,15 @@ class WebhookTestCase(ViewTestCases.PrimaryObjectViewTestCase):
             'http_method': 'GET',
             'http_content_type': 'application/foo',
             'conditions': None,
+            'batch_size': 10,
+            'batch_interval': 5000,
         }
 
         cls.csv_data = (
-            "name,content_types,type_create,payload_url,http_method,http_content_type",
-            "Webhook 4,dcim.site,True,http://example.com/?4,GET,application/json",
-            "Webhook 5,dcim.site,True,http://example.com/?5,GET,application/json",
-            "Webhook 6,dcim.site,True,http://example.com/?6,GET,application/json",
+            "name,content_types,type_create,payload_url,http_method,http_content_type,batch_size,batch_interval",
+            "Webhook 4,dcim.site,True,http://example.com/?4,GET,application/json,1,0",
+            "Webhook 5,dcim.site,True,http://example.com/?5,GET,application/json,10,0",
+            "Webhook 6,dcim.site,True,http://example.com/?6,GET,application/json,10,5000",
         )
 
         cls.bulk_edit_data = {
@@ -6,15 +6,15 @@ import django_rq
 from django.contrib.contenttypes.models import ContentType
 from django.http import HttpResponse
 from django.urls import reverse
-from requests import Session
+from requests import RequestException, Session
 from rest_framework import status
 
 from dcim.choices import SiteStatusChoices
 from dcim.models import Site
 from extras.choices import ObjectChangeActionChoices
 from extras.models import Tag, Webhook
-from extras.webhooks import enqueue_object, flush_webhooks, generate_signature, serialize_for_webhook
-from extras.webhooks_worker import eval_conditions, process_webhook
+from extras.webhooks import enqueue_object, flush_webhooks, generate_signature, get_batch_key, serialize_for_webhook
+from extras.webhooks_worker import eval_conditions, process_webhook, process_webhook_batch
 from utilities.testing import APITestCase
 
 
@@ -252,6 +252,148 @@ class WebhookTest(APITestCase):
             self.assertEqual(job.kwargs['snapshots']['prechange']['name'], sites[i].name)
             self.assertEqual(job.kwargs['snapshots']['prechange']['tags'], ['Bar', 'Foo'])
 
+    def test_enqueue_webhook_batch(self):
+        webhook = Webhook.objects.create(
+            name='Batched Webhook',
+            type_create=True,
+            payload_url='http://localhost/batch/',
+            batch_size=2
+        )
+        webhook.content_types.set([ContentType.objects.get_for_model(Site)])
+        self.addCleanup(self.queue.connection.delete, get_batch_key(webhook))
+
+        # Create multiple objects via the REST API
+        data = [
+            {'name': 'Site 1', 'slug': 'site-1'},
+            {'name': 'Site 2', 'slug': 'site-2'},
+            {'name': 'Site 3', 'slug': 'site-3'},
+        ]
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.add_site')
+        response = self.client.post(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+
+        # Verify that the events were buffered, and a job queued for each full and partial batch
+        batch_jobs = [
+            job for job in self.queue.jobs if job.func_name == 'extras.webhooks_worker.process_webhook_batch'
+        ]
+        self.assertEqual(len(batch_jobs), 2)
+        self.assertEqual(self.queue.count, 5)
+        self.assertEqual(self.queue.connection.llen(get_batch_key(webhook)), 3)
+
+    def test_webhooks_batch_worker(self):
+        webhook = Webhook.objects.create(
+            name='Batched Webhook',
+            type_create=True,
+            payload_url='http://localhost/batch/',
+            secret='LOOKATMEIMASECRETSTRING',
+            batch_size=3,
+            conditions={
+                'and': [
+                    {
+                        'attr': 'status.value',
+                        'value': 'active',
+                    }
+                ]
+            }
+        )
+        webhook.content_types.set([ContentType.objects.get_for_model(Site)])
+        self.addCleanup(self.queue.connection.delete, get_batch_key(webhook))
+
+        def dummy_send(_, request, **kwargs):
+            """
+            A dummy implementation of Session.send() to be used for testing.
+            Always returns a 200 HTTP response.
+            """
+            # Validate the signature of the batch
+            self.assertEqual(request.headers['X-Hook-Signature'], generate_signature(request.body, webhook.secret))
+
+            # Validate that only events matching the webhook conditions were included
+            body = json.loads(request.body)
+            self.assertEqual(len(body), 2)
+            self.assertEqual([event['data']['name'] for event in body], ['Site 1', 'Site 3'])
+            for event in body:
+                self.assertEqual(event['event'], 'created')
+                self.assertEqual(event['model'], 'site')
+                self.assertEqual(event['username'], 'testuser')
+
+            return HttpResponse()
+
+        # Enqueue a batch of webhooks for processing
+        webhooks_queue = []
+        site_statuses = (
+            SiteStatusChoices.STATUS_ACTIVE,
+            SiteStatusChoices.STATUS_PLANNED,
+            SiteStatusChoices.STATUS_ACTIVE,
+        )
+        for i, site_status in enumerate(site_statuses, start=1):
+            site = Site.objects.create(name=f'Site {i}', slug=f'site-{i}', status=site_status)
+            enqueue_object(
+                webhooks_queue,
+                instance=site,
+                user=self.user,
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE
+            )
+        flush_webhooks(webhooks_queue)
+
+        # Retrieve the batch job from queue
+        job = next(
+            job for job in self.queue.jobs if job.func_name == 'extras.webhooks_worker.process_webhook_batch'
+        )
+
+        # Patch the Session object with our dummy_send() method, then process the batch for sending
+        with patch.object(Session, 'send', dummy_send) as mock_send:
+            process_webhook_batch(**job.kwargs)
+        self.assertEqual(self.queue.connection.llen(get_batch_key(webhook)), 0)
+
+    def test_webhooks_batch_worker_failure(self):
+        webhook = Webhook.objects.create(
+            name='Batched Webhook',
+            type_create=True,
+            payload_url='http://localhost/batch/',
+            batch_size=2
+        )
+        webhook.content_types.set([ContentType.objects.get_for_model(Site)])
+        self.addCleanup(self.queue.connection.delete, get_batch_key(webhook))
+
+        def dummy_send_failure(_, request, **kwargs):
+            """
+            Always returns a 500 HTTP response.
+            """
+            return HttpResponse(status=500)
+
+        def dummy_send(_, request, **kwargs):
+            self.assertEqual([event['data']['name'] for event in json.loads(request.body)], ['Site 1', 'Site 2'])
+            return HttpResponse()
+
+        # Enqueue a full batch of webhooks for processing
+        webhooks_queue = []
+        for i in range(1, 3):
+            site = Site.objects.create(name=f'Site {i}', slug=f'site-{i}')
+            enqueue_object(
+                webhooks_queue,
+                instance=site,
+                user=self.user,
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE
+            )
+        flush_webhooks(webhooks_queue)
+        job = next(
+            job for job in self.queue.jobs if job.func_name == 'extras.webhooks_worker.process_webhook_batch'
+        )
+
+        # A failed delivery should leave the events buffered
+        with patch.object(Session, 'send', dummy_send_failure):
+            with self.assertRaises(RequestException):
+                process_webhook_batch(**job.kwargs)
+        self.assertEqual(self.queue.connection.llen(get_batch_key(webhook)), 2)
+
+        # Retrying the job should deliver the same events
+        with patch.object(Session, 'send', dummy_send):
+            process_webhook_batch(**job.kwargs)
+        self.assertEqual(self.queue.connection.llen(get_batch_key(webhook)), 0)
+
     def test_webhook_conditions(self):
         # Create a conditional Webhook
         webhook = Webhook(
@@ -283,6 +425,42 @@ class WebhookTest(APITestCase):
         # Evaluate the conditions (status='active')
         self.assertTrue(eval_conditions(webhook, data))
 
+    def test_enqueue_webhook_conditions(self):
+        webhook = Webhook.objects.create(
+            name='Conditional Webhook',
+            type_create=True,
+            payload_url='http://localhost/conditional/',
+            conditions={
+                'and': [
+                    {
+                        'attr': 'status.value',
+                        'value': 'active',
+                    }
+                ]
+            }
+        )
+        webhook.content_types.set([ContentType.objects.get_for_model(Site)])
+
+        # Enqueue one matching and one non-matching object
+        webhooks_queue = []
+        for site in (
+            Site.objects.create(name='Site 1', slug='site-1', status=SiteStatusChoices.STATUS_ACTIVE),
+            Site.objects.create(name='Site 2', slug='site-2', status=SiteStatusChoices.STATUS_PLANNED),
+        ):
+            enqueue_object(
+                webhooks_queue,
+                instance=site,
+                user=self.user,
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE
+            )
+        flush_webhooks(webhooks_queue)
+
+        # Verify that only the matching object was queued for the conditional webhook
+        jobs = [job for job in self.queue.jobs if job.kwargs['webhook'] == webhook]
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0].kwargs['data']['name'], 'Site 1')
+
     def test_webhooks_worker(self):
 
         request_id = uuid.uuid4()
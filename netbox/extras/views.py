@@ -1,7 +1,9 @@
+import csv
+
 from django.contrib import messages
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Count, Q
-from django.http import Http404, HttpResponseForbidden
+from django.http import Http404, HttpResponseForbidden, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views.generic import View
@@ -11,7 +13,9 @@ from rq import Worker
 from netbox.views import generic
 from utilities.forms import ConfirmationForm
 from utilities.tables import paginate_table
-from utilities.utils import copy_safe_request, count_related, normalize_querydict, shallow_compare_dict
+from utilities.utils import (
+    copy_safe_request, count_related, Echo, iterate_in_chunks, normalize_querydict, shallow_compare_dict,
+)
 from utilities.views import ContentTypePermissionRequiredMixin
 from . import filtersets, forms, tables
 from .choices import JobResultStatusChoices
@@ -366,6 +370,30 @@ class ObjectChangeListView(generic.ObjectListView):
     table = tables.ObjectChangeTable
     template_name = 'extras/objectchange_list.html'
     action_buttons = ('export',)
+    keyset_ordering = ('-time', '-pk')
+
+    def export_table(self, table, columns=None):
+        """
+        Stream the table in CSV format. Records are read in chunks using a server-side cursor, so that memory use
+        remains constant regardless of the size of the changelog.
+        """
+        exclude_columns = self.get_export_exclude_columns(table, columns)
+
+        def stream_rows():
+            writer = csv.writer(Echo())
+            for i, chunk in enumerate(iterate_in_chunks(table.data.data)):
+                chunk_table = self.table(chunk, user=self.request.user)
+                rows = chunk_table.as_values(exclude_columns=exclude_columns)
+                # Write the header row only once
+                if i:
+                    next(rows)
+                for row in rows:
+                    yield writer.writerow(row)
+
+        filename = f'netbox_{self.queryset.model._meta.verbose_name_plural}.csv'
+        response = StreamingHttpResponse(stream_rows(), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
 
 
 class ObjectChangeView(generic.ObjectView):
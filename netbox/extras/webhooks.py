@@ -1,6 +1,9 @@
 import hashlib
 import hmac
+import logging
+import pickle
 from collections import defaultdict
+from datetime import timedelta
 
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
@@ -9,9 +12,15 @@ from django_rq import get_queue
 from utilities.api import get_serializer_for_model
 from utilities.utils import serialize_object
 from .choices import *
+from .conditions import ConditionSet
 from .models import Webhook
 from .registry import registry
 
+logger = logging.getLogger('netbox.webhooks')
+
+# Compiled webhook conditions, mapping each webhook's ID to its last update time and condition evaluator
+_conditions_cache = {}
+
 
 def serialize_for_webhook(instance):
     """
@@ -26,6 +35,36 @@ def serialize_for_webhook(instance):
     return serializer.data
 
 
+def get_conditions_evaluator(webhook):
+    """
+    Return a function which evaluates the conditions of the given webhook. Conditions are compiled once for each
+    version of a saved webhook, and served from a process-local cache thereafter.
+    """
+    if webhook.pk is None:
+        return ConditionSet(webhook.conditions).compile()
+
+    cached = _conditions_cache.get(webhook.pk)
+    if cached is None or cached[0] != webhook.last_updated:
+        cached = _conditions_cache[webhook.pk] = (webhook.last_updated, ConditionSet(webhook.conditions).compile())
+
+    return cached[1]
+
+
+def eval_conditions(webhook, data):
+    """
+    Test whether the given data meets the conditions of the webhook (if any). Return True
+    if met or no conditions are specified.
+    """
+    if not webhook.conditions:
+        return True
+
+    logger.debug(f'Evaluating webhook conditions: {webhook.conditions}')
+    if get_conditions_evaluator(webhook)(data):
+        return True
+
+    return False
+
+
 def get_snapshots(instance, action):
     return {
         'prechange': getattr(instance, '_prechange_snapshot', None),
@@ -67,6 +106,42 @@ def enqueue_object(queue, instance, user, request_id, action):
     })
 
 
+def get_batch_key(webhook):
+    """
+    Return the Redis key under which pending events for a batched webhook are buffered.
+    """
+    return f'netbox:webhooks:batch:{webhook.pk}'
+
+
+def schedule_webhook_batch(rq_queue, webhook):
+    """
+    Schedule the delivery of a partial batch once the webhook's batch interval has elapsed. Only one delivery is
+    scheduled per interval, regardless of how many requests contribute events to the batch.
+    """
+    if not webhook.batch_interval:
+        rq_queue.enqueue('extras.webhooks_worker.process_webhook_batch', webhook=webhook)
+    elif rq_queue.connection.set(f'{get_batch_key(webhook)}:scheduled', 1, nx=True, px=webhook.batch_interval):
+        rq_queue.enqueue_in(
+            timedelta(milliseconds=webhook.batch_interval),
+            'extras.webhooks_worker.process_webhook_batch',
+            webhook=webhook
+        )
+
+
+def enqueue_webhook_batch(rq_queue, webhook, events):
+    """
+    Append a list of events to the webhook's batch buffer. A delivery job is enqueued immediately for each batch
+    filled by these events; any remainder is delivered once the batch interval has elapsed.
+    """
+    length = rq_queue.connection.rpush(get_batch_key(webhook), *[pickle.dumps(event) for event in events])
+    filled = length // webhook.batch_size - (length - len(events)) // webhook.batch_size
+
+    for _ in range(filled):
+        rq_queue.enqueue('extras.webhooks_worker.process_webhook_batch', webhook=webhook)
+    if length % webhook.batch_size:
+        schedule_webhook_batch(rq_queue, webhook)
+
+
 def flush_webhooks(queue):
     """
     Flush a list of object representation to RQ for webhook processing.
@@ -77,6 +152,7 @@ def flush_webhooks(queue):
         'type_update': {},
         'type_delete': {},
     }
+    batches = defaultdict(list)
 
     for data in queue:
 
@@ -97,14 +173,26 @@ def flush_webhooks(queue):
         webhooks = webhooks_cache[action_flag][content_type]
 
         for webhook in webhooks:
-            rq_queue.enqueue(
-                "extras.webhooks_worker.process_webhook",
-                webhook=webhook,
-                model_name=content_type.model,
-                event=data['event'],
-                data=data['data'],
-                snapshots=data['snapshots'],
-                timestamp=str(timezone.now()),
-                username=data['username'],
-                request_id=data['request_id']
-            )
+
+            # Evaluate webhook conditions (if any) before enqueueing the event
+            if not eval_conditions(webhook, data['data']):
+                continue
+
+            event = {
+                'model_name': content_type.model,
+                'event': data['event'],
+                'data': data['data'],
+                'snapshots': data['snapshots'],
+                'timestamp': str(timezone.now()),
+                'username': data['username'],
+                'request_id': data['request_id'],
+            }
+
+            # Defer batched webhooks until all events have been collected
+            if webhook.batched:
+                batches[webhook].append(event)
+            else:
+                rq_queue.enqueue("extras.webhooks_worker.process_webhook", webhook=webhook, **event)
+
+    for webhook, events in batches.items():
+        enqueue_webhook_batch(rq_queue, webhook, events)
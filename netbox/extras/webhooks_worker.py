@@ -1,52 +1,29 @@
 import logging
+import pickle
 
 import requests
 from django.conf import settings
-from django_rq import job
+from django_rq import get_connection, get_queue, job
 from jinja2.exceptions import TemplateError
 
 from .choices import ObjectChangeActionChoices
-from .conditions import ConditionSet
-from .webhooks import generate_signature
+from .webhooks import eval_conditions, generate_signature, get_batch_key, schedule_webhook_batch
 
 logger = logging.getLogger('netbox.webhooks_worker')
 
-
-def eval_conditions(webhook, data):
-    """
-    Test whether the given data meets the conditions of the webhook (if any). Return True
-    if met or no conditions are specified.
-    """
-    if not webhook.conditions:
-        return True
-
-    logger.debug(f'Evaluating webhook conditions: {webhook.conditions}')
-    if ConditionSet(webhook.conditions).eval(data):
-        return True
-
-    return False
+# The maximum time (in seconds) for which a batched webhook's buffer is locked during delivery
+BATCH_LOCK_TIMEOUT = 300
 
 
-@job('default')
-def process_webhook(webhook, model_name, event, data, snapshots, timestamp, username, request_id):
-    """
-    Make a POST request to the defined Webhook
+def send_webhook(webhook, context, body, description):
     """
-    # Evaluate webhook conditions (if any)
-    if not eval_conditions(webhook, data):
-        return
-
-    # Prepare context data for headers & body templates
-    context = {
-        'event': dict(ObjectChangeActionChoices)[event].lower(),
-        'timestamp': timestamp,
-        'model': model_name,
-        'username': username,
-        'request_id': request_id,
-        'data': data,
-        'snapshots': snapshots,
-    }
+    Send the rendered body to the webhook's receiver. The request is signed with the webhook's secret (if any).
 
+    :param webhook: The Webhook being processed
+    :param context: The context used to render additional headers
+    :param body: The rendered request body
+    :param description: A short description of the payload for logging
+    """
     # Build the headers for the HTTP request
     headers = {
         'Content-Type': webhook.http_content_type,
@@ -57,13 +34,6 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
         logger.error(f"Error parsing HTTP headers for webhook {webhook}: {e}")
         raise e
 
-    # Render the request body
-    try:
-        body = webhook.render_body(context)
-    except TemplateError as e:
-        logger.error(f"Error rendering request body for webhook {webhook}: {e}")
-        raise e
-
     # Prepare the HTTP request
     params = {
         'method': webhook.http_method,
@@ -72,7 +42,7 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
         'data': body.encode('utf8'),
     }
     logger.info(
-        f"Sending {params['method']} request to {params['url']} ({context['model']} {context['event']})"
+        f"Sending {params['method']} request to {params['url']} ({description})"
     )
     logger.debug(params)
     try:
@@ -100,3 +70,99 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
         raise requests.exceptions.RequestException(
             f"Status {response.status_code} returned with content '{response.content}', webhook FAILED to process."
         )
+
+
+@job('default')
+def process_webhook(webhook, model_name, event, data, snapshots, timestamp, username, request_id):
+    """
+    Make a POST request to the defined Webhook
+    """
+    # Evaluate webhook conditions (if any)
+    if not eval_conditions(webhook, data):
+        return
+
+    # Prepare context data for headers & body templates
+    context = {
+        'event': dict(ObjectChangeActionChoices)[event].lower(),
+        'timestamp': timestamp,
+        'model': model_name,
+        'username': username,
+        'request_id': request_id,
+        'data': data,
+        'snapshots': snapshots,
+    }
+
+    # Render the request body
+    try:
+        body = webhook.render_body(context)
+    except TemplateError as e:
+        logger.error(f"Error rendering request body for webhook {webhook}: {e}")
+        raise e
+
+    return send_webhook(webhook, context, body, f"{context['model']} {context['event']}")
+
+
+@job('default')
+def process_webhook_batch(webhook):
+    """
+    Deliver up to batch_size buffered events for a batched Webhook in a single request. Events are removed from the
+    buffer only once they have been delivered, so that a failed delivery may be retried.
+    """
+    key = get_batch_key(webhook)
+    connection = get_connection('default')
+
+    # Only one batch may be delivered for a webhook at a time; a concurrent job would otherwise deliver the same events.
+    # Any events left in the buffer are rescheduled by the job holding the lock once its batch has been delivered.
+    lock = connection.lock(f'{key}:lock', timeout=BATCH_LOCK_TIMEOUT, blocking_timeout=0)
+    if not lock.acquire():
+        logger.debug(f"A batch is already being delivered for webhook {webhook}")
+        return
+
+    try:
+        pending = connection.lrange(key, 0, webhook.batch_size - 1)
+
+        # Evaluate webhook conditions (if any) for each event
+        events = []
+        for event in (pickle.loads(e) for e in pending):
+            if not eval_conditions(webhook, event['data']):
+                continue
+            events.append({
+                'event': dict(ObjectChangeActionChoices)[event['event']].lower(),
+                'timestamp': event['timestamp'],
+                'model': event['model_name'],
+                'username': event['username'],
+                'request_id': event['request_id'],
+                'data': event['data'],
+                'snapshots': event['snapshots'],
+            })
+
+        result = None
+        if events:
+
+            # Render the request body
+            try:
+                body = webhook.render_batch_body(events)
+            except TemplateError as e:
+                logger.error(f"Error rendering request body for webhook {webhook}: {e}")
+                raise e
+
+            result = send_webhook(webhook, {'events': events}, body, f"{len(events)} events")
+
+        # The batch has been delivered; remove its events from the buffer
+        with connection.pipeline() as pipe:
+            pipe.ltrim(key, len(pending), -1)
+            pipe.llen(key)
+            _, remaining = pipe.execute()
+
+    finally:
+        lock.release()
+
+    # Arrange for the delivery of any events left in the buffer
+    if remaining:
+        rq_queue = get_queue('default')
+        if remaining >= webhook.batch_size:
+            rq_queue.enqueue('extras.webhooks_worker.process_webhook_batch', webhook=webhook)
+        else:
+            schedule_webhook_batch(rq_queue, webhook)
+
+    return result
@@ -336,6 +336,14 @@ class IPAddressSerializer(PrimaryModelSerializer):
         ]
         read_only_fields = ['family', 'nat_outside']
 
+    def validate(self, data):
+
+        # Force dns_name to lowercase (as IPAddress.save() does), so that objects updated in bulk are consistent
+        if data.get('dns_name'):
+            data['dns_name'] = data['dns_name'].lower()
+
+        return super().validate(data)
+
     @swagger_serializer_method(serializer_or_field=serializers.DictField)
     def get_assigned_object(self, obj):
         if obj.assigned_object is None:
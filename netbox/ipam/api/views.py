@@ -107,6 +107,8 @@ class IPAddressViewSet(CustomFieldModelViewSet):
     )
     serializer_class = serializers.IPAddressSerializer
     filterset_class = filtersets.IPAddressFilterSet
+    # IPAddress.save() only normalizes dns_name, which is also done by the serializer
+    set_based_update = True
 
 
 class FHRPGroupViewSet(CustomFieldModelViewSet):
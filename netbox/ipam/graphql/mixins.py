@@ -1,4 +1,8 @@
 import graphene
+from django.contrib.contenttypes.models import ContentType
+
+from ipam.models import IPAddress
+from netbox.graphql.loaders import ObjectListLoader, get_loader
 
 __all__ = (
     'IPAddressesMixin',
@@ -10,7 +14,14 @@ class IPAddressesMixin:
     ip_addresses = graphene.List('ipam.graphql.types.IPAddressType')
 
     def resolve_ip_addresses(self, info):
-        return self.ip_addresses.restrict(info.context.user, 'view')
+        # Retrieve the IP addresses of all objects of this type within a level of the query together
+        content_type = ContentType.objects.get_for_model(self)
+        loader = get_loader(info, (ObjectListLoader, IPAddress, content_type.pk), lambda: ObjectListLoader(
+            IPAddress.objects.restrict(info.context.user, 'view'),
+            'assigned_object_id',
+            filters={'assigned_object_type': content_type}
+        ))
+        return loader.load(self.pk)
 
 
 class VLANGroupsMixin:
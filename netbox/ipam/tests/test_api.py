@@ -1,5 +1,7 @@
 import json
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from netaddr import IPNetwork
 from rest_framework import status
@@ -543,6 +545,33 @@ class IPAddressTest(APIViewTestCases.APIViewTestCase):
         )
         IPAddress.objects.bulk_create(ip_addresses)
 
+    def test_bulk_update_objects_set_based(self):
+        """
+        IP addresses should be updated in bulk using a constant number of queries, regardless of their number.
+        """
+        self.add_permissions('ipam.change_ipaddress')
+        url = reverse('ipam-api:ipaddress-list')
+        IPAddress.objects.bulk_create([
+            IPAddress(address=IPNetwork(f'10.0.0.{i}/24')) for i in range(1, 21)
+        ])
+
+        update_query_counts = []
+        for ip_addresses in (IPAddress.objects.all()[:2], IPAddress.objects.all()):
+            data = [
+                {'id': ip.pk, 'status': IPAddressStatusChoices.STATUS_RESERVED, 'dns_name': 'HOST.Example.com'}
+                for ip in ip_addresses
+            ]
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.patch(url, data, format='json', **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            update_query_counts.append(len([
+                query for query in context.captured_queries if query['sql'].startswith('UPDATE "ipam_ipaddress"')
+            ]))
+
+        self.assertEqual(update_query_counts, [1, 1])
+        self.assertEqual(IPAddress.objects.filter(status=IPAddressStatusChoices.STATUS_RESERVED).count(), 23)
+        self.assertFalse(IPAddress.objects.exclude(dns_name='host.example.com').exists())
+
 
 class FHRPGroupTest(APIViewTestCases.APIViewTestCase):
     model = FHRPGroup
@@ -607,6 +607,7 @@ class IPAddressListView(generic.ObjectListView):
     filterset = filtersets.IPAddressFilterSet
     filterset_form = forms.IPAddressFilterForm
     table = tables.IPAddressTable
+    count_estimate_threshold = 100000
 
 
 class IPAddressView(generic.ObjectView):
@@ -1,9 +1,14 @@
 from django.conf import settings
+from django.core.cache import cache
 from rest_framework import authentication, exceptions
 from rest_framework.permissions import BasePermission, DjangoObjectPermissions, SAFE_METHODS
 
+from users.cache import get_cached_token, set_cached_token
 from users.models import Token
 
+# The minimum interval (in seconds) between refreshes of a token user's LDAP group memberships
+LDAP_REFRESH_INTERVAL = 300
+
 
 class TokenAuthentication(authentication.TokenAuthentication):
     """
@@ -13,10 +18,13 @@ class TokenAuthentication(authentication.TokenAuthentication):
 
     def authenticate_credentials(self, key):
         model = self.get_model()
-        try:
-            token = model.objects.prefetch_related('user').get(key=key)
-        except model.DoesNotExist:
-            raise exceptions.AuthenticationFailed("Invalid token")
+        token = get_cached_token(key)
+        if token is None:
+            try:
+                token = model.objects.prefetch_related('user').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed("Invalid token")
+            set_cached_token(token)
 
         # Enforce the Token's expiration time, if one has been set.
         if token.is_expired:
@@ -32,13 +40,32 @@ class TokenAuthentication(authentication.TokenAuthentication):
 
             # Load from LDAP if FIND_GROUP_PERMS is active
             if ldap_backend.settings.FIND_GROUP_PERMS:
-                user = ldap_backend.populate_user(token.user.username)
+                user = self.get_ldap_user(ldap_backend, token.user)
                 # If the user is found in the LDAP directory use it, if not fallback to the local user
                 if user:
                     return user, token
 
         return token.user, token
 
+    @staticmethod
+    def get_ldap_user(ldap_backend, user):
+        """
+        Return the given user with its LDAP group memberships attached. The user is refreshed from the LDAP directory
+        at most once per LDAP_REFRESH_INTERVAL; group memberships are cached in the interim. Returns None if the user
+        is not found in the directory.
+        """
+        cache_key = f'ldap_group_names:{user.pk}'
+        group_names = cache.get(cache_key)
+        if group_names is not None:
+            user._ldap_group_names = group_names
+            return user
+
+        user = ldap_backend.populate_user(user.username)
+        if user:
+            cache.set(cache_key, list(user.ldap_user.group_names), LDAP_REFRESH_INTERVAL)
+
+        return user
+
 
 class TokenPermissions(DjangoObjectPermissions):
     """
@@ -1,7 +1,14 @@
 from django.db.models import QuerySet
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from netbox.config import get_config
+from utilities.paginator import (
+    COUNT_ESTIMATE, COUNT_EXACT, COUNT_MODES, COUNT_NONE, decode_cursor, encode_cursor, estimate_count,
+    get_keyset_values, keyset_filter,
+)
 
 
 class OptionalLimitOffsetPagination(LimitOffsetPagination):
@@ -9,22 +16,57 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
     Override the stock paginator to allow setting limit=0 to disable pagination for a request. This returns all objects
     matching a query, but retains the same format as a paginated request. The limit can only be disabled if
     MAX_PAGE_SIZE has been set to 0 or None.
+
+    Views which define a keyset_ordering (by default, all ModelViewSets order by primary key) additionally support
+    keyset (cursor) pagination, enabled by passing the cursor parameter (which may be empty to request the first page).
+    In this mode, each page is retrieved by filtering on the ordering fields of the last object on the preceding page
+    rather than by offset, and the total count is not calculated unless requested by passing count=exact.
+
+    The count parameter may also be used to request an estimated count (count=estimate), or to skip counting
+    altogether (count=none). Views which define a count_estimate_threshold return an estimated count automatically
+    whenever the estimate exceeds the threshold, unless count=exact is passed. An estimated count is indicated by
+    count_estimated in the response.
     """
+    cursor_query_param = 'cursor'
+    cursor_query_description = 'Opaque cursor indicating the page of results to return (empty for the first page).'
+    count_query_param = 'count'
+    count_query_description = 'How to count the total number of results: "exact", "estimate", or "none".'
+
     def __init__(self):
         self.default_limit = get_config().PAGINATE_COUNT
+        self.keyset_ordering = None
+        self.next_cursor = None
+        self.count_exact = True
+        self.count_estimated = False
+        self.has_next = False
 
     def paginate_queryset(self, queryset, request, view=None):
 
-        if isinstance(queryset, QuerySet):
-            self.count = queryset.count()
-        else:
-            # We're dealing with an iterable, not a QuerySet
-            self.count = len(queryset)
+        keyset_ordering = getattr(view, 'keyset_ordering', None)
+        if keyset_ordering and self.cursor_query_param in request.query_params and isinstance(queryset, QuerySet):
+            return self.paginate_queryset_by_keyset(queryset, request, keyset_ordering)
 
         self.limit = self.get_limit(request)
         self.offset = self.get_offset(request)
         self.request = request
 
+        if isinstance(queryset, QuerySet):
+            self.count = self.get_count(queryset, request, view)
+        else:
+            # We're dealing with an iterable, not a QuerySet
+            self.count = len(queryset)
+            self.count_exact = True
+
+        # Without an exact count, retrieve one more object than needed to determine whether another page follows
+        if not self.count_exact:
+            if not self.limit:
+                return list(queryset[self.offset:])
+            results = list(queryset[self.offset:self.offset + self.limit + 1])
+            self.has_next = len(results) > self.limit
+            if self.has_next and self.count is not None and self.template is not None:
+                self.display_page_controls = True
+            return results[:self.limit]
+
         if self.limit and self.count > self.limit and self.template is not None:
             self.display_page_controls = True
 
@@ -36,6 +78,64 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         else:
             return list(queryset[self.offset:])
 
+    def get_count(self, queryset, request, view=None):
+        """
+        Return the total number of objects in the queryset, or an estimate thereof, according to the count parameter.
+        If no count mode has been specified and the view defines a count_estimate_threshold, the count is estimated if
+        the estimate exceeds the threshold. Returns None if counting has been disabled.
+        """
+        count_mode = request.query_params.get(self.count_query_param)
+        threshold = getattr(view, 'count_estimate_threshold', None)
+        self.count_exact = False
+
+        if count_mode == COUNT_NONE:
+            return None
+
+        if count_mode == COUNT_ESTIMATE or (threshold and count_mode not in COUNT_MODES):
+            estimate = estimate_count(queryset)
+            if estimate is not None and (count_mode == COUNT_ESTIMATE or estimate > threshold):
+                self.count_estimated = True
+                return estimate
+
+        self.count_exact = True
+        return queryset.count()
+
+    def paginate_queryset_by_keyset(self, queryset, request, ordering):
+        self.keyset_ordering = ordering
+        self.count_exact = False
+        self.limit = self.get_limit(request)
+        self.offset = 0
+        self.request = request
+
+        # Objects are counted only if requested
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode == COUNT_EXACT:
+            self.count = queryset.count()
+        elif count_mode == COUNT_ESTIMATE:
+            self.count = estimate_count(queryset)
+            self.count_estimated = self.count is not None
+        else:
+            self.count = None
+
+        queryset = queryset.order_by(*ordering)
+        cursor = request.query_params[self.cursor_query_param]
+        if cursor:
+            try:
+                values = decode_cursor(queryset.model, ordering, cursor)
+            except ValueError:
+                raise NotFound("Invalid cursor")
+            queryset = queryset.filter(keyset_filter(ordering, values))
+
+        if not self.limit:
+            return list(queryset)
+
+        results = list(queryset[:self.limit + 1])
+        if len(results) > self.limit:
+            results = results[:self.limit]
+            self.next_cursor = encode_cursor(get_keyset_values(results[-1], ordering))
+
+        return results
+
     def get_limit(self, request):
         if self.limit_query_param:
             try:
@@ -52,18 +152,65 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
 
         return self.default_limit
 
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count_estimated:
+            # Indicate that the count is an estimate, immediately following the count
+            response.data['count_estimated'] = True
+            response.data.move_to_end('count_estimated', last=False)
+            response.data.move_to_end('count', last=False)
+
+        return response
+
     def get_next_link(self):
 
         # Pagination has been disabled
         if not self.limit:
             return None
 
+        # Keyset pagination
+        if self.keyset_ordering:
+            if self.next_cursor is None:
+                return None
+            url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+            return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+        # The count is not exact; determine whether another page follows from the objects retrieved
+        if not self.count_exact:
+            if not self.has_next:
+                return None
+            url = self.request.build_absolute_uri()
+            url = replace_query_param(url, self.limit_query_param, self.limit)
+            return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
         return super().get_next_link()
 
     def get_previous_link(self):
 
-        # Pagination has been disabled
-        if not self.limit:
+        # Pagination has been disabled, or keyset pagination is in use
+        if not self.limit or self.keyset_ordering:
             return None
 
         return super().get_previous_link()
+
+    def get_schema_fields(self, view):
+        fields = super().get_schema_fields(view)
+        fields.append(
+            coreapi.Field(
+                name=self.count_query_param,
+                required=False,
+                location='query',
+                schema=coreschema.String(title='Count', description=self.count_query_description)
+            )
+        )
+        if getattr(view, 'keyset_ordering', None):
+            fields.append(
+                coreapi.Field(
+                    name=self.cursor_query_param,
+                    required=False,
+                    location='query',
+                    schema=coreschema.String(title='Cursor', description=self.cursor_query_description)
+                )
+            )
+
+        return fields
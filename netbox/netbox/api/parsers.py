@@ -0,0 +1,37 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    An alternative to DRF's JSONParser which employs the orjson library (if installed) to parse data. Clients opt in by
+    submitting data with the application/json media type and the parameter engine=orjson.
+    """
+    media_type = 'application/json; engine=orjson'
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        import orjson
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parse MessagePack data using the msgpack library (if installed).
+    """
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        import msgpack
+
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
@@ -1,4 +1,6 @@
-from rest_framework.renderers import BrowsableAPIRenderer
+from netaddr import IPAddress, IPNetwork
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
 
 
 class FormlessBrowsableAPIRenderer(BrowsableAPIRenderer):
@@ -10,3 +12,65 @@ class FormlessBrowsableAPIRenderer(BrowsableAPIRenderer):
 
     def get_filter_form(self, data, view, request):
         return None
+
+
+_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """
+    Encode any type not natively supported by orjson or msgpack (e.g. Decimal, datetime, or netaddr objects) in the
+    same manner as DRF's JSON encoder, so that all renderers produce equivalent representations.
+    """
+    if isinstance(obj, (IPAddress, IPNetwork)):
+        return str(obj)
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    An alternative to DRF's JSONRenderer which employs the orjson library (if installed) to serialize data. Clients opt
+    in by requesting the application/json media type with the parameter engine=orjson. Requests for indented output
+    (as made by the browsable API), and data which orjson cannot represent faithfully (e.g. integers exceeding 64
+    bits), are passed to JSONRenderer.
+    """
+    media_type = 'application/json; engine=orjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        import orjson
+
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=encode_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape the line & paragraph separators as JSONRenderer does, for compatibility with JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Render data as MessagePack using the msgpack library (if installed).
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        import msgpack
+
+        if data is None:
+            return b''
+
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
@@ -0,0 +1,126 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.views import SPEC_RENDERERS, get_schema_view as _get_schema_view
+
+__all__ = (
+    'get_schema_view',
+)
+
+# The length of time (in seconds) for which a rendered schema is held in the shared cache
+CACHE_TIMEOUT = 86400
+
+# The maximum number of rendered schemas held in each process's local cache
+LOCAL_CACHE_SIZE = 16
+
+_local_cache = OrderedDict()
+_local_cache_lock = threading.Lock()
+
+# Serializes the generation of schemas within a process, so that concurrent requests for an uncached schema do not
+# each generate it
+_generate_lock = threading.Lock()
+
+
+def _get_key(request, url):
+    """
+    Return the cache key for the schema requested. The schema is identical for all users (the schema view is public),
+    but depends on the version of NetBox and its installed plugins, as well as on the base URL and format requested.
+    """
+    components = (
+        settings.VERSION,
+        tuple(sorted(settings.PLUGINS)),
+        url,
+        request.version,
+        request.accepted_renderer.format,
+    )
+    return f'openapi_schema:{hashlib.sha256(repr(components).encode()).hexdigest()}'
+
+
+def _get_cached(key):
+    with _local_cache_lock:
+        if key in _local_cache:
+            _local_cache.move_to_end(key)
+            return _local_cache[key]
+
+    schema = cache.get(key)
+    if schema is not None:
+        _set_local(key, schema)
+
+    return schema
+
+
+def _set_cached(key, schema):
+    cache.set(key, schema, CACHE_TIMEOUT)
+    _set_local(key, schema)
+
+
+def _set_local(key, schema):
+    with _local_cache_lock:
+        _local_cache[key] = schema
+        _local_cache.move_to_end(key)
+        while len(_local_cache) > LOCAL_CACHE_SIZE:
+            _local_cache.popitem(last=False)
+
+
+def get_schema_view(info=None, url=None, **kwargs):
+    """
+    Return a drf-yasg schema view which caches the rendered schema (JSON or YAML), rather than introspecting every
+    API endpoint on each request. The rendered schema is held both in the shared cache and in each process, and is
+    served with an ETag so that clients may revalidate a copy they already hold. Accepts the same arguments as
+    drf_yasg.views.get_schema_view().
+
+    Unless a base URL has been configured (via the url argument or the DEFAULT_API_URL setting), the schema omits the
+    API's host and scheme, which clients then take from the URL at which the schema was retrieved. The schema thus never
+    reflects the Host header of the request for which it was generated.
+    """
+    if url is None:
+        url = swagger_settings.DEFAULT_API_URL or ''
+    SchemaView = _get_schema_view(info, url, **kwargs)
+
+    class CachedSchemaView(SchemaView):
+
+        def get(self, request, version='', format=None):
+            renderer = request.accepted_renderer
+
+            # Web UI renderers fetch the schema separately
+            if not isinstance(renderer, SPEC_RENDERERS):
+                return super().get(request, version, format)
+
+            key = _get_key(request, url)
+            schema = _get_cached(key)
+            if schema is None:
+                with _generate_lock:
+                    schema = _get_cached(key)
+                    if schema is None:
+                        schema = self.render_schema(request, version, format)
+                        _set_cached(key, schema)
+
+            content, etag = schema
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = HttpResponse(content, content_type=f'{renderer.media_type}; charset={renderer.charset}')
+            response['ETag'] = etag
+
+            return response
+
+        def render_schema(self, request, version, format):
+            """
+            Generate and render the schema, returning its content along with an ETag derived from it.
+            """
+            response = super().get(request, version, format)
+            content = request.accepted_renderer.render(response.data, request.accepted_media_type, {
+                'request': request,
+                'view': self,
+                'response': response,
+            })
+            etag = '"{}"'.format(hashlib.sha256(content).hexdigest()[:32])
+
+            return content, etag
+
+    return CachedSchemaView
@@ -11,8 +11,29 @@ from utilities.utils import dict_to_filter_params
 
 
 class BaseModelSerializer(serializers.ModelSerializer):
+    """
+    Base serializer for all models. The fields to be serialized may be limited by passing the names of the fields to
+    include (fields) and/or exclude (omit) on initialization.
+    """
     display = serializers.SerializerMethodField(read_only=True)
 
+    def __init__(self, *args, fields=None, omit=None, **kwargs):
+        self.requested_fields = fields
+        self.omitted_fields = omit
+        super().__init__(*args, **kwargs)
+
+    def is_field_requested(self, name):
+        """
+        Return True if the named field has been selected for serialization.
+        """
+        if self.requested_fields is not None and name not in self.requested_fields:
+            return False
+        return not (self.omitted_fields and name in self.omitted_fields)
+
+    def get_field_names(self, declared_fields, info):
+        field_names = super().get_field_names(declared_fields, info)
+        return [name for name in field_names if self.is_field_requested(name)]
+
     def get_display(self, obj):
         return str(obj)
 
@@ -58,7 +79,7 @@ class CustomFieldModelSerializer(ValidatedModelSerializer):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        if self.instance is not None:
+        if self.instance is not None and self.is_field_requested('custom_fields'):
 
             # Retrieve the set of CustomFields which apply to this type of object
             content_type = ContentType.objects.get_for_model(self.Meta.model)
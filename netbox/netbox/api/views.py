@@ -1,3 +1,5 @@
+import hashlib
+import json
 import logging
 import platform
 from collections import OrderedDict
@@ -7,22 +9,43 @@ from django.apps import apps
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
-from django.db import transaction
-from django.db.models import ProtectedError
+from django.db import IntegrityError, router, transaction
+from django.db.models import Model, prefetch_related_objects, ProtectedError, UniqueConstraint
+from django.db.models.deletion import Collector
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch.dispatcher import _make_id
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django_rq.queues import get_connection
+from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
+from rest_framework.serializers import ListSerializer, ModelSerializer
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet as ModelViewSet_
 from rq.worker import Worker
 
-from extras.models import ExportTemplate
+from extras.cache import get_data_version
+from extras.context_managers import batch_change_records
+from extras.models import ExportTemplate, TaggedItem
+from extras.signals import clear_webhooks, handle_data_changed
+from extras.utils import is_taggable
 from netbox.api import BulkOperationSerializer
 from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
 from netbox.api.exceptions import SerializerNotFound
-from utilities.api import get_serializer_for_model
+from netbox.api.serializers import BaseModelSerializer, PrimaryModelSerializer
+from netbox.signals import post_bulk_create, post_bulk_update
+from users.cache import get_permissions_version
+from utilities.api import get_serializer_field_sources, get_serializer_for_model
+from utilities.fields import NaturalOrderingField
+from utilities.utils import iterate_in_chunks
 
 HTTP_ACTIONS = {
     'GET': 'view',
@@ -39,11 +62,80 @@ HTTP_ACTIONS = {
 # Mixins
 #
 
+class BulkCreateModelMixin:
+    """
+    Support the creation of objects in bulk when a list of objects is posted to a model's list endpoint. Rather than
+    saving each object individually, objects are inserted in batches, and their change records and webhooks are
+    processed together. This is possible only for models with simple write semantics: those which neither override
+    save() nor have any pre_save or post_save signal receivers of their own, and whose serializer does not override
+    create(). Objects with many-to-many assignments (other than tags) are always created individually.
+
+    bulk_create: Set to True or False to override the detection of models supporting bulk creation
+    bulk_create_batch_size: The maximum number of objects inserted by each query
+    """
+    bulk_create = None
+    bulk_create_batch_size = 1000
+
+    def supports_bulk_create(self, serializer):
+        """
+        Return True if the objects represented by a ListSerializer may be created in bulk.
+        """
+        model = self.queryset.model
+
+        if self.bulk_create is None:
+            if type(serializer.child).create not in (ModelSerializer.create, PrimaryModelSerializer.create):
+                return False
+            if not _model_supports_bulk_operation(model, 'save', pre_save, post_save):
+                return False
+        elif not self.bulk_create:
+            return False
+
+        m2m_fields = [field.name for field in model._meta.many_to_many if field.name != 'tags']
+        return not any(data.get(name) for data in serializer.validated_data for name in m2m_fields)
+
+    def perform_bulk_create(self, serializer):
+        """
+        Create all objects represented by a ListSerializer in bulk, and return them.
+        """
+        model = self.queryset.model
+        m2m_fields = [field.name for field in model._meta.many_to_many]
+        instances = []
+        tags = []
+
+        for data in serializer.validated_data:
+            data = dict(data)
+            tags.append(data.pop('tags', None) or [])
+            for name in m2m_fields:
+                data.pop(name, None)
+            instances.append(model(**data))
+
+        model.objects.bulk_create(instances, batch_size=self.bulk_create_batch_size)
+
+        # Assign tags
+        if instances and is_taggable(instances[0]):
+            if any(tags):
+                content_type = ContentType.objects.get_for_model(model)
+                TaggedItem.objects.bulk_create([
+                    TaggedItem(content_type=content_type, object_id=instance.pk, tag=tag)
+                    for instance, instance_tags in zip(instances, tags) for tag in instance_tags
+                ], batch_size=self.bulk_create_batch_size)
+            prefetch_related_objects(instances, 'tags')
+
+        post_bulk_create.send(sender=model, instances=instances)
+
+        # Update the serializer as though its objects had been saved
+        serializer.instance = instances
+
+        return instances
+
+
 class BulkUpdateModelMixin:
     """
     Support bulk modification of objects using the list endpoint for a model. Accepts a PATCH action with a list of one
     or more JSON objects, each specifying the numeric ID of an object to be updated as well as the attributes to be set.
-    For example:
+    Where the model and its serializer permit (see supports_set_based_update()), all objects are validated and then
+    updated together, using one query for any attributes set to the same value on all objects and bulk_update() for
+    the rest. For example:
 
     PATCH /api/dcim/sites/
     [
@@ -56,7 +148,13 @@ class BulkUpdateModelMixin:
             "status": "planned"
         }
     ]
+
+    set_based_update: Set to True or False to override the detection of models supporting set-based updates
+    bulk_update_batch_size: The maximum number of objects updated by each bulk_update() query
     """
+    set_based_update = None
+    bulk_update_batch_size = 1000
+
     def bulk_update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
         serializer = BulkOperationSerializer(data=request.data, many=True)
@@ -74,8 +172,101 @@ class BulkUpdateModelMixin:
 
         return Response(data, status=status.HTTP_200_OK)
 
+    def supports_set_based_update(self, update_data):
+        """
+        Return True if the objects may be updated together, rather than by saving each individually. Unless enabled
+        explicitly (by setting set_based_update), this requires that the model neither override save() nor have
+        pre_save/post_save signal receivers of its own, and that its serializer not override update(). No
+        many-to-many assignments (including tags) may be modified in either case.
+        """
+        model = self.queryset.model
+        if self.set_based_update is None:
+            if self.get_serializer_class().update not in (ModelSerializer.update, PrimaryModelSerializer.update):
+                return False
+            if not _model_supports_bulk_operation(model, 'save', pre_save, post_save):
+                return False
+        elif not self.set_based_update:
+            return False
+
+        m2m_fields = {field.name for field in model._meta.many_to_many}
+        return not any(m2m_fields.intersection(data) for data in update_data.values())
+
+    def perform_set_based_update(self, objects, update_data, partial):
+        """
+        Validate and apply the update data to all objects, then save them together. Return the serialized objects.
+        """
+        model = self.queryset.model
+        logger = logging.getLogger('netbox.api.views.ModelViewSet')
+
+        instances = []
+        serializers = []
+        update_fields = set()
+        for obj in objects:
+            if hasattr(obj, 'snapshot'):
+                obj.snapshot()
+            serializer = self.get_serializer(obj, data=update_data.get(obj.id), partial=partial)
+            serializer.is_valid(raise_exception=True)
+            for attr, value in serializer.validated_data.items():
+                setattr(obj, attr, value)
+                update_fields.add(attr)
+            instances.append(obj)
+            serializers.append(serializer)
+
+        if not instances:
+            return []
+        logger.info(f"Updating {len(instances)} {model._meta.verbose_name_plural} in bulk")
+
+        # Perform any processing of field values which would normally occur on save() (e.g. updating last_updated).
+        # A single timestamp is applied to all objects.
+        now = timezone.now()
+        fields = [
+            field for field in model._meta.concrete_fields
+            if not field.primary_key and _is_updated_on_save(field, update_fields)
+        ]
+        for field in fields:
+            for obj in instances:
+                value = now if getattr(field, 'auto_now', False) else field.pre_save(obj, False)
+                setattr(obj, field.attname, value)
+
+        # Attributes set to the same value on all objects are updated in a single query
+        uniform_values = {}
+        varying_fields = []
+        for field in fields:
+            value = getattr(instances[0], field.attname)
+            if all(getattr(obj, field.attname) == value for obj in instances[1:]):
+                uniform_values[field.attname] = value
+            else:
+                varying_fields.append(field.name)
+
+        # Each object has been validated against those in the database, but not against the others being updated
+        _validate_unique_values(model, instances)
+
+        pks = [obj.pk for obj in instances]
+        try:
+            with transaction.atomic():
+                if uniform_values:
+                    model.objects.filter(pk__in=pks).update(**uniform_values)
+                if varying_fields:
+                    model.objects.bulk_update(instances, varying_fields, batch_size=self.bulk_update_batch_size)
+        except IntegrityError as e:
+            raise ValidationError(str(e))
+
+        post_bulk_update.send(sender=model, instances=instances)
+
+        # Enforce object-level permissions
+        try:
+            self._validate_objects(instances)
+        except ObjectDoesNotExist:
+            clear_webhooks.send(sender=self)
+            raise PermissionDenied()
+
+        return [serializer.data for serializer in serializers]
+
     def perform_bulk_update(self, objects, update_data, partial):
         with transaction.atomic():
+            if self.supports_set_based_update(update_data):
+                return self.perform_set_based_update(objects, update_data, partial)
+
             data_list = []
             for obj in objects:
                 data = update_data.get(obj.id)
@@ -103,6 +294,9 @@ class BulkDestroyModelMixin:
         {"id": 123},
         {"id": 456}
     ]
+
+    Objects of models which neither override delete() nor have pre_delete/post_delete signal receivers of their own are
+    deleted together, and their change records saved in bulk.
     """
     def bulk_destroy(self, request, *args, **kwargs):
         serializer = BulkOperationSerializer(data=request.data, many=True)
@@ -115,14 +309,67 @@ class BulkDestroyModelMixin:
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def supports_set_based_destroy(self):
+        """
+        Return True if the objects may be deleted together, rather than by deleting each individually.
+        """
+        return _model_supports_bulk_operation(self.queryset.model, 'delete', pre_delete, post_delete)
+
+    def perform_set_based_destroy(self, objects):
+        """
+        Delete all objects (and any dependent objects) together, recording their changes in bulk.
+        """
+        model = self.queryset.model
+        logger = logging.getLogger('netbox.api.views.ModelViewSet')
+
+        objects = list(objects)
+        if not objects:
+            return
+        logger.info(f"Deleting {len(objects)} {model._meta.verbose_name_plural} in bulk")
+
+        for obj in objects:
+            if hasattr(obj, 'snapshot'):
+                obj.snapshot()
+
+        collector = Collector(using=router.db_for_write(model))
+        collector.collect(objects)
+        with batch_change_records():
+            collector.delete()
+
     def perform_bulk_destroy(self, objects):
         with transaction.atomic():
+            if self.supports_set_based_destroy():
+                return self.perform_set_based_destroy(objects)
+
             for obj in objects:
                 if hasattr(obj, 'snapshot'):
                     obj.snapshot()
                 self.perform_destroy(obj)
 
 
+class ExportModelMixin:
+    """
+    Support the export of all objects matching the specified filters as newline-delimited JSON (one object per line),
+    streamed in a single response. Objects are read in chunks using a server-side cursor, with any related objects
+    prefetched for each chunk, so memory use remains constant regardless of the number of objects exported. For
+    example:
+
+    GET /api/dcim/sites/export/?status=active
+    """
+    export_chunk_size = 1000
+
+    @swagger_auto_schema(auto_schema=None)
+    @action(detail=False, url_path='export')
+    def export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(self.stream_ndjson(queryset), content_type='application/x-ndjson')
+
+    def stream_ndjson(self, queryset):
+        for chunk in iterate_in_chunks(queryset, chunk_size=self.export_chunk_size):
+            for data in self.get_serializer(chunk, many=True).data:
+                yield json.dumps(data, cls=JSONEncoder) + '\n'
+
+
 class ObjectValidationMixin:
 
     def _validate_objects(self, instance):
@@ -140,16 +387,95 @@ class ObjectValidationMixin:
             self.queryset.get(pk=instance.pk)
 
 
+def _model_supports_bulk_operation(model, method, *signals):
+    # Models which override the given method (e.g. save(), including MPTT models) or have receivers of their own for
+    # any of the given signals depend on objects being processed individually. (The receiver which invalidates the data
+    # version is connected for every model, but does not depend on this.)
+    if getattr(model, method) is not getattr(Model, method):
+        return False
+    sender_id = _make_id(model)
+    exempt_id = _make_id(handle_data_changed)
+    for signal in signals:
+        if any(key[1] == sender_id and key[0] != exempt_id for key, _ in signal.receivers):
+            return False
+    return True
+
+
+def _validate_unique_values(model, instances):
+    # Raise a ValidationError if any of the given objects share a value for a unique field (or set of fields)
+    meta = model._meta
+    unique_sets = [(field,) for field in meta.concrete_fields if field.unique and not field.primary_key]
+    unique_sets.extend(
+        tuple(meta.get_field(name) for name in field_names) for field_names in meta.unique_together
+    )
+    unique_sets.extend(
+        tuple(meta.get_field(name) for name in constraint.fields) for constraint in meta.constraints
+        if isinstance(constraint, UniqueConstraint) and constraint.fields and constraint.condition is None
+    )
+
+    for fields in unique_sets:
+        seen = set()
+        for obj in instances:
+            values = tuple(getattr(obj, field.attname) for field in fields)
+            if None in values:
+                continue  # Null values never conflict
+            if values in seen:
+                field_names = ', '.join(field.name for field in fields)
+                raise ValidationError(f"Multiple objects cannot be assigned the same value for {field_names}.")
+            seen.add(values)
+
+
+def _is_updated_on_save(field, update_fields):
+    # Return True if the value of a field is set or updated when saving an object with the given fields modified
+    if field.name in update_fields or getattr(field, 'auto_now', False):
+        return True
+    # A NaturalOrderingField is derived from its target field
+    return isinstance(field, NaturalOrderingField) and field.target_field in update_fields
+
+
+def _parse_field_list(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def _flatten_select_related(lookups, prefix=''):
+    # Convert a nested dictionary of select_related() lookups into a list of lookup strings
+    for name, related_lookups in lookups.items():
+        if related_lookups:
+            yield from _flatten_select_related(related_lookups, f'{prefix}{name}__')
+        else:
+            yield f'{prefix}{name}'
+
+
 #
 # Viewsets
 #
 
-class ModelViewSet(BulkUpdateModelMixin, BulkDestroyModelMixin, ObjectValidationMixin, ModelViewSet_):
+class ModelViewSet(
+    BulkCreateModelMixin, BulkUpdateModelMixin, BulkDestroyModelMixin, ExportModelMixin, ObjectValidationMixin,
+    ModelViewSet_
+):
     """
-    Extend DRF's ModelViewSet to support bulk update and delete functions.
+    Extend DRF's ModelViewSet to support bulk create, update, and delete functions, and the streaming export of
+    objects.
+
+    keyset_ordering: The fields by which objects are ordered when paginating by cursor. These should be indexed, and
+      must end with a unique field (typically the primary key) to guarantee a stable ordering.
+    count_estimate_threshold: If set, return an estimated count of objects (rather than counting them exactly) when
+      the estimate exceeds this number, unless an exact count is requested
+
+    GET requests for models having a last_updated field are answered with an ETag, and any request with a matching
+    If-None-Match header receives an empty 304 (Not Modified) response before any objects are serialized.
+
+    The fields to be returned may be limited by passing a comma-separated list of field names to include (`fields`)
+    and/or to exclude (`omit`). Any related objects and annotations needed only by the excluded fields are then
+    omitted from the queryset.
     """
     brief = False
     brief_prefetch_fields = []
+    keyset_ordering = ('pk',)
+    count_estimate_threshold = None
+    requested_fields = None
+    omitted_fields = None
 
     def get_object_with_snapshot(self):
         """
@@ -167,6 +493,12 @@ class ModelViewSet(BulkUpdateModelMixin, BulkDestroyModelMixin, ObjectValidation
         if isinstance(kwargs.get('data', {}), list):
             kwargs['many'] = True
 
+        # Limit the serialized fields to those requested (if any)
+        if self.requested_fields is not None or self.omitted_fields:
+            if issubclass(self.get_serializer_class(), BaseModelSerializer):
+                kwargs.setdefault('fields', self.requested_fields)
+                kwargs.setdefault('omit', self.omitted_fields)
+
         return super().get_serializer(*args, **kwargs)
 
     def get_serializer_class(self):
@@ -191,12 +523,82 @@ class ModelViewSet(BulkUpdateModelMixin, BulkDestroyModelMixin, ObjectValidation
         if self.brief:
             return super().get_queryset().prefetch_related(None).prefetch_related(*self.brief_prefetch_fields)
 
-        return super().get_queryset()
+        queryset = super().get_queryset()
+        if self.requested_fields is not None or self.omitted_fields:
+            queryset = self.prune_queryset(queryset)
+
+        return queryset
+
+    def is_field_requested(self, name):
+        """
+        Return True if the named field is to be included in the response.
+        """
+        if self.requested_fields is not None and name not in self.requested_fields:
+            return False
+        return not (self.omitted_fields and name in self.omitted_fields)
+
+    def prune_queryset(self, queryset):
+        """
+        Remove from the queryset any related objects (select_related() and prefetch_related() lookups) and
+        annotations which are used only by fields excluded from the response.
+        """
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, BaseModelSerializer):
+            return queryset
+
+        # Determine the model attributes used only by excluded fields. Attributes used by SerializerMethodFields
+        # cannot be determined, so any related objects they use are retained unless named by an excluded field.
+        sources = get_serializer_field_sources(serializer_class)
+        included = {source for name, source in sources.items() if self.is_field_requested(name)}
+        excluded = {source for name, source in sources.items() if not self.is_field_requested(name)} - included
+        excluded.discard(None)
+        if not excluded:
+            return queryset
+
+        def is_needed(lookup):
+            return lookup.split('__')[0] not in excluded
+
+        # Prune prefetch_related() lookups
+        lookups = queryset._prefetch_related_lookups
+        needed_lookups = [
+            lookup for lookup in lookups if is_needed(getattr(lookup, 'prefetch_through', lookup))
+        ]
+        if len(needed_lookups) < len(lookups):
+            queryset = queryset.prefetch_related(None).prefetch_related(*needed_lookups)
+
+        # Prune select_related() lookups
+        if isinstance(queryset.query.select_related, dict):
+            lookups = list(_flatten_select_related(queryset.query.select_related))
+            needed_lookups = [lookup for lookup in lookups if is_needed(lookup)]
+            if len(needed_lookups) < len(lookups):
+                queryset = queryset.select_related(None).select_related(*needed_lookups)
+
+        # Omit unneeded annotations from the SELECT clause. Aggregate annotations (which affect grouping) and those
+        # used for ordering are retained.
+        ordering = {str(field).lstrip('-') for field in queryset.query.order_by}
+        annotations = queryset.query.annotation_select
+        unneeded_annotations = {
+            name for name, annotation in annotations.items()
+            if name in excluded and name not in ordering and not annotation.contains_aggregate
+        }
+        if unneeded_annotations:
+            queryset = queryset.all()
+            queryset.query.set_annotation_mask(set(annotations) - unneeded_annotations)
+
+        return queryset
 
     def initialize_request(self, request, *args, **kwargs):
-        # Check if brief=True has been passed
-        if request.method == 'GET' and request.GET.get('brief'):
-            self.brief = True
+        if request.method == 'GET':
+
+            # Check if brief=True has been passed
+            if request.GET.get('brief'):
+                self.brief = True
+
+            # Check for the fields to be included or excluded
+            if 'fields' in request.GET:
+                self.requested_fields = _parse_field_list(request.GET['fields'])
+            if 'omit' in request.GET:
+                self.omitted_fields = _parse_field_list(request.GET['omit'])
 
         return super().initialize_request(request, *args, **kwargs)
 
@@ -230,7 +632,7 @@ class ModelViewSet(BulkUpdateModelMixin, BulkDestroyModelMixin, ObjectValidation
 
     def list(self, request, *args, **kwargs):
         """
-        Overrides ListModelMixin to allow processing ExportTemplates.
+        Overrides ListModelMixin to allow processing ExportTemplates and conditional requests.
         """
         if 'export' in request.GET:
             content_type = ContentType.objects.get_for_model(self.get_serializer_class().Meta.model)
@@ -238,19 +640,86 @@ class ModelViewSet(BulkUpdateModelMixin, BulkDestroyModelMixin, ObjectValidation
             queryset = self.filter_queryset(self.get_queryset())
             return et.render_to_response(queryset)
 
-        return super().list(request, *args, **kwargs)
+        if not self.supports_etags():
+            return super().list(request, *args, **kwargs)
+
+        # The ETag of a list is derived from the data version alone (which changes whenever any object is created,
+        # modified, or deleted), rather than by querying all matching objects, so that conditional requests do not
+        # defeat the count-free pagination modes.
+        return self.get_conditional_response(
+            request,
+            None,
+            None,
+            lambda: super(ModelViewSet, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Overrides RetrieveModelMixin to allow processing conditional requests.
+        """
+        if not self.supports_etags():
+            return super().retrieve(request, *args, **kwargs)
+
+        instance = self.get_object()
+
+        return self.get_conditional_response(
+            request,
+            instance.last_updated,
+            instance.pk,
+            lambda: Response(self.get_serializer(instance).data)
+        )
+
+    def supports_etags(self):
+        return any(field.name == 'last_updated' for field in self.queryset.model._meta.concrete_fields)
+
+    def get_etag(self, request, *values):
+        """
+        Return an ETag for the response to a GET request, derived from the given values along with the URL and format
+        of the request, the requesting user and the current version of their permissions, and the current data version
+        (which changes whenever any object is created, modified, or deleted).
+        """
+        components = (
+            get_data_version(),
+            get_permissions_version(),
+            request.user.pk,
+            request.accepted_renderer.format,
+            request.get_full_path(),
+            *values,
+        )
+        return '"{}"'.format(hashlib.sha256(repr(components).encode()).hexdigest()[:32])
+
+    def get_conditional_response(self, request, last_updated, key, get_response):
+        """
+        Return a 304 (Not Modified) response if the request's If-None-Match header matches the current ETag, or else
+        the response returned by get_response(). The ETag is computed from last_updated and an additional key.
+        """
+        etag = self.get_etag(request, last_updated, key)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = get_response()
+        response['ETag'] = etag
+        if last_updated is not None:
+            response['Last-Modified'] = http_date(last_updated.timestamp())
+
+        return response
 
     def perform_create(self, serializer):
         model = self.queryset.model
         logger = logging.getLogger('netbox.api.views.ModelViewSet')
-        logger.info(f"Creating new {model._meta.verbose_name}")
+
+        bulk_create = isinstance(serializer, ListSerializer) and self.supports_bulk_create(serializer)
+        if bulk_create:
+            logger.info(f"Creating {len(serializer.validated_data)} new {model._meta.verbose_name_plural} in bulk")
+        else:
+            logger.info(f"Creating new {model._meta.verbose_name}")
 
         # Enforce object-level permissions on save()
         try:
             with transaction.atomic():
-                instance = serializer.save()
+                instance = self.perform_bulk_create(serializer) if bulk_create else serializer.save()
                 self._validate_objects(instance)
         except ObjectDoesNotExist:
+            clear_webhooks.send(sender=self)
             raise PermissionDenied()
 
     def update(self, request, *args, **kwargs):
@@ -269,6 +738,7 @@ class ModelViewSet(BulkUpdateModelMixin, BulkDestroyModelMixin, ObjectValidation
                 instance = serializer.save()
                 self._validate_objects(instance)
         except ObjectDoesNotExist:
+            clear_webhooks.send(sender=self)
             raise PermissionDenied()
 
     def destroy(self, request, *args, **kwargs):
@@ -8,8 +8,11 @@ from django.contrib.auth.models import Group, AnonymousUser
 from django.core.exceptions import ImproperlyConfigured
 from django.db.models import Q
 
+from users.cache import get_cached_permissions, get_permissions_version, set_cached_permissions
 from users.models import ObjectPermission
-from utilities.permissions import permission_is_exempt, resolve_permission, resolve_permission_ct
+from utilities.permissions import (
+    evaluate_constraints, permission_is_exempt, resolve_permission, resolve_permission_ct,
+)
 
 UserModel = get_user_model()
 
@@ -20,12 +23,36 @@ class ObjectPermissionMixin():
         if not user_obj.is_active or user_obj.is_anonymous:
             return dict()
         if not hasattr(user_obj, '_object_perm_cache'):
-            user_obj._object_perm_cache = self.get_object_permissions(user_obj)
+            user_obj._object_perm_cache = self.get_cached_object_permissions(user_obj)
         return user_obj._object_perm_cache
 
     def get_permission_filter(self, user_obj):
         return Q(users=user_obj) | Q(groups__user=user_obj)
 
+    def use_permissions_cache(self, user_obj):
+        """
+        Return True if the user's permissions may be shared across requests via the permissions cache.
+        """
+        return True
+
+    def get_cached_object_permissions(self, user_obj):
+        """
+        Return all permissions granted to the user by an ObjectPermission, retrieving them from the permissions cache
+        where possible. Cached permissions are invalidated whenever ObjectPermissions or their assignments change.
+        """
+        if not self.use_permissions_cache(user_obj):
+            return self.get_object_permissions(user_obj)
+
+        # Retrieve the cache version *before* querying the database, so that any permissions changed in the interim
+        # are not cached under the new version
+        version = get_permissions_version()
+        perms = get_cached_permissions(user_obj.pk, version)
+        if perms is None:
+            perms = self.get_object_permissions(user_obj)
+            set_cached_permissions(user_obj.pk, version, perms)
+
+        return perms
+
     def get_object_permissions(self, user_obj):
         """
         Return all permissions granted to the user by an ObjectPermission.
@@ -44,25 +71,32 @@ class ObjectPermissionMixin():
                     perm_name = f"{object_type.app_label}.{action}_{object_type.model}"
                     perms[perm_name].extend(obj_perm.list_constraints())
 
-        return perms
-
-    def has_perm(self, user_obj, perm, obj=None):
-        app_label, action, model_name = resolve_permission(perm)
+        return dict(perms)
 
+    def get_perm_constraints(self, user_obj, perm):
+        """
+        Return the list of constraint sets governing the user's permission to perform the given action, or None if the
+        permission has not been granted. An empty constraint set grants access to all objects.
+        """
         # Superusers implicitly have all permissions
         if user_obj.is_active and user_obj.is_superuser:
-            return True
+            return [{}]
 
         # Permission is exempt from enforcement (i.e. listed in EXEMPT_VIEW_PERMISSIONS)
         if permission_is_exempt(perm):
-            return True
+            return [{}]
 
         # Handle inactive/anonymous users
         if not user_obj.is_active or user_obj.is_anonymous:
-            return False
+            return None
 
         # If no applicable ObjectPermissions have been created for this user/permission, deny permission
-        if perm not in self.get_all_permissions(user_obj):
+        return self.get_all_permissions(user_obj).get(perm)
+
+    def has_perm(self, user_obj, perm, obj=None):
+        resolve_permission(perm)
+
+        if self.get_perm_constraints(user_obj, perm) is None:
             return False
 
         # If no object has been specified, grant permission. (The presence of a permission in this set tells
@@ -70,26 +104,46 @@ class ObjectPermissionMixin():
         if obj is None:
             return True
 
-        # Sanity check: Ensure that the requested permission applies to the specified object
-        model = obj._meta.model
-        if model._meta.label_lower != '.'.join((app_label, model_name)):
-            raise ValueError(f"Invalid permission {perm} for model {model}")
+        return self.has_perm_for_objects(user_obj, perm, [obj])[0]
 
-        # Compile a query filter that matches all instances of the specified model
-        obj_perm_constraints = self.get_all_permissions(user_obj)[perm]
-        constraints = Q()
-        for perm_constraints in obj_perm_constraints:
-            if perm_constraints:
+    def has_perm_for_objects(self, user_obj, perm, objs):
+        """
+        Return a list of booleans indicating whether the user has the given permission for each of the specified
+        objects. Constraints are evaluated against each object in Python where possible; any objects which cannot be
+        evaluated in this manner are checked against the database using a single query.
+        """
+        app_label, action, model_name = resolve_permission(perm)
+        objs = list(objs)
+
+        obj_perm_constraints = self.get_perm_constraints(user_obj, perm)
+        if obj_perm_constraints is None:
+            return [False] * len(objs)
+
+        # Sanity check: Ensure that the requested permission applies to the specified objects
+        for obj in objs:
+            model = obj._meta.model
+            if model._meta.label_lower != '.'.join((app_label, model_name)):
+                raise ValueError(f"Invalid permission {perm} for model {model}")
+
+        # An ObjectPermission with null constraints grants model-level access
+        if not obj_perm_constraints or not all(obj_perm_constraints):
+            return [True] * len(objs)
+
+        # Evaluate the constraints against each object as loaded. Note that this assumes each object reflects its
+        # database record (i.e. has no unsaved modifications).
+        results = [evaluate_constraints(obj, obj_perm_constraints) for obj in objs]
+
+        # Check any remaining objects against the database
+        pending = [obj.pk for obj, result in zip(objs, results) if result is None]
+        if pending:
+            constraints = Q()
+            for perm_constraints in obj_perm_constraints:
                 constraints |= Q(**perm_constraints)
-            else:
-                # Found ObjectPermission with null constraints; allow model-level access
-                constraints = Q()
-                break
+            model = objs[0]._meta.model
+            permitted = set(model.objects.filter(constraints, pk__in=pending).values_list('pk', flat=True))
+            results = [obj.pk in permitted if result is None else result for obj, result in zip(objs, results)]
 
-        # Permission to perform the requested action on the object depends on whether the specified object matches
-        # the specified constraints. Note that this check is made against the *database* record representing the object,
-        # not the instance itself.
-        return model.objects.filter(constraints, pk=obj.pk).exists()
+        return results
 
 
 class ObjectPermissionBackend(ObjectPermissionMixin, ModelBackend):
@@ -257,11 +311,18 @@ try:
     class NBLDAPBackend(ObjectPermissionMixin, LDAPBackend_):
         def get_permission_filter(self, user_obj):
             permission_filter = super().get_permission_filter(user_obj)
-            if (self.settings.FIND_GROUP_PERMS and
-                    hasattr(user_obj, "ldap_user") and
-                    hasattr(user_obj.ldap_user, "group_names")):
-                permission_filter = permission_filter | Q(groups__name__in=user_obj.ldap_user.group_names)
+            if self.settings.FIND_GROUP_PERMS:
+                # Group memberships may have been cached for an API token's user (see TokenAuthentication)
+                group_names = getattr(user_obj, '_ldap_group_names', None)
+                if group_names is None and hasattr(getattr(user_obj, "ldap_user", None), "group_names"):
+                    group_names = user_obj.ldap_user.group_names
+                if group_names is not None:
+                    permission_filter = permission_filter | Q(groups__name__in=group_names)
             return permission_filter
+
+        def use_permissions_cache(self, user_obj):
+            # Permissions granted via LDAP group membership are specific to the user's LDAP session
+            return not self.settings.FIND_GROUP_PERMS
 except ModuleNotFoundError:
     pass
 
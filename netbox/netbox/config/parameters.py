@@ -146,6 +146,34 @@ PARAMS = (
         description="Enable the GraphQL API",
         field=forms.BooleanField
     ),
+    ConfigParam(
+        name='GRAPHQL_CACHE_TIMEOUT',
+        label='GraphQL cache timeout',
+        default=0,
+        description="Time (in seconds) for which the results of GraphQL queries are cached (set to zero to disable)",
+        field=forms.IntegerField
+    ),
+    ConfigParam(
+        name='GRAPHQL_MAX_COST',
+        label='GraphQL maximum cost',
+        default=0,
+        description="Maximum estimated cost (in objects) of a GraphQL query (set to zero for unlimited)",
+        field=forms.IntegerField
+    ),
+    ConfigParam(
+        name='GRAPHQL_MAX_DEPTH',
+        label='GraphQL maximum depth',
+        default=10,
+        description="Maximum depth of a GraphQL query (set to zero for unlimited)",
+        field=forms.IntegerField
+    ),
+    ConfigParam(
+        name='GRAPHQL_MAX_PAGE_SIZE',
+        label='GraphQL maximum page size',
+        default=1000,
+        description="Maximum number of objects returned by a GraphQL list (set to zero for unlimited)",
+        field=forms.IntegerField
+    ),
     ConfigParam(
         name='CHANGELOG_RETENTION',
         label='Changelog retention',
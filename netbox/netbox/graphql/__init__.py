@@ -1,9 +1,12 @@
 import graphene
+from django.db import models
+from graphene import Dynamic
 from graphene_django.converter import convert_django_field
 from taggit.managers import TaggableManager
 
 from dcim.fields import MACAddressField, WWNField
 from ipam.fields import IPAddressField, IPNetworkField
+from .fields import RelatedObjectField, RelatedObjectListField
 
 
 @convert_django_field.register(TaggableManager)
@@ -21,3 +24,42 @@ def convert_field_to_tags_list(field, registry=None):
 def convert_field_to_string(field, registry=None):
     # TODO: Update to use get_django_field_description under django_graphene v3.0
     return graphene.String(description=field.help_text, required=not field.null)
+
+
+@convert_django_field.register(models.ForeignKey)
+@convert_django_field.register(models.OneToOneField)
+def convert_field_to_related_object(field, registry=None):
+    """
+    Register conversion handler for ForeignKey and OneToOneField, to retrieve related objects in batches
+    """
+    model = field.related_model
+
+    def dynamic_type():
+        _type = registry.get_type_for_model(model)
+        if not _type:
+            return
+
+        return RelatedObjectField(_type, field, description=field.help_text, required=not field.null)
+
+    return Dynamic(dynamic_type)
+
+
+@convert_django_field.register(models.ManyToManyField)
+@convert_django_field.register(models.ManyToManyRel)
+@convert_django_field.register(models.ManyToOneRel)
+def convert_field_to_related_list(field, registry=None):
+    """
+    Register conversion handler for ManyToManyFields and reverse relations, to retrieve related objects in batches
+    """
+    model = field.related_model
+
+    def dynamic_type():
+        _type = registry.get_type_for_model(model)
+        if not _type:
+            return
+
+        description = field.help_text if isinstance(field, models.ManyToManyField) else field.field.help_text
+
+        return RelatedObjectListField(_type, field, required=True, description=description)
+
+    return Dynamic(dynamic_type)
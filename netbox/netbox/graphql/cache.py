@@ -0,0 +1,134 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import partial
+
+from django.core.cache import cache
+from graphql.backend.core import GraphQLCoreBackend
+from graphql.execution import ExecutionResult
+from graphql.validation import validate
+
+from extras.cache import get_data_version
+from users.cache import get_permissions_version
+
+__all__ = (
+    'CachedDocumentBackend',
+    'get_cached_result',
+    'get_persisted_query',
+    'get_query_hash',
+    'set_cached_result',
+    'set_persisted_query',
+)
+
+# The length of time (in seconds) for which a persisted query is held in the shared cache
+PERSISTED_QUERY_TIMEOUT = 86400
+
+# The maximum number of parsed and validated documents held in each process's local cache
+LOCAL_CACHE_SIZE = 256
+
+_local_cache = OrderedDict()
+_local_cache_lock = threading.Lock()
+
+
+def get_query_hash(query):
+    """
+    Return the SHA256 hash of a query string, which identifies it as a persisted query.
+    """
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+#
+# Parsed documents
+#
+
+def _get_invalid_result(errors, *args, **kwargs):
+    return ExecutionResult(errors=errors, invalid=True)
+
+
+class CachedDocumentBackend(GraphQLCoreBackend):
+    """
+    A GraphQL backend which parses and validates each query string once, holding the resulting document in a
+    process-local cache. Documents are cached irrespective of whether they are valid, so that an invalid query returns
+    the same errors each time it is executed. A syntax error is raised (and the query is not cached) as normal.
+    """
+    def document_from_string(self, schema, document_string):
+        key = (id(schema), get_query_hash(document_string))
+
+        with _local_cache_lock:
+            if key in _local_cache:
+                _local_cache.move_to_end(key)
+                return _local_cache[key]
+
+        document = super().document_from_string(schema, document_string)
+        errors = validate(schema, document.document_ast)
+        if errors:
+            document.execute = partial(_get_invalid_result, errors)
+        else:
+            # The document has been validated; skip validation upon execution
+            document.execute = partial(document.execute, validate=False)
+
+        with _local_cache_lock:
+            _local_cache[key] = document
+            _local_cache.move_to_end(key)
+            while len(_local_cache) > LOCAL_CACHE_SIZE:
+                _local_cache.popitem(last=False)
+
+        return document
+
+
+#
+# Persisted queries
+#
+
+def _get_persisted_query_key(query_hash):
+    return f'graphql_query:{query_hash}'
+
+
+def get_persisted_query(query_hash):
+    """
+    Return the query string having the given hash, or None if it has not been persisted.
+    """
+    return cache.get(_get_persisted_query_key(query_hash))
+
+
+def set_persisted_query(query):
+    """
+    Persist a query string under its hash.
+    """
+    cache.set(_get_persisted_query_key(get_query_hash(query)), query, PERSISTED_QUERY_TIMEOUT)
+
+
+#
+# Query results
+#
+
+def _get_result_key(request, query, variables, operation_name):
+    """
+    Return the cache key for the result of a query. The result depends on the requesting user and the current version
+    of their permissions, as well as on the current data version (which changes whenever any object is created,
+    modified, or deleted).
+    """
+    components = (
+        get_data_version(),
+        get_permissions_version(),
+        request.user.pk,
+        get_query_hash(query),
+        json.dumps(variables, sort_keys=True, default=str),
+        operation_name,
+    )
+    return f'graphql_result:{hashlib.sha256(repr(components).encode()).hexdigest()}'
+
+
+def get_cached_result(request, query, variables, operation_name):
+    """
+    Return the cached data resulting from a query (along with its pagination), or None if not cached.
+    """
+    return cache.get(_get_result_key(request, query, variables, operation_name))
+
+
+def set_cached_result(request, query, variables, operation_name, data, timeout):
+    """
+    Cache the data resulting from a query (along with its pagination) for the given number of seconds.
+    """
+    cache.set(_get_result_key(request, query, variables, operation_name), data, timeout)
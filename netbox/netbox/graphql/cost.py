@@ -0,0 +1,174 @@
+from django.core.cache import cache
+from django.db import connection
+from graphql.language import ast
+from graphql.type import GraphQLList, GraphQLNonNull, GraphQLObjectType
+
+from .pagination import get_page_size
+
+__all__ = (
+    'QueryCost',
+    'estimate_query_cost',
+    'get_table_sizes',
+)
+
+# The cache key and timeout (in seconds) for the estimated number of rows in each database table
+TABLE_SIZES_KEY = 'graphql_table_sizes'
+TABLE_SIZES_TIMEOUT = 3600
+
+
+class QueryCost:
+    """
+    The estimated cost of a GraphQL query: `cost` is the estimated number of objects to be resolved, and `depth` is the
+    maximum nesting of object fields.
+    """
+    def __init__(self, cost=0, depth=0):
+        self.cost = cost
+        self.depth = depth
+
+    def __repr__(self):
+        return f'<QueryCost cost={self.cost} depth={self.depth}>'
+
+
+def get_table_sizes():
+    """
+    Return a dictionary mapping each database table to its estimated number of rows, as recorded in PostgreSQL's
+    statistics (which are maintained by ANALYZE and autovacuum). Estimates are cached, as they need not be precise.
+    """
+    table_sizes = cache.get(TABLE_SIZES_KEY)
+    if table_sizes is None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT relname, reltuples FROM pg_class WHERE relkind IN ('r', 'p') AND pg_table_is_visible(oid)"
+            )
+            # reltuples is negative for tables which have never been analyzed
+            table_sizes = {name: max(int(rows), 0) for name, rows in cursor.fetchall()}
+        cache.set(TABLE_SIZES_KEY, table_sizes, TABLE_SIZES_TIMEOUT)
+
+    return table_sizes
+
+
+def _get_model(graphql_type):
+    graphene_type = getattr(graphql_type, 'graphene_type', None)
+    return getattr(getattr(graphene_type, '_meta', None), 'model', None)
+
+
+def _unwrap(graphql_type):
+    """
+    Return the named type wrapped by any NonNull and List types, and whether a list is returned.
+    """
+    is_list = False
+    while isinstance(graphql_type, (GraphQLNonNull, GraphQLList)):
+        if isinstance(graphql_type, GraphQLList):
+            is_list = True
+        graphql_type = graphql_type.of_type
+
+    return graphql_type, is_list
+
+
+def _get_int_argument(selection, name, variables):
+    """
+    Return the integer value of a field's argument (given either literally or as a variable), or None.
+    """
+    for argument in selection.arguments or ():
+        if argument.name.value == name:
+            value = argument.value
+            if isinstance(value, ast.Variable):
+                value = (variables or {}).get(value.name.value)
+            elif isinstance(value, ast.IntValue):
+                value = int(value.value)
+            return value if type(value) is int else None
+
+    return None
+
+
+def estimate_query_cost(schema, document_ast, operation_name=None, variables=None):
+    """
+    Estimate the cost of executing a parsed GraphQL query prior to its execution. Each field returning objects costs
+    the number of objects it is expected to return for all of its parents: A list at the root of the query is assumed to
+    return every object of its type (up to the page size requested), and a nested list the average number of related
+    objects per parent, as estimated from the sizes of the tables involved. Filters are ignored, so the estimate
+    represents an upper bound.
+    """
+    operations = []
+    fragments = {}
+    for definition in document_ast.definitions:
+        if isinstance(definition, ast.OperationDefinition):
+            operations.append(definition)
+        elif isinstance(definition, ast.FragmentDefinition):
+            fragments[definition.name.value] = definition
+
+    # Identify the operation to be executed
+    if operation_name:
+        operations = [op for op in operations if op.name and op.name.value == operation_name]
+    if len(operations) != 1:
+        # Leave the reporting of an invalid operation to the executor
+        return QueryCost()
+    operation = operations[0]
+
+    root_type = {
+        'query': schema.get_query_type(),
+        'mutation': schema.get_mutation_type(),
+    }.get(operation.operation)
+    if root_type is None:
+        return QueryCost()
+
+    table_sizes = get_table_sizes()
+
+    def get_size(model):
+        return table_sizes.get(model._meta.db_table, 0) if model else 0
+
+    def walk(selection_set, parent_type, parent_count, depth, visited_fragments):
+        cost = 0
+        max_depth = depth
+
+        for selection in selection_set.selections:
+
+            # Fragments are evaluated as though their fields were selected directly
+            if isinstance(selection, (ast.FragmentSpread, ast.InlineFragment)):
+                if isinstance(selection, ast.FragmentSpread):
+                    name = selection.name.value
+                    if name in visited_fragments or name not in fragments:
+                        continue
+                    fragment = fragments[name]
+                    visited_fragments = visited_fragments | {name}
+                else:
+                    fragment = selection
+                fragment_type = parent_type
+                if fragment.type_condition:
+                    fragment_type = schema.get_type(fragment.type_condition.name.value) or parent_type
+                fragment_cost, fragment_depth = walk(
+                    fragment.selection_set, fragment_type, parent_count, depth, visited_fragments
+                )
+                cost += fragment_cost
+                max_depth = max(max_depth, fragment_depth)
+                continue
+
+            if selection.selection_set is None or not isinstance(parent_type, GraphQLObjectType):
+                continue
+            field = parent_type.fields.get(selection.name.value)
+            if field is None:
+                continue
+            field_type, is_list = _unwrap(field.type)
+
+            # Estimate the number of objects returned by this field for each parent
+            count = parent_count
+            if is_list:
+                model = _get_model(field_type)
+                if parent_type is root_type:
+                    requested = _get_int_argument(selection, 'first', variables)
+                    if requested is None:
+                        requested = _get_int_argument(selection, 'limit', variables)
+                    page_size = get_page_size(requested)
+                    count = min(get_size(model), page_size) if page_size else get_size(model)
+                else:
+                    count = parent_count * get_size(model) / max(get_size(_get_model(parent_type)), 1)
+
+            child_cost, child_depth = walk(selection.selection_set, field_type, count, depth + 1, visited_fragments)
+            cost += count + child_cost
+            max_depth = max(max_depth, child_depth)
+
+        return cost, max_depth
+
+    cost, depth = walk(operation.selection_set, root_type, 1, 0, frozenset())
+
+    return QueryCost(cost=round(cost), depth=depth)
@@ -3,11 +3,15 @@ from functools import partial
 import graphene
 from graphene_django import DjangoListField
 
+from .loaders import ObjectListLoader, ObjectLoader, get_loader
+from .pagination import PAGINATION_ARGS, paginate_queryset
 from .utils import get_graphene_type
 
 __all__ = (
     'ObjectField',
     'ObjectListField',
+    'RelatedObjectField',
+    'RelatedObjectListField',
 )
 
 
@@ -38,7 +42,8 @@ class ObjectField(graphene.Field):
 
 class ObjectListField(DjangoListField):
     """
-    Retrieve a list of objects, optionally filtered by one or more FilterSet filters.
+    Retrieve a list of objects, optionally filtered by one or more FilterSet filters. The list may be ordered and
+    paginated, either by limit and offset or by cursor (first and after), up to GRAPHQL_MAX_PAGE_SIZE objects.
     """
     def __init__(self, _type, *args, **kwargs):
 
@@ -51,10 +56,21 @@ class ObjectListField(DjangoListField):
             field_type = get_graphene_type(type(filter_field))
             filter_kwargs[filter_name] = graphene.Argument(field_type)
 
+        # Pagination and ordering kwargs
+        filter_kwargs.update({
+            'limit': graphene.Int(),
+            'offset': graphene.Int(),
+            'first': graphene.Int(),
+            'after': graphene.String(),
+            'ordering': graphene.List(graphene.String),
+        })
+
         super().__init__(_type, args=filter_kwargs, *args, **kwargs)
 
     @staticmethod
     def list_resolver(django_object_type, resolver, default_manager, root, info, **args):
+        pagination_args = {name: args.pop(name) for name in PAGINATION_ARGS if name in args}
+
         # Get the QuerySet from the object type
         queryset = django_object_type.get_queryset(default_manager, info)
 
@@ -62,4 +78,74 @@ class ObjectListField(DjangoListField):
         filterset_class = django_object_type._meta.filterset_class
         filterset = filterset_class(data=args, queryset=queryset, request=info.context)
 
-        return filterset.qs
+        return paginate_queryset(filterset.qs, info, **pagination_args)
+
+
+class RelatedObjectField(graphene.Field):
+    """
+    Retrieve the object referenced by a ForeignKey or OneToOneField. The related objects of all parent objects within a
+    level of the query are retrieved together. Any resolver defined explicitly on the parent object type takes
+    precedence.
+    """
+    def __init__(self, _type, model_field, *args, **kwargs):
+        self.model_field = model_field
+        super().__init__(_type, *args, **kwargs)
+
+    @staticmethod
+    def related_object_resolver(model_field, root, info, **args):
+        # Return the related object if it has already been retrieved (e.g. using select_related())
+        if model_field.is_cached(root):
+            return getattr(root, model_field.name)
+
+        value = getattr(root, model_field.attname)
+        if value is None:
+            return None
+
+        model = model_field.related_model
+        field_name = model_field.target_field.name
+        loader = get_loader(
+            info,
+            (ObjectLoader, model, field_name),
+            partial(ObjectLoader, model._default_manager.all(), field_name)
+        )
+        return loader.load(value)
+
+    def get_resolver(self, parent_resolver):
+        # Default resolvers are partials; those defined on the object type are plain functions
+        if not isinstance(parent_resolver, partial):
+            return parent_resolver
+        return partial(self.related_object_resolver, self.model_field)
+
+
+class RelatedObjectListField(DjangoListField):
+    """
+    Retrieve the objects related by a reverse ForeignKey or a ManyToManyField. The related objects of all parent objects
+    within a level of the query are retrieved using a single query, to which the object type's get_queryset() (and
+    therefore any object permissions) is applied. Any resolver defined explicitly on the parent object type takes
+    precedence.
+    """
+    def __init__(self, _type, model_field, *args, **kwargs):
+        self.model_field = model_field
+        super().__init__(_type, *args, **kwargs)
+
+    @staticmethod
+    def related_list_resolver(django_object_type, model_field, root, info, **args):
+        # Determine the lookup relating each object to its parent
+        if model_field.concrete:
+            lookup = model_field.related_query_name()  # ManyToManyField
+        else:
+            lookup = model_field.field.name  # ManyToOneRel or ManyToManyRel
+
+        model = django_object_type._meta.model
+        loader = get_loader(
+            info,
+            (ObjectListLoader, model, lookup),
+            lambda: ObjectListLoader(django_object_type.get_queryset(model._default_manager.all(), info), lookup)
+        )
+        return loader.load(root.pk)
+
+    def get_resolver(self, parent_resolver):
+        # Default resolvers are partials; those defined on the object type are plain functions
+        if not isinstance(parent_resolver, partial):
+            return super().get_resolver(parent_resolver)
+        return partial(self.related_list_resolver, self._underlying_type, self.model_field)
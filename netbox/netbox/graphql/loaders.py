@@ -0,0 +1,67 @@
+from collections import defaultdict
+
+from django.db.models import F
+from promise import Promise
+from promise.dataloader import DataLoader
+
+__all__ = (
+    'ObjectListLoader',
+    'ObjectLoader',
+    'get_loader',
+)
+
+
+def get_loader(info, key, loader_factory):
+    """
+    Return the loader identified by key for the current request, creating it by calling loader_factory() if it does not
+    yet exist. Loaders (and the objects they have loaded) are discarded at the end of each request, so that a loader
+    never returns objects to which a different user does not have access.
+    """
+    request = info.context
+    if not hasattr(request, 'graphql_loaders'):
+        request.graphql_loaders = {}
+    if key not in request.graphql_loaders:
+        request.graphql_loaders[key] = loader_factory()
+
+    return request.graphql_loaders[key]
+
+
+class ObjectLoader(DataLoader):
+    """
+    Load individual objects from a QuerySet by the value of a unique field (the primary key by default). The objects
+    requested by all resolvers within a level of the query are retrieved using a single query.
+    """
+    def __init__(self, queryset, field_name='pk'):
+        super().__init__()
+        self.queryset = queryset
+        self.field_name = field_name
+
+    def batch_load_fn(self, keys):
+        objects = self.queryset.in_bulk(keys, field_name=self.field_name)
+        return Promise.resolve([objects.get(key) for key in keys])
+
+
+class ObjectListLoader(DataLoader):
+    """
+    Load lists of objects from a QuerySet, grouped by the value of a lookup (e.g. the ForeignKey to a parent object).
+    The objects requested by all resolvers within a level of the query are retrieved using a single query. Any
+    additional filters are applied together with the lookup, in a single call to filter(), so that lookups spanning a
+    multi-valued relationship apply to the same related object.
+    """
+    def __init__(self, queryset, lookup, filters=None):
+        super().__init__()
+        self.queryset = queryset
+        self.lookup = lookup
+        self.filters = filters or {}
+
+    def batch_load_fn(self, keys):
+        objects = defaultdict(list)
+        queryset = self.queryset.filter(
+            **{f'{self.lookup}__in': keys}, **self.filters
+        ).annotate(
+            _loader_key=F(self.lookup)
+        )
+        for obj in queryset:
+            objects[obj._loader_key].append(obj)
+
+        return Promise.resolve([objects[key] for key in keys])
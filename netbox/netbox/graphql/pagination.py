@@ -0,0 +1,101 @@
+from django.core.exceptions import FieldDoesNotExist
+from graphql import GraphQLError
+
+from netbox.config import get_config
+from utilities.paginator import decode_cursor, encode_cursor, get_keyset_values, keyset_filter
+
+__all__ = (
+    'PAGINATION_ARGS',
+    'get_page_size',
+    'paginate_queryset',
+)
+
+# The arguments accepted by list fields to control pagination and ordering
+PAGINATION_ARGS = ('limit', 'offset', 'first', 'after', 'ordering')
+
+
+def get_page_size(requested=None):
+    """
+    Return the number of objects to return for the requested page size, enforcing GRAPHQL_MAX_PAGE_SIZE. If no page
+    size was requested (or a page size of zero), the maximum page size is returned. Returns None if no limit applies.
+    """
+    max_page_size = get_config().GRAPHQL_MAX_PAGE_SIZE
+    if max_page_size:
+        return min(requested, max_page_size) if requested else max_page_size
+    return requested or None
+
+
+def _get_ordering(model, ordering, keyset=False):
+    """
+    Validate the requested ordering, which may comprise only concrete, non-relational fields of the model. Fields
+    which may be null cannot be used for keyset pagination.
+    """
+    for name in ordering:
+        field_name = name[1:] if name.startswith('-') else name
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            field = None
+        if field is None or not field.concrete or field.is_relation:
+            raise GraphQLError(f"Invalid ordering field: {field_name}")
+        if keyset and field.null:
+            raise GraphQLError(f"Cannot order by {field_name} using cursor pagination, as it may be null.")
+
+    return list(ordering)
+
+
+def paginate_queryset(queryset, info, limit=None, offset=None, first=None, after=None, ordering=None):
+    """
+    Return a page of objects from the QuerySet in the requested ordering. Pages are requested either by limit and
+    offset, or by keyset (cursor) using first and after. The number of objects returned never exceeds
+    GRAPHQL_MAX_PAGE_SIZE. Whether another page follows (and the cursor with which to request it) is recorded on the
+    request, to be returned in the response's extensions.
+    """
+    model = queryset.model
+    keyset = first is not None or after is not None
+    if keyset and (limit is not None or offset is not None):
+        raise GraphQLError("The limit and offset arguments cannot be combined with first and after.")
+    if any(value is not None and value < 0 for value in (limit, offset, first)):
+        raise GraphQLError("The limit, offset, and first arguments must not be negative.")
+
+    ordering = _get_ordering(model, ordering or [], keyset=keyset)
+    page_size = get_page_size(first if keyset else limit)
+
+    if keyset:
+        # Order by primary key last, so that the keyset identifies a unique position
+        if not {name.lstrip('-') for name in ordering} & {'pk', 'id'}:
+            ordering.append('pk')
+        queryset = queryset.order_by(*ordering)
+        if after:
+            try:
+                values = decode_cursor(model, ordering, after)
+            except ValueError:
+                raise GraphQLError("Invalid cursor")
+            queryset = queryset.filter(keyset_filter(ordering, values))
+    else:
+        if ordering:
+            queryset = queryset.order_by(*ordering, 'pk')
+        if offset:
+            queryset = queryset[offset:]
+
+    # Retrieve one more object than needed to determine whether another page follows
+    if page_size is None:
+        results = list(queryset)
+        has_next = False
+    else:
+        results = list(queryset[:page_size + 1])
+        has_next = len(results) > page_size
+        results = results[:page_size]
+
+    page_info = {
+        'has_next': has_next,
+    }
+    if keyset:
+        page_info['next_cursor'] = encode_cursor(get_keyset_values(results[-1], ordering)) if has_next else None
+
+    request = info.context
+    if not hasattr(request, 'graphql_pagination'):
+        request.graphql_pagination = {}
+    request.graphql_pagination['.'.join(str(key) for key in info.path)] = page_info
+
+    return results
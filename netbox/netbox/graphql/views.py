@@ -1,17 +1,29 @@
+import json
+
 from django.conf import settings
 from django.contrib.auth.views import redirect_to_login
-from django.http import HttpResponseNotFound, HttpResponseForbidden
+from django.http import HttpResponseBadRequest, HttpResponseNotFound, HttpResponseForbidden
 from django.urls import reverse
-from graphene_django.views import GraphQLView as GraphQLView_
+from graphene_django.views import GraphQLView as GraphQLView_, HttpError
+from graphql import GraphQLError
+from graphql.execution import ExecutionResult
 from rest_framework.exceptions import AuthenticationFailed
 
 from netbox.api.authentication import TokenAuthentication
 from netbox.config import get_config
+from netbox.graphql.cache import (
+    CachedDocumentBackend, get_cached_result, get_persisted_query, get_query_hash, set_cached_result,
+    set_persisted_query,
+)
+from netbox.graphql.cost import estimate_query_cost
+
+document_backend = CachedDocumentBackend()
 
 
 class GraphQLView(GraphQLView_):
     """
-    Extends graphene_django's GraphQLView to support DRF's token-based authentication.
+    Extends graphene_django's GraphQLView to support DRF's token-based authentication, to enforce limits on the
+    estimated cost and depth of queries, and to support persisted queries and the caching of query results.
     """
     graphiql_template = 'graphiql.html'
 
@@ -42,3 +54,95 @@ class GraphQLView(GraphQLView_):
             return HttpResponseForbidden("No credentials provided.")
 
         return super().dispatch(request, *args, **kwargs)
+
+    def get_backend(self, request):
+        return document_backend
+
+    def execute_graphql_request(self, request, data, query, variables, operation_name, show_graphiql=False):
+        config = get_config()
+
+        # Resolve a persisted query. If the query string is included, it is persisted for subsequent requests.
+        query_hash = self.get_persisted_query_hash(request, data)
+        if query_hash:
+            if query:
+                if get_query_hash(query) != query_hash:
+                    raise HttpError(HttpResponseBadRequest("The provided hash does not match the query."))
+                set_persisted_query(query)
+            else:
+                query = get_persisted_query(query_hash)
+                if query is None:
+                    return ExecutionResult(errors=[GraphQLError("PersistedQueryNotFound")])
+
+        if not query:
+            return super().execute_graphql_request(request, data, query, variables, operation_name, show_graphiql)
+
+        try:
+            document = self.get_backend(request).document_from_string(self.schema, query)
+        except Exception:
+            # Leave the reporting of syntax errors to the parent class
+            return super().execute_graphql_request(request, data, query, variables, operation_name, show_graphiql)
+
+        cost = request.graphql_cost = estimate_query_cost(self.schema, document.document_ast, operation_name, variables)
+
+        # Enforce GRAPHQL_MAX_DEPTH and GRAPHQL_MAX_COST
+        if config.GRAPHQL_MAX_DEPTH and cost.depth > config.GRAPHQL_MAX_DEPTH:
+            return ExecutionResult(errors=[GraphQLError(
+                f"Query depth ({cost.depth}) exceeds the maximum permitted depth ({config.GRAPHQL_MAX_DEPTH})."
+            )], invalid=True)
+        if config.GRAPHQL_MAX_COST and cost.cost > config.GRAPHQL_MAX_COST:
+            return ExecutionResult(errors=[GraphQLError(
+                f"Estimated query cost ({cost.cost}) exceeds the maximum permitted cost ({config.GRAPHQL_MAX_COST})."
+            )], invalid=True)
+
+        # Return the cached result of the query, if any (only queries are cached, never mutations)
+        cache_timeout = config.GRAPHQL_CACHE_TIMEOUT if document.get_operation_type(operation_name) == 'query' else 0
+        if cache_timeout:
+            cached = get_cached_result(request, query, variables, operation_name)
+            if cached is not None:
+                result_data, request.graphql_pagination = cached
+                return ExecutionResult(data=result_data)
+
+        result = super().execute_graphql_request(request, data, query, variables, operation_name, show_graphiql)
+
+        if cache_timeout and result is not None and not result.errors and not result.invalid:
+            cached = (result.data, getattr(request, 'graphql_pagination', {}))
+            set_cached_result(request, query, variables, operation_name, cached, cache_timeout)
+
+        return result
+
+    @staticmethod
+    def get_persisted_query_hash(request, data):
+        """
+        Return the hash of the persisted query requested, if any. Persisted queries follow the protocol established by
+        Apollo: The hash is passed as `extensions.persistedQuery.sha256Hash` in the request body, or as a JSON-encoded
+        `extensions` parameter in the URL.
+        """
+        extensions = data.get('extensions') or request.GET.get('extensions')
+        if isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except ValueError:
+                raise HttpError(HttpResponseBadRequest("Extensions are invalid JSON."))
+        if isinstance(extensions, dict) and isinstance(extensions.get('persistedQuery'), dict):
+            return extensions['persistedQuery'].get('sha256Hash')
+
+    def json_encode(self, request, d, pretty=False):
+        extensions = {}
+
+        # Report the estimated cost of the query
+        cost = getattr(request, 'graphql_cost', None)
+        if cost is not None:
+            extensions['cost'] = {
+                'estimated': cost.cost,
+                'depth': cost.depth,
+            }
+
+        # Report whether another page follows each paginated list
+        pagination = getattr(request, 'graphql_pagination', None)
+        if pagination:
+            extensions['pagination'] = pagination
+
+        if extensions:
+            d['extensions'] = extensions
+
+        return super().json_encode(request, d, pretty)
@@ -1,4 +1,5 @@
 import importlib
+import importlib.util
 import logging
 import os
 import platform
@@ -460,6 +461,24 @@ FILTERS_NULL_CHOICE_VALUE = 'null'
 #
 
 REST_FRAMEWORK_VERSION = '.'.join(VERSION.split('-')[0].split('.')[:2])  # Use major.minor as API version
+
+# Employ the orjson and msgpack libraries, if installed, to render and parse API requests. orjson serves requests for
+# the application/json media type having the parameter engine=orjson (and must therefore precede the standard JSON
+# renderer and parser), whereas msgpack serves requests for the application/msgpack media type.
+REST_FRAMEWORK_RENDERER_CLASSES = ['rest_framework.renderers.JSONRenderer']
+REST_FRAMEWORK_PARSER_CLASSES = [
+    'rest_framework.parsers.JSONParser',
+    'rest_framework.parsers.FormParser',
+    'rest_framework.parsers.MultiPartParser',
+]
+if importlib.util.find_spec('orjson'):
+    REST_FRAMEWORK_RENDERER_CLASSES.insert(0, 'netbox.api.renderers.ORJSONRenderer')
+    REST_FRAMEWORK_PARSER_CLASSES.insert(0, 'netbox.api.parsers.ORJSONParser')
+if importlib.util.find_spec('msgpack'):
+    REST_FRAMEWORK_RENDERER_CLASSES.append('netbox.api.renderers.MessagePackRenderer')
+    REST_FRAMEWORK_PARSER_CLASSES.append('netbox.api.parsers.MessagePackParser')
+REST_FRAMEWORK_RENDERER_CLASSES.append('netbox.api.renderers.FormlessBrowsableAPIRenderer')
+
 REST_FRAMEWORK = {
     'ALLOWED_VERSIONS': [REST_FRAMEWORK_VERSION],
     'COERCE_DECIMAL_TO_STRING': False,
@@ -472,13 +491,11 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_METADATA_CLASS': 'netbox.api.metadata.BulkOperationMetadata',
     'DEFAULT_PAGINATION_CLASS': 'netbox.api.pagination.OptionalLimitOffsetPagination',
+    'DEFAULT_PARSER_CLASSES': REST_FRAMEWORK_PARSER_CLASSES,
     'DEFAULT_PERMISSION_CLASSES': (
         'netbox.api.authentication.TokenPermissions',
     ),
-    'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
-        'netbox.api.renderers.FormlessBrowsableAPIRenderer',
-    ),
+    'DEFAULT_RENDERER_CLASSES': REST_FRAMEWORK_RENDERER_CLASSES,
     'DEFAULT_VERSION': REST_FRAMEWORK_VERSION,
     'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.AcceptHeaderVersioning',
     # 'PAGE_SIZE': PAGINATE_COUNT,
@@ -3,3 +3,9 @@ from django.dispatch import Signal
 
 # Signals that a model has completed its clean() method
 post_clean = Signal()
+
+# Signals that objects have been created in bulk, without a post_save signal having been sent for each object
+post_bulk_create = Signal()
+
+# Signals that objects have been updated in bulk, without a post_save signal having been sent for each object
+post_bulk_update = Signal()
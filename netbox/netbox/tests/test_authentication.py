@@ -10,6 +10,7 @@ from rest_framework.test import APIClient
 from dcim.models import Site
 from ipam.choices import PrefixStatusChoices
 from ipam.models import Prefix
+from netbox.authentication import ObjectPermissionBackend
 from users.models import ObjectPermission, Token
 from utilities.testing import TestCase
 
@@ -455,3 +456,108 @@ class ObjectPermissionAPIViewTestCase(TestCase):
                       kwargs={'pk': self.prefixes[0].pk})
         response = self.client.delete(url, format='json', **self.header)
         self.assertEqual(response.status_code, 204)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_permissions_cache_invalidation(self):
+        url = reverse('ipam-api:prefix-list')
+
+        # Assign object permission via a group
+        group = Group.objects.create(name='Group 1')
+        self.user.groups.add(group)
+        obj_perm = ObjectPermission(
+            name='Test permission',
+            constraints={'site__name': 'Site 1'},
+            actions=['view']
+        )
+        obj_perm.save()
+        obj_perm.groups.add(group)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Prefix))
+
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+
+        # Changing the permission's constraints should invalidate any cached permissions
+        obj_perm.constraints = {'site__name__in': ['Site 1', 'Site 2']}
+        obj_perm.save()
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 6)
+
+        # Removing the user from the group should revoke the permission
+        self.user.groups.remove(group)
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 403)
+
+    def test_has_perm_for_objects(self):
+        backend = ObjectPermissionBackend()
+        obj_perm = ObjectPermission(
+            name='Test permission',
+            constraints=[{'site__name': 'Site 1'}, {'site__slug__in': ['site-3'], 'tags__isnull': True}],
+            actions=['change']
+        )
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Prefix))
+
+        # Constraints are evaluated in Python where possible; those involving tags are checked against the database
+        prefixes = list(Prefix.objects.select_related('site').order_by('pk'))
+        backend.get_all_permissions(self.user)
+        with self.assertNumQueries(1):
+            results = backend.has_perm_for_objects(self.user, 'ipam.change_prefix', prefixes)
+        self.assertEqual(results, [True] * 3 + [False] * 3 + [True] * 3)
+        self.assertTrue(backend.has_perm(self.user, 'ipam.change_prefix', prefixes[0]))
+        self.assertFalse(backend.has_perm(self.user, 'ipam.change_prefix', prefixes[3]))
+        self.assertFalse(any(backend.has_perm_for_objects(self.user, 'ipam.delete_prefix', prefixes)))
+
+
+class TokenAuthenticationTestCase(TestCase):
+    client_class = APIClient
+
+    def setUp(self):
+        self.user = User.objects.create(username='testuser', is_superuser=True)
+        self.token = Token.objects.create(user=self.user)
+        self.header = {'HTTP_AUTHORIZATION': 'Token {}'.format(self.token.key)}
+
+    def test_token_cache_invalidation(self):
+        url = reverse('dcim-api:site-list')
+        data = {'name': 'Site 1', 'slug': 'site-1'}
+
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 200)
+
+        # Changes to the token should take effect immediately
+        self.token.write_enabled = False
+        self.token.save()
+        response = self.client.post(url, data, format='json', **self.header)
+        self.assertEqual(response.status_code, 403)
+
+        # Changes to the user should take effect immediately
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 403)
+
+        self.user.is_active = True
+        self.user.save()
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 200)
+
+        # Deleting the token should revoke access immediately
+        self.token.delete()
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 403)
+
+    def test_token_key_changed(self):
+        url = reverse('dcim-api:site-list')
+
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 200)
+
+        # The previous key should stop working as soon as the token's key is changed
+        self.token.key = Token.generate_key()
+        self.token.save()
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, 200)
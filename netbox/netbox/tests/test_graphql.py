@@ -1,7 +1,19 @@
+import hashlib
+import json
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from utilities.testing import disable_warnings, TestCase
+from dcim.models import Device, DeviceRole, DeviceType, Interface, Manufacturer, Site
+from extras.cache import invalidate_data_version
+from ipam.models import IPAddress
+from netbox.graphql.cost import TABLE_SIZES_KEY
+from users.models import ObjectPermission
+from utilities.testing import APITestCase, disable_warnings, TestCase
 
 
 class GraphQLTestCase(TestCase):
@@ -34,3 +46,229 @@ class GraphQLTestCase(TestCase):
         response = self.client.get(url, **header)
         with disable_warnings('django.request'):
             self.assertHttpStatus(response, 302)  # Redirect to login page
+
+
+class GraphQLQueryCostTestCase(APITestCase):
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_query_cost_reported(self):
+        """
+        The estimated cost and depth of a query should be returned in the response's extensions.
+        """
+        query = '{site_list{name devices{name interfaces{name}}}}'
+        response = self.client.post(reverse('graphql'), data={'query': query}, format='json', **self.header)
+        self.assertHttpStatus(response, 200)
+        data = json.loads(response.content)
+        self.assertNotIn('errors', data)
+        self.assertEqual(data['extensions']['cost']['depth'], 3)
+        self.assertIn('estimated', data['extensions']['cost'])
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'], GRAPHQL_MAX_DEPTH=2)
+    def test_max_depth(self):
+        """
+        Queries exceeding GRAPHQL_MAX_DEPTH should be rejected.
+        """
+        url = reverse('graphql')
+
+        query = '{site_list{name devices{name}}}'
+        response = self.client.post(url, data={'query': query}, format='json', **self.header)
+        self.assertHttpStatus(response, 200)
+
+        query = '{site_list{name devices{name interfaces{name}}}}'
+        response = self.client.post(url, data={'query': query}, format='json', **self.header)
+        self.assertHttpStatus(response, 400)
+        self.assertNotIn('data', json.loads(response.content))
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'], GRAPHQL_MAX_COST=100)
+    def test_max_cost(self):
+        """
+        Queries with an estimated cost exceeding GRAPHQL_MAX_COST should be rejected.
+        """
+        url = reverse('graphql')
+        cache.set(TABLE_SIZES_KEY, {Site._meta.db_table: 10, Device._meta.db_table: 1000})
+        self.addCleanup(cache.delete, TABLE_SIZES_KEY)
+
+        query = '{site_list{name}}'
+        response = self.client.post(url, data={'query': query}, format='json', **self.header)
+        self.assertHttpStatus(response, 200)
+
+        query = '{site_list{name devices{name}}}'
+        response = self.client.post(url, data={'query': query}, format='json', **self.header)
+        self.assertHttpStatus(response, 400)
+        self.assertEqual(json.loads(response.content)['extensions']['cost']['estimated'], 1010)
+
+
+class GraphQLPersistedQueryTestCase(APITestCase):
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_persisted_query(self):
+        """
+        A query should be executable by its hash once it has been persisted.
+        """
+        url = reverse('graphql')
+        query = '{site_list{name}}'
+        extensions = {
+            'persistedQuery': {'version': 1, 'sha256Hash': hashlib.sha256(query.encode()).hexdigest()},
+        }
+        self.addCleanup(cache.delete, f'graphql_query:{extensions["persistedQuery"]["sha256Hash"]}')
+
+        # Query has not yet been persisted
+        response = self.client.post(url, data={'extensions': extensions}, format='json', **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(json.loads(response.content)['errors'][0]['message'], 'PersistedQueryNotFound')
+
+        # Persist the query
+        response = self.client.post(url, data={'query': query, 'extensions': extensions}, format='json', **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertNotIn('errors', json.loads(response.content))
+
+        # Execute the query by its hash
+        response = self.client.post(url, data={'extensions': extensions}, format='json', **self.header)
+        self.assertHttpStatus(response, 200)
+        data = json.loads(response.content)
+        self.assertNotIn('errors', data)
+        self.assertEqual(data['data'], {'site_list': []})
+
+    def test_persisted_query_hash_mismatch(self):
+        """
+        A query should not be persisted under a hash which does not match it.
+        """
+        extensions = {
+            'persistedQuery': {'version': 1, 'sha256Hash': hashlib.sha256(b'{site_list{id}}').hexdigest()},
+        }
+        data = {'query': '{site_list{name}}', 'extensions': extensions}
+        response = self.client.post(reverse('graphql'), data=data, format='json', **self.header)
+        self.assertHttpStatus(response, 400)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'], GRAPHQL_CACHE_TIMEOUT=60)
+    def test_cached_result(self):
+        """
+        The result of a query should be cached until the data version changes.
+        """
+        url = reverse('graphql')
+        data = {'query': '{site_list{name}}'}
+
+        response = self.client.post(url, data=data, format='json', **self.header)
+        self.assertEqual(json.loads(response.content)['data'], {'site_list': []})
+
+        # Objects created without change logging do not invalidate cached results
+        Site.objects.create(name='Site 1', slug='site-1')
+        response = self.client.post(url, data=data, format='json', **self.header)
+        self.assertEqual(json.loads(response.content)['data'], {'site_list': []})
+
+        invalidate_data_version()
+        response = self.client.post(url, data=data, format='json', **self.header)
+        self.assertEqual(json.loads(response.content)['data'], {'site_list': [{'name': 'Site 1'}]})
+
+
+@override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+class GraphQLPaginationTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}', facility=f'Facility {6 - i}') for i in range(1, 6)
+        ])
+
+    def _query(self, query):
+        response = self.client.post(reverse('graphql'), data={'query': query}, format='json', **self.header)
+        self.assertHttpStatus(response, 200)
+        data = json.loads(response.content)
+        self.assertNotIn('errors', data)
+
+        return data
+
+    def test_limit_offset(self):
+        data = self._query('{site_list(limit: 2, offset: 1){name}}')
+        self.assertEqual([site['name'] for site in data['data']['site_list']], ['Site 2', 'Site 3'])
+        self.assertTrue(data['extensions']['pagination']['site_list']['has_next'])
+
+        data = self._query('{site_list(limit: 2, offset: 3){name}}')
+        self.assertEqual([site['name'] for site in data['data']['site_list']], ['Site 4', 'Site 5'])
+        self.assertFalse(data['extensions']['pagination']['site_list']['has_next'])
+
+    def test_cursor(self):
+        names = []
+        query = '{site_list(first: 2, ordering: ["-name"]){name}}'
+        for _ in range(3):
+            data = self._query(query)
+            names.extend(site['name'] for site in data['data']['site_list'])
+            cursor = data['extensions']['pagination']['site_list']['next_cursor']
+            query = '{site_list(first: 2, after: "%s", ordering: ["-name"]){name}}' % cursor
+        self.assertIsNone(cursor)
+        self.assertEqual(names, ['Site 5', 'Site 4', 'Site 3', 'Site 2', 'Site 1'])
+
+    def test_ordering(self):
+        data = self._query('{site_list(ordering: ["facility"]){name}}')
+        self.assertEqual(data['data']['site_list'][0]['name'], 'Site 5')
+
+        response = self.client.post(
+            reverse('graphql'), data={'query': '{site_list(ordering: ["region"]){name}}'}, format='json', **self.header
+        )
+        self.assertIn('errors', json.loads(response.content))
+
+    @override_settings(GRAPHQL_MAX_PAGE_SIZE=3)
+    def test_max_page_size(self):
+        self.assertEqual(len(self._query('{site_list{name}}')['data']['site_list']), 3)
+        self.assertEqual(len(self._query('{site_list(limit: 10){name}}')['data']['site_list']), 3)
+
+
+class GraphQLRelatedObjectsTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1', color='ff0000')
+
+        for i in range(1, 4):
+            device = Device.objects.create(
+                name=f'Device {i}', site=site, device_type=device_type, device_role=device_role
+            )
+            for j, name in enumerate(('eth0', 'eth1')):
+                interface = Interface.objects.create(device=device, name=name, type='1000base-t')
+                IPAddress.objects.create(address=f'10.{i}.{j}.1/24', assigned_object=interface)
+
+    def _get_query_count(self, query):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(reverse('graphql'), data={'query': query}, format='json', **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertNotIn('errors', json.loads(response.content))
+
+        return len(context.captured_queries)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_related_objects_batched(self):
+        """
+        Related objects should be retrieved using a constant number of queries, regardless of the number of parents.
+        """
+        query = '{device_list%s{name site{name} interfaces{name tags{name} ip_addresses{address}}}}'
+
+        self._get_query_count(query % '')  # Populate any caches
+        self.assertEqual(
+            self._get_query_count(query % '(name: "Device 1")'),
+            self._get_query_count(query % '')
+        )
+
+    def test_related_objects_restricted(self):
+        """
+        Object permissions should be enforced on related objects.
+        """
+        obj_perm = ObjectPermission(name='Test permission', actions=['view'])
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Device), ContentType.objects.get_for_model(Site))
+        obj_perm = ObjectPermission(name='Test permission 2', actions=['view'], constraints={'name': 'eth0'})
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Interface))
+
+        query = '{device_list{name interfaces{name ip_addresses{address}}}}'
+        response = self.client.post(reverse('graphql'), data={'query': query}, format='json', **self.header)
+        self.assertHttpStatus(response, 200)
+        data = json.loads(response.content)
+        self.assertNotIn('errors', data)
+        for device in data['data']['device_list']:
+            self.assertEqual([interface['name'] for interface in device['interfaces']], ['eth0'])
+            self.assertEqual(device['interfaces'][0]['ip_addresses'], [])  # No permission to view IP addresses
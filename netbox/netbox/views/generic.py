@@ -24,6 +24,7 @@ from utilities.forms import (
     BootstrapMixin, BulkRenameForm, ConfirmationForm, CSVDataField, CSVFileField, ImportForm, restrict_form_fields,
 )
 from utilities.htmx import is_htmx
+from utilities.paginator import KeysetPaginator
 from utilities.permissions import get_permission_for_model
 from utilities.tables import paginate_table
 from utilities.utils import normalize_querydict, prepare_cloned_fields
@@ -152,6 +153,10 @@ class ObjectListView(ObjectPermissionRequiredMixin, View):
     filter_form: The form used to render filter options
     table: The django-tables2 Table used to render the objects list
     template_name: The name of the template
+    keyset_ordering: If set, paginate the table by keyset (cursor) rather than page number using this ordering, unless
+      the user has sorted the table by a column
+    count_estimate_threshold: If set, display an estimated count of objects (rather than counting them exactly) when
+      the estimate exceeds this number
     """
     queryset = None
     filterset = None
@@ -159,6 +164,8 @@ class ObjectListView(ObjectPermissionRequiredMixin, View):
     table = None
     template_name = 'generic/object_list.html'
     action_buttons = ('add', 'import', 'export')
+    keyset_ordering = None
+    count_estimate_threshold = None
 
     def get_required_permission(self):
         return get_permission_for_model(self.queryset.model, 'view')
@@ -185,21 +192,31 @@ class ObjectListView(ObjectPermissionRequiredMixin, View):
         :param table: The Table instance to export
         :param columns: A list of specific columns to include. If not specified, all columns will be exported.
         """
-        exclude_columns = {'pk'}
-        if columns:
-            all_columns = [col_name for col_name, _ in table.selected_columns + table.available_columns]
-            exclude_columns.update({
-                col for col in all_columns if col not in columns
-            })
         exporter = TableExport(
             export_format=TableExport.CSV,
             table=table,
-            exclude_columns=exclude_columns
+            exclude_columns=self.get_export_exclude_columns(table, columns)
         )
         return exporter.response(
             filename=f'netbox_{self.queryset.model._meta.verbose_name_plural}.csv'
         )
 
+    @staticmethod
+    def get_export_exclude_columns(table, columns=None):
+        """
+        Return the set of table columns to be excluded from an export.
+
+        :param table: The Table instance to export
+        :param columns: A list of specific columns to include. If not specified, all columns will be exported.
+        """
+        exclude_columns = {'pk'}
+        if columns:
+            all_columns = [col_name for col_name, _ in table.selected_columns + table.available_columns]
+            exclude_columns.update({
+                col for col in all_columns if col not in columns
+            })
+        return exclude_columns
+
     def export_template(self, template, request):
         """
         Render an ExportTemplate using the current queryset.
@@ -253,7 +270,16 @@ class ObjectListView(ObjectPermissionRequiredMixin, View):
 
         # Render the objects table
         table = self.get_table(request, permissions)
-        paginate_table(table, request)
+        if self.keyset_ordering and table.prefixed_order_by_field not in request.GET:
+            paginate_table(
+                table,
+                request,
+                paginator_class=KeysetPaginator,
+                cursor=request.GET.get('cursor'),
+                ordering=self.keyset_ordering
+            )
+        else:
+            paginate_table(table, request, estimate_threshold=self.count_estimate_threshold)
 
         # If this is an HTMX request, return only the rendered table HTML
         if is_htmx(request):
@@ -6,6 +6,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldError, ValidationError
 
 from utilities.forms.fields import ContentTypeMultipleChoiceField
+from .cache import invalidate_permissions
 from .constants import *
 from .models import ObjectPermission, Token, UserConfig
 
@@ -287,8 +288,10 @@ class ObjectPermissionAdmin(admin.ModelAdmin):
 
     def enable(self, request, queryset):
         updated = queryset.update(enabled=True)
+        invalidate_permissions()
         self.message_user(request, f"Enabled {updated} permissions")
 
     def disable(self, request, queryset):
         updated = queryset.update(enabled=False)
+        invalidate_permissions()
         self.message_user(request, f"Disabled {updated} permissions")
@@ -0,0 +1,131 @@
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import transaction
+
+__all__ = (
+    'get_cached_permissions',
+    'get_cached_token',
+    'get_permissions_version',
+    'invalidate_permissions',
+    'invalidate_tokens',
+    'set_cached_permissions',
+    'set_cached_token',
+)
+
+# The cache key holding the current version of all cached permissions
+VERSION_KEY = 'object_permissions_version'
+
+# The length of time (in seconds) for which a user's permissions are held in the shared cache
+CACHE_TIMEOUT = 3600
+
+# The maximum number of users' permissions held in each process's local cache
+LOCAL_CACHE_SIZE = 1024
+
+# The length of time (in seconds) for which an authenticated API token (and its user) is cached
+TOKEN_CACHE_TIMEOUT = 60
+
+_local_cache = OrderedDict()
+_local_cache_lock = threading.Lock()
+
+
+def _get_key(version, user_id):
+    return f'object_permissions:{version}:{user_id}'
+
+
+def get_permissions_version():
+    """
+    Return the current version of the permissions cache, initializing it if necessary.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_permissions():
+    """
+    Invalidate the cached permissions of all users by assigning a new version to the cache. A random version is used
+    (rather than an incrementing counter) so that a previous version is never reused should the key be evicted.
+
+    The version is changed immediately, so that the change is effective within the current transaction, and again once
+    the transaction has been committed: Until then, concurrent requests may load (and cache under the intermediate
+    version) permissions which do not yet reflect the change.
+    """
+    _set_permissions_version()
+    transaction.on_commit(_set_permissions_version)
+
+
+def _set_permissions_version():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_cached_permissions(user_id, version):
+    """
+    Return the cached permissions map for a user at the given cache version, or None if not cached. The process-local
+    cache is checked first, falling back to the shared cache.
+    """
+    key = _get_key(version, user_id)
+
+    with _local_cache_lock:
+        if key in _local_cache:
+            _local_cache.move_to_end(key)
+            return _local_cache[key]
+
+    perms = cache.get(key)
+    if perms is not None:
+        _set_local(key, perms)
+
+    return perms
+
+
+def set_cached_permissions(user_id, version, perms):
+    """
+    Store a user's permissions map in both the shared and process-local caches under the given cache version.
+    """
+    key = _get_key(version, user_id)
+    cache.set(key, perms, CACHE_TIMEOUT)
+    _set_local(key, perms)
+
+
+def _set_local(key, perms):
+    with _local_cache_lock:
+        _local_cache[key] = perms
+        _local_cache.move_to_end(key)
+        while len(_local_cache) > LOCAL_CACHE_SIZE:
+            _local_cache.popitem(last=False)
+
+
+#
+# API tokens
+#
+
+def _get_token_key(key):
+    # Tokens are cached under a hash of their key, so that the key does not appear in the names of cache entries
+    return f'token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def get_cached_token(key):
+    """
+    Return the cached Token (with its user loaded) having the given key, or None if not cached.
+    """
+    return cache.get(_get_token_key(key))
+
+
+def set_cached_token(token):
+    """
+    Cache an authenticated Token, along with its user.
+    """
+    cache.set(_get_token_key(token.key), token, TOKEN_CACHE_TIMEOUT)
+
+
+def invalidate_tokens(*keys):
+    """
+    Remove the Tokens having the given keys from the cache.
+    """
+    if keys:
+        cache.delete_many([_get_token_key(key) for key in keys])
@@ -0,0 +1,71 @@
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import invalidate_permissions, invalidate_tokens
+from .models import AdminGroup, AdminUser, ObjectPermission, Token
+
+
+#
+# Permissions cache invalidation
+#
+
+@receiver(post_save, sender=ObjectPermission)
+@receiver(post_delete, sender=ObjectPermission)
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=AdminGroup)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=AdminUser)
+def handle_permissions_changed(**kwargs):
+    """
+    Invalidate all cached permissions when an ObjectPermission, group, or user is modified or deleted.
+    """
+    invalidate_permissions()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=AdminUser)
+def handle_user_saved(instance, update_fields=None, **kwargs):
+    """
+    Invalidate all cached permissions, and the user's cached API tokens, when a user is modified. Updates to a user's
+    last login time (which occur on each login) are ignored.
+    """
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        invalidate_permissions()
+        invalidate_tokens(*instance.tokens.values_list('key', flat=True))
+
+
+@receiver(m2m_changed, sender=ObjectPermission.object_types.through)
+@receiver(m2m_changed, sender=ObjectPermission.groups.through)
+@receiver(m2m_changed, sender=ObjectPermission.users.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def handle_permission_assignments_changed(action, **kwargs):
+    """
+    Invalidate all cached permissions when the assignment of an ObjectPermission, or a user's group membership, changes.
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_permissions()
+
+
+#
+# API token cache invalidation
+#
+
+@receiver(pre_save, sender=Token)
+def handle_token_saving(instance, **kwargs):
+    """
+    Record the current key of a Token which is being modified, so that it can be removed from the cache should the key
+    change.
+    """
+    if instance.pk:
+        instance._previous_key = Token.objects.filter(pk=instance.pk).values_list('key', flat=True).first()
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def handle_token_changed(instance, **kwargs):
+    """
+    Remove a Token from the cache when it is modified or deleted, under both its current and any previous key.
+    """
+    keys = {instance.key, getattr(instance, '_previous_key', None)} - {None}
+    invalidate_tokens(*keys)
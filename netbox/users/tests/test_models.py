@@ -1,7 +1,8 @@
 from django.contrib.auth.models import User
 from django.test import TestCase
 
-from users.models import UserConfig
+from users.cache import get_permissions_version
+from users.models import ObjectPermission, UserConfig
 
 
 class UserConfigTest(TestCase):
@@ -106,3 +107,20 @@ class UserConfigTest(TestCase):
 
         # Clear a non-existing value; should fail silently
         userconfig.clear('invalid')
+
+
+class PermissionsCacheTest(TestCase):
+
+    def test_invalidate_on_commit(self):
+        """
+        Modifying an ObjectPermission should change the permissions version both immediately and upon commit.
+        """
+        version = get_permissions_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            ObjectPermission.objects.create(name='Test permission', actions=['view'])
+            intermediate_version = get_permissions_version()
+            self.assertNotEqual(intermediate_version, version)
+
+        for callback in callbacks:
+            callback()
+        self.assertNotIn(get_permissions_version(), (version, intermediate_version))
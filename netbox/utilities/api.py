@@ -1,5 +1,6 @@
 import platform
 import sys
+from functools import lru_cache
 
 from django.conf import settings
 from django.http import JsonResponse
@@ -13,9 +14,15 @@ from .utils import dynamic_import
 
 def get_serializer_for_model(model, prefix=''):
     """
-    Dynamically resolve and return the appropriate serializer for a model.
+    Dynamically resolve and return the appropriate serializer for a model (or model instance). Each serializer is
+    resolved only once per process.
     """
-    app_name, model_name = model._meta.label.split('.')
+    return _get_serializer_for_label(model._meta.label, prefix)
+
+
+@lru_cache(maxsize=None)
+def _get_serializer_for_label(label, prefix):
+    app_name, model_name = label.split('.')
     # Serializers for Django's auth models are in the users app
     if app_name == 'auth':
         app_name = 'users'
@@ -28,11 +35,28 @@ def get_serializer_for_model(model, prefix=''):
         )
 
 
+@lru_cache(maxsize=None)
+def get_serializer_field_sources(serializer_class):
+    """
+    Return a mapping of each field on a serializer to the name of the model attribute from which its value is sourced,
+    or None for fields not sourced from a single attribute (such as SerializerMethodFields).
+    """
+    return {
+        name: None if field.source == '*' else field.source.split('.')[0]
+        for name, field in serializer_class().fields.items()
+    }
+
+
 def get_graphql_type_for_model(model):
     """
-    Return the GraphQL type class for the given model.
+    Return the GraphQL type class for the given model (or model instance). Each type is resolved only once per process.
     """
-    app_name, model_name = model._meta.label.split('.')
+    return _get_graphql_type_for_label(model._meta.label)
+
+
+@lru_cache(maxsize=None)
+def _get_graphql_type_for_label(label):
+    app_name, model_name = label.split('.')
     # Object types for Django's auth models are in the users app
     if app_name == 'auth':
         app_name = 'users'
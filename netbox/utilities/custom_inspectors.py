@@ -20,6 +20,9 @@ class NetBoxSwaggerAutoSchema(SwaggerAutoSchema):
             # unique from their single-object counterparts (see #3436)
             if operation_keys[-1] in ('delete', 'partial_update', 'update') and not self.view.detail:
                 operation_keys[-1] = f'bulk_{operation_keys[-1]}'
+            # Likewise for list-level actions sharing a path with a single-object action (e.g. trace)
+            elif operation_keys[-1] == 'read' and getattr(self.view, 'detail', None) is False:
+                operation_keys[-1] = 'list'
             operation_id = '_'.join(operation_keys)
 
         return operation_id
@@ -142,6 +145,9 @@ class JSONFieldInspector(FieldInspector):
 class NullablePaginatorInspector(PaginatorInspector):
     def process_result(self, result, method_name, obj, **kwargs):
         if method_name == 'get_paginated_response' and isinstance(result, openapi.Schema):
+            count = result.properties['count']
+            if isinstance(count, openapi.Schema):
+                count['x-nullable'] = True
             next = result.properties['next']
             if isinstance(next, openapi.Schema):
                 next['x-nullable'] = True
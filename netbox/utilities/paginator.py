@@ -1,14 +1,33 @@
-from django.core.paginator import Paginator, Page
+import base64
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, Paginator, Page, PageNotAnInteger
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from django_tables2.rows import BoundRows
 
 from netbox.config import get_config
 
 
 class EnhancedPaginator(Paginator):
+    """
+    A paginator which supports counting objects exactly (the default), estimating the count using the database's
+    query planner, or skipping the count altogether. When counting is skipped, the number of pages is unknown beyond
+    the page following the current page.
+
+    :param count_mode: "exact", "estimate", or "none" (see COUNT_MODES)
+    :param estimate_threshold: If set, the count is estimated whenever the estimate exceeds this number of objects,
+        unless an exact count has been requested explicitly
+    """
     default_page_lengths = (
         25, 50, 100, 250, 500, 1000
     )
 
-    def __init__(self, object_list, per_page, orphans=None, **kwargs):
+    def __init__(self, object_list, per_page, orphans=None, count_mode=None, estimate_threshold=None, **kwargs):
 
         # Determine the page size
         try:
@@ -24,8 +43,57 @@ class EnhancedPaginator(Paginator):
         elif orphans is None:
             orphans = 10
 
+        self.count_mode = count_mode if count_mode in COUNT_MODES else None
+        self.estimate_threshold = estimate_threshold
+        self.count_estimated = False
+        self._known_pages = 1
+
+        # Orphans cannot be attached to the last page when its position is unknown
+        if self.count_mode == COUNT_NONE:
+            orphans = 0
+
         super().__init__(object_list, per_page, orphans=orphans, **kwargs)
 
+    @cached_property
+    def count(self):
+        if self.count_mode == COUNT_NONE:
+            return None
+
+        if self.count_mode == COUNT_ESTIMATE or (self.estimate_threshold and self.count_mode is None):
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and (self.count_mode == COUNT_ESTIMATE or estimate > self.estimate_threshold):
+                self.count_estimated = True
+                return estimate
+
+        return super().count
+
+    @property
+    def num_pages(self):
+        # When the count is unknown, only the pages up to and including the one following the current page are known
+        if self.count is None:
+            return self._known_pages
+        return super().num_pages
+
+    def page(self, number):
+        if self.count is not None:
+            return super().page(number)
+
+        # Without a count, retrieve one more object than needed to determine whether another page follows
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not object_list and number > 1:
+            raise EmptyPage('That page contains no results')
+
+        self._known_pages = number + 1 if len(object_list) > self.per_page else number
+        return self._get_page(object_list[:self.per_page], number, self)
+
     def _get_page(self, *args, **kwargs):
         return EnhancedPage(*args, **kwargs)
 
@@ -55,6 +123,170 @@ class EnhancedPage(Page):
 
         return page_list
 
+    def end_index(self):
+        if self.paginator.count is None:
+            return self.start_index() + len(self.object_list) - 1
+        return super().end_index()
+
+
+class KeysetPaginator(EnhancedPaginator):
+    """
+    A paginator which retrieves each page by filtering on the values of the last object on the preceding page (a
+    "keyset"), rather than by counting and skipping objects. This performs consistently however deep the page, but
+    permits navigation only to the next page and back to the first. The total number of objects is not counted.
+
+    :param cursor: The opaque cursor identifying the start of the requested page (or None for the first page)
+    :param ordering: The ordering of the objects. This must comprise one or more concrete fields which together are
+        unique, such as ('-time', '-pk').
+    """
+    keyset = True
+    count = None
+    num_pages = 1
+
+    def __init__(self, object_list, per_page, cursor=None, ordering=('pk',), **kwargs):
+        self.cursor = cursor
+        self.ordering = ordering
+        super().__init__(object_list, per_page, **kwargs)
+
+    def page(self, number=None):
+        # The object list may be a django-tables2 BoundRows instance wrapping a table's queryset
+        rows = self.object_list
+        queryset = rows.data.data if isinstance(rows, BoundRows) else rows
+        queryset = queryset.order_by(*self.ordering)
+
+        # An invalid cursor is ignored, returning the first page
+        if self.cursor:
+            try:
+                values = decode_cursor(queryset.model, self.ordering, self.cursor)
+                queryset = queryset.filter(keyset_filter(self.ordering, values))
+            except ValueError:
+                self.cursor = None
+
+        object_list = list(queryset[:self.per_page + 1])
+        next_cursor = None
+        if len(object_list) > self.per_page:
+            object_list = object_list[:self.per_page]
+            next_cursor = encode_cursor(get_keyset_values(object_list[-1], self.ordering))
+        if isinstance(rows, BoundRows):
+            object_list = BoundRows(data=object_list, table=rows.table, pinned_data=rows.pinned_data)
+
+        return KeysetPage(object_list, self, cursor=self.cursor, next_cursor=next_cursor)
+
+
+class KeysetPage(Page):
+
+    def __init__(self, object_list, paginator, cursor=None, next_cursor=None):
+        super().__init__(object_list, 1, paginator)
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return bool(self.cursor)
+
+
+#
+# Counting
+#
+
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_NONE = 'none'
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE)
+
+
+def estimate_count(queryset):
+    """
+    Return the PostgreSQL query planner's estimate of the number of objects matched by a queryset, or None if no
+    estimate is available. This requires only that the query be planned, not executed, but may be inaccurate (for
+    example, where table statistics are stale or a filter's selectivity is difficult to predict).
+    """
+    # The object list may be a django-tables2 BoundRows instance wrapping a table's queryset
+    if isinstance(queryset, BoundRows):
+        queryset = queryset.data.data
+    if not isinstance(queryset, QuerySet):
+        return None
+
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+
+    # The plan may be returned as a JSON string or already decoded, depending on the database driver
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+#
+# Keysets
+#
+
+def encode_cursor(values):
+    """
+    Encode a list of keyset values as an opaque cursor string.
+    """
+    # Encode datetimes manually, as DjangoJSONEncoder truncates them to milliseconds
+    values = [v.isoformat() if isinstance(v, datetime.datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(values, cls=DjangoJSONEncoder).encode()).decode()
+
+
+def decode_cursor(model, ordering, cursor):
+    """
+    Decode a cursor string to its list of keyset values for the given model and ordering. Raises ValueError if the
+    cursor is invalid.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+    if type(values) is not list or len(values) != len(ordering):
+        raise ValueError("Invalid cursor")
+
+    # Convert each value to the appropriate Python type for its field
+    cleaned = []
+    for field_name, value in zip(ordering, values):
+        field_name = field_name.lstrip('-')
+        field = model._meta.pk if field_name == 'pk' else model._meta.get_field(field_name)
+        try:
+            cleaned.append(field.to_python(value))
+        except ValidationError:
+            raise ValueError("Invalid cursor")
+
+    return cleaned
+
+
+def get_keyset_values(obj, ordering):
+    """
+    Return the values of the given object for each field in the ordering.
+    """
+    return [getattr(obj, field.lstrip('-')) for field in ordering]
+
+
+def keyset_filter(ordering, values):
+    """
+    Return a Q object matching all objects which follow the given keyset values in the specified ordering. For example,
+    the ordering ('-time', '-pk') and values (t, 123) yield (time < t) OR (time = t AND pk < 123).
+    """
+    query = Q()
+    for i, field in enumerate(ordering):
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition = Q(**{f'{field.lstrip("-")}__{lookup}': values[i]})
+        for prior_field, prior_value in zip(ordering[:i], values[:i]):
+            condition &= Q(**{prior_field.lstrip('-'): prior_value})
+        query |= condition
+
+    # Bound the leading field explicitly so that its index can be used for a range scan
+    lookup = 'lte' if ordering[0].startswith('-') else 'gte'
+    return Q(**{f'{ordering[0].lstrip("-")}__{lookup}': values[0]}) & query
+
 
 def get_paginate_count(request):
     """
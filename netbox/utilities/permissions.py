@@ -1,5 +1,12 @@
+from functools import lru_cache
+
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.signals import setting_changed
+from django.db.models import DateTimeField
+from django.db.models.constants import LOOKUP_SEP
+from django.dispatch import receiver
 
 
 def get_permission_for_model(model, action):
@@ -53,9 +60,11 @@ def resolve_permission_ct(name):
     return content_type, action
 
 
+@lru_cache(maxsize=None)
 def permission_is_exempt(name):
     """
-    Determine whether a specified permission is exempt from evaluation.
+    Determine whether a specified permission is exempt from evaluation. Results are cached for the life of the process
+    (or until the relevant settings are changed).
 
     :param name: Permission name in the format <app_label>.<action>_<model>
     """
@@ -72,3 +81,158 @@ def permission_is_exempt(name):
             return True
 
     return False
+
+
+@receiver(setting_changed)
+def clear_exempt_permissions_cache(setting, **kwargs):
+    """
+    Clear cached exemptions when EXEMPT_VIEW_PERMISSIONS or EXEMPT_EXCLUDE_MODELS is changed (e.g. during testing).
+    """
+    if setting in ('EXEMPT_VIEW_PERMISSIONS', 'EXEMPT_EXCLUDE_MODELS'):
+        permission_is_exempt.cache_clear()
+
+
+#
+# Constraint evaluation
+#
+
+# Lookups which can be evaluated against an instance's field value in Python
+CONSTRAINT_LOOKUPS = {
+    'exact': lambda value, constraint: value == constraint,
+    'iexact': lambda value, constraint: str(value).lower() == str(constraint).lower(),
+    'in': lambda value, constraint: value in constraint,
+    'lt': lambda value, constraint: value < constraint,
+    'lte': lambda value, constraint: value <= constraint,
+    'gt': lambda value, constraint: value > constraint,
+    'gte': lambda value, constraint: value >= constraint,
+    'contains': lambda value, constraint: str(constraint) in str(value),
+    'icontains': lambda value, constraint: str(constraint).lower() in str(value).lower(),
+    'startswith': lambda value, constraint: str(value).startswith(str(constraint)),
+    'istartswith': lambda value, constraint: str(value).lower().startswith(str(constraint).lower()),
+    'endswith': lambda value, constraint: str(value).endswith(str(constraint)),
+    'iendswith': lambda value, constraint: str(value).lower().endswith(str(constraint).lower()),
+}
+
+# Lookups which compare the constraint as a string, rather than as a value of the field's type
+TEXT_LOOKUPS = ('iexact', 'contains', 'icontains', 'startswith', 'istartswith', 'endswith', 'iendswith')
+
+
+def _resolve_constraint_value(instance, path):
+    """
+    Resolve the value of a constrained attribute (e.g. "site__region_id") on a loaded instance. Return a tuple of the
+    model field and its value, or raise LookupError if the attribute cannot be resolved without querying the database.
+    """
+    obj = instance
+    model = type(instance)
+
+    for i, name in enumerate(path):
+        is_last = i == len(path) - 1
+        if name == 'pk':
+            field = model._meta.pk
+        else:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                # Match a foreign key by its attribute name (e.g. "site_id")
+                field = next((f for f in model._meta.concrete_fields if f.attname == name), None)
+                if field is None or not is_last:
+                    raise LookupError(name)
+                return field.target_field, getattr(obj, field.attname, None)
+
+        if not field.concrete or field.many_to_many:
+            raise LookupError(name)
+
+        if not field.is_relation:
+            if not is_last:
+                raise LookupError(name)
+            return field, getattr(obj, field.attname, None)
+
+        # The value of a foreign key (or its related object's primary key) can be read from the instance without
+        # loading the related object. Otherwise, the related object must have been loaded already.
+        if is_last or (i + 2 == len(path) and path[i + 1] in ('pk', field.target_field.name)):
+            return field.target_field, getattr(obj, field.attname, None)
+        if obj is not None:
+            if getattr(obj, field.attname) is None:
+                obj = None
+            elif field.is_cached(obj):
+                obj = getattr(obj, field.name)
+            else:
+                raise LookupError(name)
+        model = field.related_model
+
+    raise LookupError(LOOKUP_SEP.join(path))
+
+
+def _evaluate_constraint(instance, key, constraint):
+    """
+    Evaluate a single constraint (e.g. "site__name__in": ["Site 1", "Site 2"]) against a loaded instance. Raise
+    LookupError if the constraint cannot be evaluated in Python.
+    """
+    path = key.split(LOOKUP_SEP)
+    lookup = 'exact'
+    if len(path) > 1 and (path[-1] in CONSTRAINT_LOOKUPS or path[-1] == 'isnull'):
+        lookup = path.pop()
+
+    field, value = _resolve_constraint_value(instance, path)
+
+    if lookup == 'isnull':
+        return (value is None) == bool(constraint)
+
+    # Defer to the database for lookups overridden by custom fields (e.g. IP address fields), and for timezone-aware
+    # fields
+    lookup_class = field.get_lookup(lookup)
+    if lookup_class is None or lookup_class.__module__ != 'django.db.models.lookups':
+        raise LookupError(key)
+    if isinstance(field, DateTimeField):
+        raise LookupError(key)
+
+    # Mimic SQL semantics for null values
+    if value is None or constraint is None:
+        return value is None and constraint is None and lookup in ('exact', 'iexact')
+
+    # Cast the constraint to the field's type (e.g. a date string to a date)
+    try:
+        if lookup == 'in':
+            if type(constraint) not in (list, tuple):
+                raise LookupError(key)
+            constraint = [field.to_python(c) for c in constraint]
+        elif lookup not in TEXT_LOOKUPS:
+            constraint = field.to_python(constraint)
+        return CONSTRAINT_LOOKUPS[lookup](value, constraint)
+    except (TypeError, ValidationError):
+        raise LookupError(key)
+
+
+def evaluate_constraints(instance, constraints):
+    """
+    Evaluate a list of permission constraint sets against a loaded instance, without querying the database. Return
+    True if the instance satisfies any of the constraint sets, False if it satisfies none of them, or None if the
+    constraints cannot be evaluated in Python (e.g. because they traverse a many-to-many relationship or a related
+    object which has not been loaded).
+
+    :param instance: A model instance
+    :param constraints: A list of constraint sets (dictionaries), any of which may be satisfied
+    """
+    result = False
+
+    for constraint_set in constraints:
+
+        # A null constraint set matches all instances
+        if not constraint_set:
+            return True
+
+        # All constraints within a set must be satisfied
+        satisfied = True
+        for key, value in constraint_set.items():
+            try:
+                if not _evaluate_constraint(instance, key, value):
+                    satisfied = False
+                    break
+            except LookupError:
+                satisfied = None
+        if satisfied:
+            return True
+        if satisfied is None:
+            result = None
+
+    return result
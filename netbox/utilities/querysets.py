@@ -1,7 +1,55 @@
+import threading
+from collections import OrderedDict
+
 from django.db.models import Q, QuerySet
 
 from utilities.permissions import permission_is_exempt
 
+# The maximum number of compiled restriction filters held in memory
+RESTRICTION_CACHE_SIZE = 4096
+
+# Compiled restriction filters, mapping the identity of a user's permissions map and a permission name to a tuple of
+# the permissions map and its compiled Q object. (A reference to the map is retained so that its identity cannot be
+# reused while cached.) Permissions maps are shared across requests until invalidated, so the compiled filter for each
+# permission is built only once for each version of a user's permissions.
+_restriction_cache = OrderedDict()
+_restriction_cache_lock = threading.Lock()
+
+
+def get_restriction_filter(perms, permission):
+    """
+    Return a Q object matching all objects permitted by the constraints assigned to the given permission.
+
+    :param perms: A user's permissions map (as returned by get_all_permissions())
+    :param permission: The name of the permission (e.g. "dcim.view_site")
+    """
+    key = (id(perms), permission)
+    with _restriction_cache_lock:
+        cached = _restriction_cache.get(key)
+        if cached is not None and cached[0] is perms:
+            _restriction_cache.move_to_end(key)
+            return cached[1]
+
+    attrs = Q()
+    for perm_attrs in perms[permission]:
+        if type(perm_attrs) is list:
+            for p in perm_attrs:
+                attrs |= Q(**p)
+        elif perm_attrs:
+            attrs |= Q(**perm_attrs)
+        else:
+            # Any permission with null constraints grants access to _all_ instances
+            attrs = Q()
+            break
+
+    with _restriction_cache_lock:
+        _restriction_cache[key] = (perms, attrs)
+        _restriction_cache.move_to_end(key)
+        while len(_restriction_cache) > RESTRICTION_CACHE_SIZE:
+            _restriction_cache.popitem(last=False)
+
+    return attrs
+
 
 class RestrictedQuerySet(QuerySet):
 
@@ -22,23 +70,22 @@ class RestrictedQuerySet(QuerySet):
         if user.is_superuser or permission_is_exempt(permission_required):
             qs = self
 
-        # User is anonymous or has not been granted the requisite permission
-        elif not user.is_authenticated or permission_required not in user.get_all_permissions():
+        # User is anonymous
+        elif not user.is_authenticated:
             qs = self.none()
 
-        # Filter the queryset to include only objects with allowed attributes
         else:
-            attrs = Q()
-            for perm_attrs in user._object_perm_cache[permission_required]:
-                if type(perm_attrs) is list:
-                    for p in perm_attrs:
-                        attrs |= Q(**p)
-                elif perm_attrs:
-                    attrs |= Q(**perm_attrs)
-                else:
-                    # Any permission with null constraints grants access to _all_ instances
-                    attrs = Q()
-                    break
-            qs = self.filter(attrs)
+            # Populate the user's permissions map, if not already cached on the user
+            if not hasattr(user, '_object_perm_cache'):
+                user.get_all_permissions()
+            perms = getattr(user, '_object_perm_cache', {})
+
+            # User has not been granted the requisite permission
+            if permission_required not in perms:
+                qs = self.none()
+
+            # Filter the queryset to include only objects with allowed attributes
+            else:
+                qs = self.filter(get_restriction_filter(perms, permission_required))
 
         return qs
@@ -482,13 +482,15 @@ class MarkdownColumn(tables.TemplateColumn):
 # Pagination
 #
 
-def paginate_table(table, request):
+def paginate_table(table, request, paginator_class=EnhancedPaginator, **kwargs):
     """
-    Paginate a table given a request context.
+    Paginate a table given a request context. Any additional keyword arguments are passed to the paginator.
     """
     paginate = {
-        'paginator_class': EnhancedPaginator,
-        'per_page': get_paginate_count(request)
+        'paginator_class': paginator_class,
+        'per_page': get_paginate_count(request),
+        'count_mode': request.GET.get('count'),
+        **kwargs,
     }
     RequestConfig(request, paginate).configure(table)
 
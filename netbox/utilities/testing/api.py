@@ -189,6 +189,22 @@ class APIViewTestCases:
             self.assertHttpStatus(response, status.HTTP_200_OK)
             self.assertEqual(len(response.data['results']), 2)
 
+        @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+        def test_list_objects_by_cursor(self):
+            """
+            GET all objects a page at a time using cursor pagination.
+            """
+            self.add_permissions(f'{self.model._meta.app_label}.view_{self.model._meta.model_name}')
+            url = f'{self._get_list_url()}?cursor=&limit=2'
+            pks = []
+            while url:
+                response = self.client.get(url, **self.header)
+                self.assertHttpStatus(response, status.HTTP_200_OK)
+                pks.extend(obj['id'] for obj in response.data['results'])
+                url = response.data['next']
+
+            self.assertEqual(sorted(pks), sorted(self._get_queryset().values_list('pk', flat=True)))
+
         @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
         def test_options_objects(self):
             """
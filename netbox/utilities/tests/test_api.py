@@ -1,7 +1,13 @@
+import importlib.util
+import json
 import urllib.parse
+from unittest import skipUnless
+from unittest.mock import patch
 
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
@@ -9,7 +15,12 @@ from dcim.models import Region, Site
 from extras.choices import CustomFieldTypeChoices
 from extras.models import CustomField
 from ipam.models import VLAN
+from netbox.api.exceptions import SerializerNotFound
 from netbox.config import get_config
+from utilities.api import (
+    _get_graphql_type_for_label, _get_serializer_for_label, get_graphql_type_for_model, get_serializer_for_model,
+)
+from utilities.utils import dynamic_import
 from utilities.testing import APITestCase, disable_warnings
 
 
@@ -175,6 +186,273 @@ class APIPaginationTestCase(APITestCase):
         self.assertIsNone(response.data['previous'])
         self.assertEqual(len(response.data['results']), 100)
 
+    def test_count_none(self):
+        response = self.client.get(f'{self.url}?count=none&limit=60', format='json', **self.header)
+
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertIsNone(response.data['count'])
+        self.assertIn('offset=60', response.data['next'])
+        self.assertEqual(len(response.data['results']), 60)
+
+        # The next link should be omitted from the last page
+        response = self.client.get(response.data['next'], format='json', **self.header)
+
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertIsNone(response.data['count'])
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(len(response.data['results']), 40)
+
+    def test_count_estimate(self):
+        response = self.client.get(f'{self.url}?count=estimate', format='json', **self.header)
+
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertIsInstance(response.data['count'], int)
+        self.assertIs(response.data['count_estimated'], True)
+
+        # Exact counts should not be flagged
+        response = self.client.get(self.url, format='json', **self.header)
+        self.assertEqual(response.data['count'], 100)
+        self.assertNotIn('count_estimated', response.data)
+
+
+class APIFieldSelectionTestCase(APITestCase):
+    user_permissions = ('dcim.view_site',)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.url = reverse('dcim-api:site-list')
+
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 4)
+        ])
+
+    def test_fields(self):
+        response = self.client.get(f'{self.url}?fields=id,name,device_count', format='json', **self.header)
+
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 3)
+        for result in response.data['results']:
+            self.assertEqual(sorted(result), ['device_count', 'id', 'name'])
+
+    def test_omit(self):
+        response = self.client.get(f'{self.url}?omit=tags,custom_fields,device_count', format='json', **self.header)
+
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        result = response.data['results'][0]
+        self.assertIn('name', result)
+        self.assertIn('rack_count', result)
+        self.assertNotIn('tags', result)
+        self.assertNotIn('custom_fields', result)
+        self.assertNotIn('device_count', result)
+
+
+class APIExportTestCase(APITestCase):
+    user_permissions = ('dcim.view_site',)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.url = reverse('dcim-api:site-export')
+
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 101)
+        ])
+
+    def test_export(self):
+        response = self.client.get(f'{self.url}?fields=id,name', **self.header)
+
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 100)
+        self.assertEqual(sorted(json.loads(lines[0])), ['id', 'name'])
+
+    def test_export_filtered(self):
+        response = self.client.get(f'{self.url}?name=Site 1&name=Site 2', **self.header)
+
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        names = [json.loads(line)['name'] for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(sorted(names), ['Site 1', 'Site 2'])
+
+
+class APIConditionalGetTestCase(APITestCase):
+    user_permissions = ('dcim.view_site', 'dcim.change_site', 'dcim.delete_site')
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 4)
+        ])
+
+    def test_list_objects(self):
+        url = reverse('dcim-api:site-list')
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        # An unchanged list should not be returned again
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        # Deleting an object should invalidate the ETag
+        site = Site.objects.first()
+        self.client.delete(reverse('dcim-api:site-detail', kwargs={'pk': site.pk}), **self.header)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_list_objects_without_count(self):
+        """
+        The ETag of a list should be determined without counting or aggregating the matching objects.
+        """
+        url = reverse('dcim-api:site-list')
+        for params in ('?cursor=', '?count=none'):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url + params, **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertIn('ETag', response)
+            # Annotations (e.g. counts of related objects) are permitted, but not aggregation of the list itself
+            for query in context.captured_queries:
+                self.assertFalse(query['sql'].startswith(('SELECT COUNT(', 'SELECT MAX(')), query['sql'])
+
+    def test_list_objects_changed_outside_request(self):
+        """
+        Changes made outside of a request (e.g. by a management command or script) should also invalidate the ETag.
+        """
+        url = reverse('dcim-api:site-list')
+        response = self.client.get(url, **self.header)
+        etag = response['ETag']
+
+        site = Site.objects.first()
+        site.description = 'New description'
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            site.save()
+        self.assertEqual(len(callbacks), 1)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+
+        # Deleting an object
+        etag = response['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Site.objects.filter(pk=site.pk).delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_get_object(self):
+        site = Site.objects.first()
+        url = reverse('dcim-api:site-detail', kwargs={'pk': site.pk})
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_304_NOT_MODIFIED)
+
+        # Modifying the object should invalidate the ETag
+        self.client.patch(url, {'description': 'New description'}, format='json', **self.header)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data['description'], 'New description')
+
+
+@skipUnless(importlib.util.find_spec('msgpack'), "msgpack is not installed")
+class APIMessagePackTestCase(APITestCase):
+    user_permissions = ('dcim.view_site', 'dcim.add_site')
+
+    def test_create_and_list_objects(self):
+        import msgpack
+
+        url = reverse('dcim-api:site-list')
+        data = [
+            {'name': 'Site 1', 'slug': 'site-1'},
+            {'name': 'Site 2', 'slug': 'site-2'},
+        ]
+        response = self.client.post(
+            url, msgpack.packb(data), content_type='application/msgpack', HTTP_ACCEPT='application/msgpack',
+            **self.header
+        )
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual([site['name'] for site in msgpack.unpackb(response.content)], ['Site 1', 'Site 2'])
+
+        response = self.client.get(url, HTTP_ACCEPT='application/msgpack', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(msgpack.unpackb(response.content)['count'], 2)
+
+
+@skipUnless(importlib.util.find_spec('orjson'), "orjson is not installed")
+class APIORJSONTestCase(APITestCase):
+    user_permissions = ('dcim.view_site', 'dcim.add_site')
+
+    def test_create_and_list_objects(self):
+        url = reverse('dcim-api:site-list')
+        data = [
+            {'name': 'Site 1', 'slug': 'site-1'},
+            {'name': 'Site 2', 'slug': 'site-2'},
+        ]
+        media_type = 'application/json; engine=orjson'
+        response = self.client.post(
+            url, json.dumps(data), content_type=media_type, HTTP_ACCEPT=media_type, **self.header
+        )
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(response['Content-Type'], media_type)
+        self.assertEqual([site['name'] for site in json.loads(response.content)], ['Site 1', 'Site 2'])
+
+        # orjson is employed only when requested
+        response = self.client.get(url, HTTP_ACCEPT='application/json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content)['count'], 2)
+
+    def test_render_large_integer(self):
+        from netbox.api.renderers import ORJSONRenderer
+
+        self.assertEqual(json.loads(ORJSONRenderer().render({'value': 2 ** 80})), {'value': 2 ** 80})
+
+
+class GetSerializerForModelTest(TestCase):
+
+    def test_get_serializer_for_model(self):
+        from dcim.api.serializers import NestedSiteSerializer, SiteSerializer
+
+        self.assertIs(get_serializer_for_model(Site), SiteSerializer)
+        self.assertIs(get_serializer_for_model(Site, prefix='Nested'), NestedSiteSerializer)
+        self.assertIs(get_serializer_for_model(Site(name='Site 1')), SiteSerializer)
+
+    def test_get_serializer_for_model_not_found(self):
+        with self.assertRaises(SerializerNotFound):
+            get_serializer_for_model(Site, prefix='Invalid')
+
+    def test_get_serializer_for_model_cached(self):
+        from dcim.api.serializers import SiteSerializer
+
+        # The serializer should be imported only upon the first lookup for a model
+        _get_serializer_for_label.cache_clear()
+        with patch('utilities.api.dynamic_import', wraps=dynamic_import) as mock_import:
+            for _ in range(3):
+                self.assertIs(get_serializer_for_model(Site), SiteSerializer)
+            self.assertIs(get_serializer_for_model(Site(name='Site 1')), SiteSerializer)
+            get_serializer_for_model(Site, prefix='Nested')
+        self.assertEqual(mock_import.call_count, 2)
+
+        # Failed lookups should not be cached
+        with patch('utilities.api.dynamic_import', wraps=dynamic_import) as mock_import:
+            for _ in range(2):
+                with self.assertRaises(SerializerNotFound):
+                    get_serializer_for_model(Site, prefix='Invalid')
+        self.assertEqual(mock_import.call_count, 2)
+
+    def test_get_graphql_type_for_model_cached(self):
+        from dcim.graphql.types import SiteType
+
+        _get_graphql_type_for_label.cache_clear()
+        with patch('utilities.api.dynamic_import', wraps=dynamic_import) as mock_import:
+            for _ in range(3):
+                self.assertIs(get_graphql_type_for_model(Site), SiteType)
+        self.assertEqual(mock_import.call_count, 1)
+
 
 class APIDocsTestCase(TestCase):
 
@@ -197,3 +475,17 @@ class APIDocsTestCase(TestCase):
 
         response = self.client.get('{}?{}'.format(url, urllib.parse.urlencode(params)))
         self.assertEqual(response.status_code, 200)
+
+    def test_api_docs_etag(self):
+
+        url = reverse('schema_swagger', kwargs={'format': '.json'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+
+        # The schema should not reflect the host from which it was requested
+        self.assertNotIn('host', json.loads(response.content))
+
+        # The cached schema should be served unless it has been modified
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,83 @@
+from django.db.models import Q
+from django.test import TestCase
+from netaddr import IPNetwork
+
+from dcim.choices import SiteStatusChoices
+from dcim.models import Region, Site
+from ipam.models import Prefix
+from utilities.permissions import evaluate_constraints
+from utilities.querysets import get_restriction_filter
+
+
+class EvaluateConstraintsTest(TestCase):
+    """
+    Validate the in-memory evaluation of permission constraints by evaluate_constraints().
+    """
+    def setUp(self):
+        self.region = Region(pk=1, name='Region 1', slug='region-1')
+        self.site = Site(pk=1, name='Site 1', slug='site-1', status=SiteStatusChoices.STATUS_ACTIVE, asn=65000)
+        self.site.region = self.region
+
+    def test_null_constraints(self):
+        self.assertTrue(evaluate_constraints(self.site, [None]))
+        self.assertTrue(evaluate_constraints(self.site, [{'name': 'Site 2'}, {}]))
+
+    def test_field_lookups(self):
+        self.assertTrue(evaluate_constraints(self.site, [{'name': 'Site 1'}]))
+        self.assertFalse(evaluate_constraints(self.site, [{'name': 'Site 2'}]))
+        self.assertTrue(evaluate_constraints(self.site, [{'name__in': ['Site 1', 'Site 2']}]))
+        self.assertTrue(evaluate_constraints(self.site, [{'name__istartswith': 'site'}]))
+        self.assertTrue(evaluate_constraints(self.site, [{'asn__gte': 65000, 'asn__lt': 65001}]))
+        self.assertFalse(evaluate_constraints(self.site, [{'asn__gt': 65000}]))
+        self.assertTrue(evaluate_constraints(self.site, [{'tenant__isnull': True}]))
+        self.assertFalse(evaluate_constraints(self.site, [{'description__icontains': 'foo'}]))
+
+    def test_constraint_sets(self):
+        # Any one constraint set must be satisfied in its entirety
+        self.assertFalse(evaluate_constraints(self.site, [{'name': 'Site 1', 'asn': 65001}]))
+        self.assertTrue(evaluate_constraints(self.site, [{'name': 'Site 2'}, {'name': 'Site 1', 'asn': 65000}]))
+
+    def test_related_objects(self):
+        self.assertTrue(evaluate_constraints(self.site, [{'region': 1}]))
+        self.assertTrue(evaluate_constraints(self.site, [{'region_id': 1}]))
+        self.assertTrue(evaluate_constraints(self.site, [{'region__id__in': [1, 2]}]))
+        self.assertTrue(evaluate_constraints(self.site, [{'region__name': 'Region 1'}]))
+        self.assertFalse(evaluate_constraints(self.site, [{'tenant__name': 'Tenant 1'}]))
+        self.assertFalse(evaluate_constraints(self.site, [{'region__parent__name': 'Region 2'}]))
+
+    def test_unsupported_constraints(self):
+        # Constraints which cannot be evaluated without querying the database
+        self.site.group_id = 1  # Related object not loaded
+        self.assertIsNone(evaluate_constraints(self.site, [{'tags__name': 'Tag 1'}]))
+        self.assertIsNone(evaluate_constraints(self.site, [{'group__name': 'Site Group 1'}]))
+        self.assertIsNone(evaluate_constraints(self.site, [{'custom_field_data__foo': 'bar'}]))
+        self.assertIsNone(evaluate_constraints(self.site, [{'name': 'Site 2'}, {'tags__name': 'Tag 1'}]))
+
+        prefix = Prefix(pk=1, prefix=IPNetwork('10.0.0.0/24'))
+        self.assertTrue(evaluate_constraints(prefix, [{'prefix': '10.0.0.0/24'}]))
+        self.assertIsNone(evaluate_constraints(prefix, [{'prefix__net_contained': '10.0.0.0/8'}]))
+        self.assertIsNone(evaluate_constraints(prefix, [{'prefix__istartswith': '10.'}]))
+
+
+class RestrictionFilterTest(TestCase):
+    """
+    Validate the compilation and caching of restriction filters by get_restriction_filter().
+    """
+    def test_get_restriction_filter(self):
+        perms = {
+            'dcim.view_site': [{'name': 'Site 1'}, {'status__in': ['active', 'planned']}],
+            'dcim.change_site': [{'name': 'Site 1'}, None],
+        }
+
+        q = get_restriction_filter(perms, 'dcim.view_site')
+        self.assertEqual(q, Q(name='Site 1') | Q(status__in=['active', 'planned']))
+        self.assertEqual(get_restriction_filter(perms, 'dcim.change_site'), Q())
+
+        # The compiled filter should be reused for the same permissions map
+        self.assertIs(get_restriction_filter(perms, 'dcim.view_site'), q)
+
+        # A new permissions map should result in a new filter
+        perms = {
+            'dcim.view_site': [{'name': 'Site 2'}],
+        }
+        self.assertEqual(get_restriction_filter(perms, 'dcim.view_site'), Q(name='Site 2'))
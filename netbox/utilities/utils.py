@@ -6,7 +6,7 @@ from itertools import count, groupby
 from typing import Any, Dict, List, Tuple
 
 from django.core.serializers import serialize
-from django.db.models import Count, OuterRef, Subquery
+from django.db.models import Count, OuterRef, prefetch_related_objects, Subquery
 from django.db.models.functions import Coalesce
 from jinja2.sandbox import SandboxedEnvironment
 from mptt.models import MPTTModel
@@ -90,6 +90,33 @@ def count_related(model, field):
     return Coalesce(subquery, 0)
 
 
+def iterate_in_chunks(queryset, chunk_size=1000):
+    """
+    Iterate over a QuerySet in lists of up to chunk_size objects, using a server-side cursor so that memory use remains
+    constant regardless of the number of objects. Any prefetch_related() lookups on the QuerySet (which are ignored by
+    QuerySet.iterator()) are applied to each chunk.
+    """
+    lookups = queryset._prefetch_related_lookups
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) == chunk_size:
+            prefetch_related_objects(chunk, *lookups)
+            yield chunk
+            chunk = []
+    if chunk:
+        prefetch_related_objects(chunk, *lookups)
+        yield chunk
+
+
+class Echo:
+    """
+    A file-like object which simply returns each value written to it. Used to stream output from csv.writer.
+    """
+    def write(self, value):
+        return value
+
+
 def serialize_object(obj, extra=None):
     """
     Return a generic JSON representation of an object using Django's built-in serializer. (This is used for things like
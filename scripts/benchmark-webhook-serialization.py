@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark the serialization of objects for webhooks during a bulk edit, with and without the memoization of
+serializer lookups by get_serializer_for_model(). Requires a configured NetBox installation (including its database);
+all objects created are rolled back on completion.
+
+Usage: python3 scripts/benchmark-webhook-serialization.py [--count N] [--rounds N]
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'netbox'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'netbox.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import transaction  # noqa: E402
+from netaddr import IPNetwork  # noqa: E402
+
+import utilities.api  # noqa: E402
+from dcim.models import Device, DeviceRole, DeviceType, Interface, Manufacturer, Site  # noqa: E402
+from extras.choices import ObjectChangeActionChoices  # noqa: E402
+from extras.webhooks import enqueue_object  # noqa: E402
+from ipam.api.views import IPAddressViewSet  # noqa: E402
+from ipam.models import IPAddress  # noqa: E402
+
+
+def create_objects(count):
+    site = Site.objects.create(name='Benchmark Site', slug='benchmark-site')
+    manufacturer = Manufacturer.objects.create(name='Benchmark Manufacturer', slug='benchmark-manufacturer')
+    device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Benchmark', slug='benchmark')
+    device_role = DeviceRole.objects.create(name='Benchmark Role', slug='benchmark-role')
+    device = Device.objects.create(name='Benchmark Device', site=site, device_type=device_type, device_role=device_role)
+    interfaces = Interface.objects.bulk_create([
+        Interface(device=device, name=f'eth{i}', type='1000base-t') for i in range(count)
+    ])
+    IPAddress.objects.bulk_create([
+        IPAddress(address=IPNetwork(f'10.{i // 65536}.{i // 256 % 256}.{i % 256}/8'), assigned_object=interface)
+        for i, interface in enumerate(interfaces)
+    ])
+
+
+def enqueue_all(objects, user):
+    # Serialize each object as change logging does upon a bulk edit with webhooks enabled
+    queue = []
+    request_id = uuid.uuid4()
+    start = time.perf_counter()
+    for obj in objects:
+        enqueue_object(queue, obj, user, request_id, ObjectChangeActionChoices.ACTION_UPDATE)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=5000, help="Number of IP addresses to edit (default: 5000)")
+    parser.add_argument('--rounds', type=int, default=5, help="Number of rounds to time (default: 5)")
+    args = parser.parse_args()
+
+    memoized = utilities.api._get_serializer_for_label
+    unmemoized = memoized.__wrapped__
+
+    with transaction.atomic():
+        user = User.objects.create(username=f'benchmark-{uuid.uuid4().hex[:8]}')
+        create_objects(args.count)
+        objects = list(IPAddressViewSet.queryset.filter(address__net_contained_or_equal='10.0.0.0/8'))
+
+        # Warm up (e.g. the content type cache) before timing
+        enqueue_all(objects[:100], user)
+
+        # Alternate between the two variants in each round, so that both are equally affected by any variation in load
+        results = {'uncached': [], 'memoized': []}
+        for _ in range(args.rounds):
+            for name, func in (('uncached', unmemoized), ('memoized', memoized)):
+                utilities.api._get_serializer_for_label = func
+                try:
+                    results[name].append(enqueue_all(objects, user))
+                finally:
+                    utilities.api._get_serializer_for_label = memoized
+        results = {name: min(times) for name, times in results.items()}
+
+        transaction.set_rollback(True)
+
+    print(f"Serialized {len(objects)} IP addresses for webhooks (best of {args.rounds} rounds):")
+    for name, elapsed in results.items():
+        print(f"  {name:>9}: {elapsed * 1000:8.1f} ms ({elapsed / len(objects) * 1e6:6.1f} us per object)")
+    saving = results['uncached'] - results['memoized']
+    print(f"  Saving: {saving * 1000:.1f} ms ({saving / results['uncached']:.1%})")
+
+
+if __name__ == '__main__':
+    main()